@@ -4,13 +4,13 @@ import sys
 import time
 import hci_commands as hci
 import style_sheet as ss
+from log_viewer import LogViewer
 from test_framework.logger import Logger
 from test_automation.UI_Application.controller_lib import Controller
 from BT_UI.bt_ui_dummy import TestApplication
 from BT_UI.bluez_utils_25 import BluezLogger
 # from BT_UI.agent_runner import AgentRunner
 from PyQt6.QtCore import QTimer, QDateTime
-from PyQt6.QtCore import QFileSystemWatcher
 from PyQt6.QtCore import QSize
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QBrush
@@ -80,7 +80,6 @@ class BluetoothUIApp(QMainWindow):
         self.handle = None
         self.ocf = None
         self.ogf = None
-        self.file_watcher = None
         self.dump_log_output = None
         self.empty_list = None
         self.command_input_layout = None
@@ -296,17 +295,12 @@ class BluetoothUIApp(QMainWindow):
         logs_layout.addWidget(logs_label)
         self.controller.start_dump_logs(start_dump_logs)
 
-        self.dump_log_output = QTextEdit()
+        if self.dump_log_output:
+            self.dump_log_output.close_file()
+        self.dump_log_output = LogViewer()
         self.dump_log_output.setMaximumWidth(700)
-        self.dump_log_output.setReadOnly(True)
-        content = self.controller.logfile_fd.read()
-        self.controller.file_position = self.controller.logfile_fd.tell()
-        self.dump_log_output.append(content)
+        self.dump_log_output.open(self.controller.hcidump_log_name)
         logs_layout.addWidget(self.dump_log_output)
-
-        self.file_watcher = QFileSystemWatcher()
-        self.file_watcher.addPath(self.controller.hcidump_log_name)
-        self.file_watcher.fileChanged.connect(self.update_log)
         self.dump_log_output.setStyleSheet("border: 2px solid black;")
 
         main_layout.addLayout(self.command_input_layout, 0, 1)
@@ -416,19 +410,15 @@ class BluetoothUIApp(QMainWindow):
         self.scroll.setWidget(self.content_widget)
         self.command_input_layout.addWidget(self.scroll)
 
-    def update_log(self):
-        """ Updates the dump logs on the logs layout from log file"""
-        self.controller.logfile_fd.seek(self.controller.file_position)
-        content = self.controller.logfile_fd.read()
-        self.controller.file_position = self.controller.logfile_fd.tell()
-        self.dump_log_output.append(content)
-
     def current_text_changed(self, text):
         """ Stores the handle selected for executing the hci command. """
         self.handle = text
 
     def test_application_clicked(self):
         """ Displays the Test Application window inside the main GUI. """
+        if self.dump_log_output:
+            self.dump_log_output.close_file()
+            self.dump_log_output = None
         if self.centralWidget():
             self.centralWidget().deleteLater()
         self.test_application_widget = TestApplication()
@@ -1,5 +1,27 @@
 import dbus
+import dbus.mainloop.glib
+import os
+import threading
 import time
+from gi.repository import GLib
+
+from libraries.bluetooth.obex_transfer import TransferTracker
+from vcard_parser import VCardIndex
+from vcard_parser import parse_vcards
+
+dbus.mainloop.glib.DBusGMainLoop(set_as_default=True)
+dbus.mainloop.glib.threads_init()
+
+# Projection profiles: which vCard fields (PBAP Fields filter) and format to ask
+# the phone for. None means every field; PHOTO is usually most of the bytes.
+projection_profiles = {
+    "full": {"fields": None, "format": None},
+    "caller-id": {"fields": ["VERSION", "N", "FN", "TEL"], "format": "vcard21"},
+    "contact-card": {"fields": ["VERSION", "N", "FN", "TEL", "EMAIL", "ORG"], "format": "vcard30"},
+    "call-history": {"fields": ["VERSION", "N", "FN", "TEL", "X-IRMC-CALL-DATETIME"], "format": "vcard21"},
+    "no-photo": {"fields": ["VERSION", "N", "FN", "TEL", "EMAIL", "ADR", "ORG", "TITLE", "NOTE", "BDAY",
+                            "URL", "NICKNAME", "UID", "X-IRMC-CALL-DATETIME"], "format": "vcard30"},
+}
 
 
 class PhoneBookAccess:
@@ -9,34 +31,147 @@ class PhoneBookAccess:
         self.client = dbus.Interface(self.bus.get_object("org.bluez.obex", "/org/bluez/obex"), "org.bluez.obex.Client1")
         self.session_path = None
         self.phonebook = None
+        self.location = None
+        self.folder = None
+        self.bytes_transferred = 0
+        # Seconds spent in page transfers, from request to completion (parsing excluded).
+        self.transfer_time = 0.0
+        self.filter_fields = None
 
-    def create_session(self):
+    def create_session(self, timeout=10):
+        # Waits for obexd to export PhonebookAccess1 on the new session instead of
+        # sleeping: the InterfacesAdded signal is subscribed before CreateSession so
+        # it cannot be missed, and GetManagedObjects covers an already exported path.
         args = {"Target": dbus.String("PBAP", variant_level=1)}
-        self.session_path = self.client.CreateSession(self.device_address, args)
-        print(f" Session created at: {self.session_path}")
+        ready = threading.Event()
+        loop = GLib.MainLoop() if threading.current_thread() is threading.main_thread() else None
+        exported = set()
 
-        time.sleep(1)
+        def interfaces_added(path, interfaces):
+            if "org.bluez.obex.PhonebookAccess1" in interfaces:
+                exported.add(str(path))
+                if str(path) == self.session_path:
+                    ready.set()
+                    if loop and loop.is_running():
+                        loop.quit()
+
+        match = self.bus.add_signal_receiver(
+            interfaces_added,
+            dbus_interface="org.freedesktop.DBus.ObjectManager",
+            signal_name="InterfacesAdded",
+            bus_name="org.bluez.obex")
+        try:
+            start = time.monotonic()
+            self.session_path = str(self.client.CreateSession(self.device_address, args))
+            if self.session_path in exported or self.session_exported():
+                ready.set()
+            if not self.wait_until_set(ready, loop, timeout):
+                print(f" PhonebookAccess1 did not appear on {self.session_path} within {timeout}s")
+            print(f" Session created at: {self.session_path} ({time.monotonic() - start:.3f}s)")
+        finally:
+            match.remove()
 
         self.phonebook = dbus.Interface(
             self.bus.get_object("org.bluez.obex", self.session_path),
             "org.bluez.obex.PhonebookAccess1")
 
+    def session_exported(self):
+        object_manager = dbus.Interface(self.bus.get_object("org.bluez.obex", "/"),
+                                        "org.freedesktop.DBus.ObjectManager")
+        try:
+            objects = object_manager.GetManagedObjects()
+        except dbus.exceptions.DBusException:
+            return False
+        interfaces = objects.get(dbus.ObjectPath(self.session_path), {})
+        return "org.bluez.obex.PhonebookAccess1" in interfaces
+
+    def wait_until_set(self, event, loop, timeout):
+        # On the main thread the nested loop dispatches signals until a callback
+        # quits it or the timeout does; elsewhere the main thread runs the loop.
+        if loop:
+            timer = {"fired": False}
+
+            def expire():
+                timer["fired"] = True
+                loop.quit()
+                return False
+
+            source = GLib.timeout_add(max(int(timeout * 1000), 1), expire)
+            if not event.is_set():
+                loop.run()
+            if not timer["fired"]:
+                GLib.source_remove(source)
+        else:
+            event.wait(timeout)
+        return event.is_set()
+
     def select_phonebook(self, location, folder):
         if not self.phonebook:
             print(" Phonebook interface not initialized.")
             return
         self.phonebook.Select(location,folder)
+        self.location = location
+        self.folder = folder
         print(f"Selected {location}/{folder} phonebook.")
 
     def get_size(self):
         if self.phonebook:
             size = self.phonebook.GetSize()
             print(f"Phonebook size: {size}")
-        else:
-            print(" Phonebook interface not ready.")
+            return int(size)
+        print(" Phonebook interface not ready.")
+        return None
     
+    def supported_fields(self):
+        if self.filter_fields is None:
+            self.filter_fields = [str(field) for field in self.phonebook.ListFilterFields()]
+        return self.filter_fields
+
+    def projection_filters(self, profile=None, filters=None):
+        # Merges a projection profile into a filter dict, dropping fields the phone
+        # does not list in ListFilterFields.
+        filters = dict(filters or {})
+        if profile is None:
+            return filters
+        if profile not in projection_profiles:
+            raise ValueError(f"Unknown projection profile {profile}, expected one of {', '.join(projection_profiles)}")
+        projection = projection_profiles[profile]
+        if projection["format"]:
+            filters["Format"] = dbus.String(projection["format"])
+        if projection["fields"]:
+            supported = set(self.supported_fields())
+            fields = [field for field in projection["fields"] if field in supported]
+            filters["Fields"] = dbus.Array(fields, signature="s")
+        return filters
+
+    def measure_profiles(self, profiles=None, target_dir="/tmp", timeout=300):
+        # Pulls the selected folder once per profile and reports bytes and time
+        # against the unfiltered pull.
+        profiles = list(profiles or projection_profiles)
+        if "full" in profiles:
+            profiles.remove("full")
+        profiles.insert(0, "full")
+        results = {}
+        for profile in profiles:
+            target_file = os.path.join(target_dir, f"pbap_{self.device_address.replace(':', '')}_{profile}.vcf")
+            tracker = self.pull_all_async(target_file, self.projection_filters(profile))
+            status = tracker.wait(timeout)
+            size = os.path.getsize(target_file) if os.path.exists(target_file) else 0
+            results[profile] = {"status": status, "bytes": size, "seconds": tracker.elapsed()}
+            if os.path.exists(target_file):
+                os.remove(target_file)
+        full = results["full"]
+        print(f"{'profile':<14}{'bytes':>12}{'seconds':>10}{'bytes saved':>13}{'time saved':>12}")
+        for profile, result in results.items():
+            result["bytes_saved"] = 1 - result["bytes"] / full["bytes"] if full["bytes"] else 0.0
+            result["time_saved"] = 1 - result["seconds"] / full["seconds"] if full["seconds"] else 0.0
+            print(f"{profile:<14}{result['bytes']:>12}{result['seconds']:>10.2f}"
+                  f"{result['bytes_saved']:>12.0%}{result['time_saved']:>12.0%}"
+                  f"{'' if result['status'] == 'complete' else '  (' + result['status'] + ')'}")
+        return results
+
     def list_filters(self):
-        fields = self.phonebook.ListFilterFields()
+        fields = self.supported_fields()
         print("Available Filter Fields:")
         for field in fields:
             if not field.startswith("BIT"):
@@ -48,21 +183,277 @@ class PhoneBookAccess:
         for vcard, name in contacts:
             print(f"{vcard} - {name}")
 
-    def pull(self, vcard_handle, target_file="/tmp/single.vcf"):
+    def report_transfer(self, tracker, status, target_file):
+        rate = tracker.bytes_per_second()
+        rate_text = f", {rate / 1024:.1f} KiB/s" if rate else ""
+        print(f" Transfer {status}: {tracker.transferred} bytes to {target_file} in {tracker.elapsed():.2f}s{rate_text}")
+
+    def pull(self, vcard_handle, target_file="/tmp/single.vcf", timeout=60, profile=None):
         print(f"Pulling vCard: {vcard_handle} to {target_file}")
-        transfer_path, props = self.phonebook.Pull(vcard_handle, target_file, {})
-        print(f" Pulled {vcard_handle} to {target_file}")
+        transfer_path, props = self.phonebook.Pull(vcard_handle, target_file, self.projection_filters(profile))
+        tracker = TransferTracker(self.bus, transfer_path, props, target_file=target_file)
+        status = tracker.wait(timeout)
+        self.report_transfer(tracker, status, target_file)
+        return status
     
-    def pull_all(self, target_file="/tmp/pb.vcf"):
+    def pull_contact(self, vcard_handle, target_file="/tmp/single.vcf", filters=None, timeout=60):
+        # Pulls one vCard, waits for the transfer and returns it parsed (None if empty).
+        transfer_path, props = self.phonebook.Pull(vcard_handle, target_file, dict(filters or {}))
+        tracker = TransferTracker(self.bus, transfer_path, props, target_file=target_file)
+        status = tracker.wait(timeout)
+        if status != "complete":
+            raise RuntimeError(f"Transfer {transfer_path} ended with status {status}")
+        self.transfer_time += tracker.elapsed()
+        self.bytes_transferred += os.path.getsize(target_file)
+        return next(parse_vcards(target_file), None)
+
+    def pull_all_async(self, target_file="/tmp/pb.vcf", filters=None, on_progress=None):
+        # Starts PullAll and returns its TransferTracker without waiting.
+        transfer_path, transfer_props = self.phonebook.PullAll(target_file, dict(filters or {}))
+        return TransferTracker(self.bus, transfer_path, transfer_props, on_progress, target_file)
+
+    def pull_all(self, target_file="/tmp/pb.vcf", timeout=300, profile=None):
         print(" Pulling full phonebook...")
-        transfer_obj, transfer_props = self.phonebook.PullAll(target_file, {})
+        tracker = self.pull_all_async(target_file, self.projection_filters(profile))
+        status = tracker.wait(timeout)
+        self.report_transfer(tracker, status, target_file)
+        if status != "complete":
+            print(f" PullAll did not complete ({status}).")
+            return None
         print(f" PullAll complete. File saved: {target_file}")
+        return target_file
+
+    def read_contacts(self, target_file="/tmp/pb.vcf", include_binary=True):
+        # Streams the pulled vCards one contact at a time instead of loading the file.
+        return parse_vcards(target_file, include_binary=include_binary)
+
+    def index_contacts(self, target_file="/tmp/pb.vcf"):
+        # Memory-maps the pulled file and returns an offset index for random access.
+        return VCardIndex(target_file)
+
+    def page_filters(self, offset, page_size, filters=None):
+        page_filters = dict(filters or {})
+        page_filters["Offset"] = dbus.UInt16(offset)
+        page_filters["MaxCount"] = dbus.UInt16(page_size)
+        return page_filters
+
+    def wait_for_transfer(self, transfer_path, timeout=60, target_file=None):
+        # Returns the final Transfer1 Status ("complete" or "error"), or "timeout".
+        return TransferTracker(self.bus, transfer_path, target_file=target_file).wait(timeout)
+
+    def start_page_pull(self, offset, page_size, target_dir, filters=None):
+        target_file = os.path.join(target_dir, f"pbap_{self.device_address.replace(':', '')}_page_{offset}.vcf")
+        transfer_path, transfer_props = self.phonebook.PullAll(target_file, self.page_filters(offset, page_size, filters))
+        return TransferTracker(self.bus, transfer_path, transfer_props, target_file=target_file), target_file
+
+    def abandon_page_pull(self, tracker, target_file):
+        # Cancels a page transfer nobody will read (if still running) and removes its file.
+        tracker.stop()
+        if not tracker.future.done():
+            try:
+                tracker.cancel()
+            except dbus.exceptions.DBusException as e:
+                print(f" Could not cancel {tracker.transfer_path}: {e}")
+        if os.path.exists(target_file):
+            os.remove(target_file)
+
+    def finish_page_pull(self, tracker, target_file, timeout):
+        status = tracker.wait(timeout)
+        if status != "complete":
+            self.abandon_page_pull(tracker, target_file)
+            raise RuntimeError(f"Transfer {tracker.transfer_path} ended with status {status}")
+        try:
+            self.transfer_time += tracker.elapsed()
+            self.bytes_transferred += os.path.getsize(target_file)
+            return list(parse_vcards(target_file))
+        finally:
+            if os.path.exists(target_file):
+                os.remove(target_file)
+
+    def pull_page(self, offset, page_size, target_dir="/tmp", filters=None, max_retries=2, timeout=60, started=None):
+        # Pulls one page, re-requesting only that page when its transfer fails.
+        attempt = 0
+        while True:
+            try:
+                tracker, target_file = started or self.start_page_pull(offset, page_size, target_dir, filters)
+                started = None
+                return self.finish_page_pull(tracker, target_file, timeout)
+            except (dbus.exceptions.DBusException, RuntimeError) as e:
+                started = None
+                attempt += 1
+                if attempt > max_retries:
+                    raise
+                print(f" Page at offset {offset} failed ({e}), retry {attempt}/{max_retries}")
+
+    def pull_all_pages(self, page_size=100, target_dir="/tmp", filters=None, max_retries=2, timeout=60, profile=None,
+                       prefetch=True):
+        # Yields the phonebook one page (list of parsed contacts) at a time. With
+        # prefetch, the next page is requested before the current one is handed to
+        # the caller, so the phone keeps sending while the caller processes. If the
+        # caller stops early, the prefetched transfer is cancelled and its file removed.
+        filters = self.projection_filters(profile, filters)
+        offset = 0
+        started = self.start_page_pull(offset, page_size, target_dir, filters)
+        try:
+            while True:
+                page, started = started, None
+                contacts = self.pull_page(offset, page_size, target_dir, filters, max_retries, timeout, page)
+                if len(contacts) >= page_size and prefetch:
+                    try:
+                        started = self.start_page_pull(offset + page_size, page_size, target_dir, filters)
+                    except dbus.exceptions.DBusException as e:
+                        print(f" Could not prefetch page at offset {offset + page_size}: {e}")
+                yield contacts
+                if len(contacts) < page_size:
+                    return
+                offset += page_size
+        finally:
+            if started:
+                self.abandon_page_pull(*started)
+
+    def iter_all_contacts(self, page_size=100, target_dir="/tmp", filters=None, max_retries=2, timeout=60, profile=None):
+        for contacts in self.pull_all_pages(page_size, target_dir, filters, max_retries, timeout, profile):
+            for contact in contacts:
+                yield contact
+
+    def list_pages(self, page_size=500, filters=None, max_retries=2):
+        # Yields List() results as lists of (handle, name) tuples, page by page.
+        offset = 0
+        while True:
+            attempt = 0
+            while True:
+                try:
+                    entries = [(str(handle), str(name)) for handle, name in
+                               self.phonebook.List(self.page_filters(offset, page_size, filters))]
+                    break
+                except dbus.exceptions.DBusException as e:
+                    attempt += 1
+                    if attempt > max_retries:
+                        raise
+                    print(f" List page at offset {offset} failed ({e}), retry {attempt}/{max_retries}")
+            yield entries
+            if len(entries) < page_size:
+                return
+            offset += page_size
+
+    def list_indexed(self, page_size=500):
+        # Yields List(Order=indexed) pages of (handle, name) tuples.
+        return self.list_pages(page_size, filters={"Order": dbus.String("indexed")})
+
+    def handle_pages(self, page_size=500):
+        # Yields the handles of the selected folder in List(Order=indexed) order, page by page.
+        for page in self.list_indexed(page_size):
+            yield [handle for handle, name in page]
+
+    def list_handles(self):
+        # Handles of the selected folder in List(Order=indexed) order.
+        return [handle for page in self.handle_pages() for handle in page]
+
+    def pull_listed_pages(self, handles, page_size=100, target_dir="/tmp", filters=None, max_retries=2, timeout=60,
+                          profile=None, prefetch=True):
+        # Yields pages of (handle, contact) for handles returned by list_handles().
+        # PullAll has no Order parameter: it returns the folder in its natural
+        # order, which is the handle order List(Order=indexed) reports, so each
+        # pulled vCard is matched to the listed handle at the same position. Handles
+        # are not contiguous (deletions, call history starting at 1.vcf), hence the
+        # listing. The match only holds while the folder still looks like the
+        # listing: when GetSize or a page length disagrees with it, the remaining
+        # handles are pulled one at a time instead.
+        filters = self.projection_filters(profile, filters)
+        position = 0
+        if self.get_size() == len(handles):
+            pages = self.pull_all_pages(page_size, target_dir, filters, max_retries, timeout, prefetch=prefetch)
+            try:
+                for contacts in pages:
+                    expected = min(page_size, len(handles) - position)
+                    if len(contacts) != expected:
+                        print(f" PullAll returned {len(contacts)} vCards where List() had {expected}")
+                        break
+                    yield list(zip(handles[position:position + expected], contacts))
+                    position += expected
+            finally:
+                pages.close()
+        if position < len(handles):
+            print(f" Pulling {len(handles) - position} vCards one by one")
+        target_file = os.path.join(target_dir, f"pbap_{self.device_address.replace(':', '')}_handle.vcf")
+        try:
+            while position < len(handles):
+                page = []
+                for handle in handles[position:position + page_size]:
+                    contact = self.pull_contact(handle, target_file, filters, timeout)
+                    if contact is not None:
+                        page.append((handle, contact))
+                position += page_size
+                yield page
+        finally:
+            if os.path.exists(target_file):
+                os.remove(target_file)
+
+    def pull_all_into(self, store, page_size=100, filters=None, target_dir="/tmp", timeout=60, profile=None,
+                      on_page=None):
+        # Pulls the selected folder page by page into a ContactStore, each vCard
+        # under its List() handle (see pull_listed_pages). on_page(page) is called
+        # with every stored page of (handle, contact).
+        store.clear_folder(self.device_address, self.location, self.folder)
+        count = 0
+        for page in self.pull_listed_pages(self.list_handles(), page_size, target_dir, filters, timeout=timeout,
+                                           profile=profile):
+            count += store.upsert_contacts(self.device_address, self.location, self.folder, page)
+            if on_page:
+                on_page(page)
+        store.set_counters(self.device_address, self.location, self.folder, self.read_counters())
+        print(f" Stored {count} contacts from {self.location}/{self.folder}")
+        return count
+
+    def read_counters(self):
+        # Version counters of the selected folder as strings (None when not reported).
+        props_iface = dbus.Interface(self.bus.get_object("org.bluez.obex", self.session_path),
+                                     "org.freedesktop.DBus.Properties")
+        counters = {}
+        for name in ("DatabaseIdentifier", "PrimaryCounter", "SecondaryCounter"):
+            try:
+                counters[name] = str(props_iface.Get("org.bluez.obex.PhonebookAccess1", name))
+            except dbus.exceptions.DBusException:
+                counters[name] = None
+        return counters
+
+    def cache_is_current(self, store):
+        # The store can answer for the selected folder only if it was synced at the
+        # counters the phone reports now.
+        stored = store.get_counters(self.device_address, self.location, self.folder)
+        if stored is None:
+            return False
+        # obexd only refreshes the counters from a GetSize/List/Pull response.
+        try:
+            self.phonebook.GetSize()
+        except dbus.exceptions.DBusException as e:
+            print(f" GetSize failed, not using the cached contacts: {e}")
+            return False
+        current = self.read_counters()
+        if current["PrimaryCounter"] is None or current["SecondaryCounter"] is None:
+            return False
+        return all(stored[name] == current[name] for name in current)
+
+    def search_cached(self, store, search_field, search_value):
+        # Same arguments and result shape as search_contacts(), answered from the
+        # ContactStore unless its copy of the folder is stale.
+        if self.cache_is_current(store):
+            results = store.search(search_field, search_value, self.device_address, self.location, self.folder)
+            source = "local"
+        else:
+            results = [(str(vcard), str(name)) for vcard, name in self.phonebook.Search(search_field, search_value, {})]
+            source = "remote"
+        print(f"Searching contacts by {search_field}: {search_value} ({source})")
+        for vcard, name in results:
+            print(f"Found: {vcard} - {name}")
+        return results
 
     def search_contacts(self, search_field, search_value):
         print(f"Searching contacts by {search_field}: {search_value}")
         results = self.phonebook.Search(search_field, search_value, {})
         for vcard, search_field in results:
             print(f"Found: {vcard} - {search_field}")
+        return results
 
     def disconnect(self):
         if self.session_path:
@@ -79,7 +470,9 @@ class PhoneBookAccess:
         try:
             value = props_iface.Get("org.bluez.obex.PhonebookAccess1", prop_name)
             print(f"{prop_name} = {value}")
+            return value
         except dbus.exceptions.DBusException as e:
             print(f" Error: {prop_name} not found or unsupported.\n{e}")
+            return None
         
 
@@ -1,24 +1,632 @@
+import contextlib
 import dbus
 import dbus.mainloop.glib
 import dbus.service
 import os
 import subprocess
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from concurrent.futures import wait
 from gi.repository import GLib
 dbus.mainloop.glib.DBusGMainLoop(set_as_default=True)
+dbus.mainloop.glib.threads_init()
 
 from libraries.bluetooth import constants
+from libraries.bluetooth.obex_transfer import TransferSignalBuffer
+from libraries.bluetooth.obex_transfer import TransferTracker
+
+
+class BluezObjectCache:
+    """In-process mirror of the BlueZ object tree, kept current from D-Bus signals.
+
+    Alongside the object data it maintains hash indexes so that lookups by
+    address, by owning device and by interface do not scan every object path.
+    """
+
+    child_interfaces = (
+        constants.media_player_interface,
+        constants.media_transport_interface,
+        constants.media_control_interface,
+    )
+
+    def __init__(self, bus, object_manager, log=None):
+        """Initialize an empty cache for the given ObjectManager.
+
+        Args:
+            bus: D-Bus connection the BlueZ objects live on.
+            object_manager: org.freedesktop.DBus.ObjectManager interface of BlueZ.
+            log: Logger instance.
+        """
+        self.bus = bus
+        self.object_manager = object_manager
+        self.log = log
+        self.objects = {}
+        self.device_index = {}
+        self.device_keys = {}
+        self.child_index = {}
+        self.interface_index = {}
+        self.lock = threading.RLock()
+        self.bluez_owner = None
+        self.signal_matches = []
+        self.name_watch = None
+        self.listeners = {
+            "InterfacesAdded": [],
+            "InterfacesRemoved": [],
+            "PropertiesChanged": [],
+            "NameOwnerChanged": [],
+        }
+
+    def add_listener(self, signal_name, callback):
+        """Register a callback invoked after the cache has applied a signal.
+
+        Callbacks receive the same arguments as the signal handler, with the
+        object path first (NameOwnerChanged callbacks receive only the owner).
+
+        Args:
+            signal_name: InterfacesAdded, InterfacesRemoved, PropertiesChanged or NameOwnerChanged.
+            callback: Callable to invoke.
+        """
+        self.listeners[signal_name].append(callback)
+
+    def remove_listener(self, signal_name, callback):
+        """Unregister a callback added with add_listener()."""
+        if callback in self.listeners[signal_name]:
+            self.listeners[signal_name].remove(callback)
+
+    def notify(self, signal_name, *args):
+        """Invoke the listeners registered for a signal, outside the cache lock."""
+        for callback in list(self.listeners[signal_name]):
+            try:
+                callback(*args)
+            except Exception as e:
+                if self.log:
+                    self.log.warning("%s listener failed:%s", signal_name, e)
+
+    def start(self):
+        """Subscribe to the ObjectManager/Properties signals and seed the cache once."""
+        self.signal_matches = [
+            self.bus.add_signal_receiver(
+                self.interfaces_added,
+                dbus_interface=constants.object_manager_interface,
+                signal_name="InterfacesAdded",
+                bus_name=constants.bluez_service),
+            self.bus.add_signal_receiver(
+                self.interfaces_removed,
+                dbus_interface=constants.object_manager_interface,
+                signal_name="InterfacesRemoved",
+                bus_name=constants.bluez_service),
+            self.bus.add_signal_receiver(
+                self.properties_changed,
+                dbus_interface=constants.properties_interface,
+                signal_name="PropertiesChanged",
+                bus_name=constants.bluez_service,
+                path_keyword="path"),
+        ]
+        self.seed()
+        self.name_watch = self.bus.watch_name_owner(constants.bluez_service, self.name_owner_changed)
+
+    def stop(self):
+        """Remove the signal subscriptions and drop the cached objects."""
+        for match in self.signal_matches:
+            match.remove()
+        self.signal_matches = []
+        if self.name_watch:
+            self.name_watch.cancel()
+            self.name_watch = None
+        with self.lock:
+            self.reset({})
+
+    def seed(self):
+        """Replace the cache with a fresh GetManagedObjects() snapshot."""
+        objects = {}
+        try:
+            for path, interfaces in self.object_manager.GetManagedObjects().items():
+                objects[str(path)] = {str(name): dict(props) for name, props in interfaces.items()}
+            self.bluez_owner = self.bus.get_name_owner(constants.bluez_service)
+        except dbus.exceptions.DBusException as e:
+            if self.log:
+                self.log.warning("Failed to seed BlueZ object cache:%s", e)
+        with self.lock:
+            self.reset(objects)
+
+    def reset(self, objects):
+        """Replace the cached objects and rebuild every index from them."""
+        self.objects = objects
+        self.device_index = {}
+        self.device_keys = {}
+        self.child_index = {}
+        self.interface_index = {}
+        for path, interfaces in objects.items():
+            self.index_interfaces(path, interfaces)
+
+    def device_path_for(self, path):
+        """Return the device object path that owns the given path, if any.
+
+        Args:
+            path: D-Bus object path, e.g. /org/bluez/hci0/dev_AA_BB_CC_DD_EE_FF/player0.
+        Returns:
+            The dev_* ancestor (or the path itself), or None for non-device objects.
+        """
+        parts = path.split("/")
+        for index, part in enumerate(parts):
+            if part.startswith("dev_"):
+                return "/".join(parts[:index + 1])
+        return None
+
+    def index_interfaces(self, path, interfaces):
+        """Add the given interfaces of one object to the indexes."""
+        device_path = self.device_path_for(path)
+        for name, props in interfaces.items():
+            self.interface_index.setdefault(name, set()).add(path)
+            if name == constants.device_interface:
+                adapter_path = str(props.get("Adapter", path.rsplit("/", 1)[0]))
+                key = (adapter_path, str(props.get("Address", "")).upper())
+                self.device_index[key] = path
+                self.device_keys[path] = key
+            if device_path and name in self.child_interfaces:
+                self.child_index.setdefault(device_path, {}).setdefault(name, set()).add(path)
+
+    def unindex_interfaces(self, path, names):
+        """Remove the given interfaces of one object from the indexes."""
+        device_path = self.device_path_for(path)
+        for name in names:
+            paths = self.interface_index.get(name)
+            if paths is not None:
+                paths.discard(path)
+                if not paths:
+                    del self.interface_index[name]
+            if name == constants.device_interface:
+                key = self.device_keys.pop(path, None)
+                if key and self.device_index.get(key) == path:
+                    del self.device_index[key]
+            children = self.child_index.get(device_path)
+            if children and name in children:
+                children[name].discard(path)
+                if not children[name]:
+                    del children[name]
+                if not children:
+                    del self.child_index[device_path]
+
+    def name_owner_changed(self, owner):
+        """Re-seed when bluetoothd restarts, clear when it goes away."""
+        if not owner:
+            self.bluez_owner = None
+            with self.lock:
+                self.reset({})
+        elif owner != self.bluez_owner:
+            self.seed()
+        else:
+            return
+        self.notify("NameOwnerChanged", owner)
+
+    def interfaces_added(self, path, interfaces):
+        """Handle ObjectManager.InterfacesAdded."""
+        path = str(path)
+        with self.lock:
+            entry = dict(self.objects.get(path, {}))
+            added = {str(name): dict(props) for name, props in interfaces.items()}
+            entry.update(added)
+            self.objects[path] = entry
+            self.index_interfaces(path, added)
+        self.notify("InterfacesAdded", path, added)
+
+    def interfaces_removed(self, path, interfaces):
+        """Handle ObjectManager.InterfacesRemoved."""
+        path = str(path)
+        with self.lock:
+            if path not in self.objects:
+                return
+            entry = {name: props for name, props in self.objects[path].items() if name not in interfaces}
+            self.unindex_interfaces(path, [str(name) for name in interfaces])
+            if entry:
+                self.objects[path] = entry
+            else:
+                del self.objects[path]
+        self.notify("InterfacesRemoved", path, [str(name) for name in interfaces])
+
+    def properties_changed(self, interface, changed, invalidated, path):
+        """Handle Properties.PropertiesChanged for objects already in the cache."""
+        path = str(path)
+        interface = str(interface)
+        with self.lock:
+            entry = self.objects.get(path)
+            if entry is None or interface not in entry:
+                return
+            props = dict(entry[interface])
+            props.update(changed)
+            for name in invalidated:
+                props.pop(name, None)
+            entry = dict(entry)
+            entry[interface] = props
+            self.objects[path] = entry
+        self.notify("PropertiesChanged", path, interface, changed, invalidated)
+
+    def get_managed_objects(self):
+        """Return a snapshot of the cached tree in GetManagedObjects() shape.
+
+        Entries are replaced rather than mutated on every signal, so the snapshot
+        stays consistent while the main loop keeps updating the cache.
+
+        Returns:
+            Dictionary of object path to {interface: properties}.
+        """
+        with self.lock:
+            return dict(self.objects)
+
+    def get_properties(self, path, interface):
+        """Return the cached properties of one interface on one object.
+
+        Args:
+            path: D-Bus object path.
+            interface: Interface name.
+        Returns:
+            Properties dictionary, or None if the object/interface is unknown.
+        """
+        with self.lock:
+            return self.objects.get(str(path), {}).get(interface)
+
+    def wait_until(self, predicate, timeout):
+        """Block until predicate() holds, re-evaluating it each time the cache changes.
+
+        On the main thread a nested GLib main loop dispatches the signals that
+        update the cache; on any other thread the signals are dispatched by the
+        main thread and this call just waits on an event.
+
+        Args:
+            predicate: Callable returning True once the awaited state is reached.
+            timeout: Deadline in seconds.
+        Returns:
+            True if the predicate held before the deadline, False otherwise.
+        """
+        if predicate():
+            return True
+        event = threading.Event()
+        loop = GLib.MainLoop() if threading.current_thread() is threading.main_thread() else None
+
+        def check(*args):
+            if not event.is_set() and predicate():
+                event.set()
+                if loop and loop.is_running():
+                    loop.quit()
+
+        for signal_name in self.listeners:
+            self.add_listener(signal_name, check)
+        try:
+            if loop:
+                timer = {"fired": False}
+
+                def expire():
+                    timer["fired"] = True
+                    loop.quit()
+                    return False
+
+                source = GLib.timeout_add(max(int(timeout * 1000), 1), expire)
+                loop.run()
+                if not timer["fired"]:
+                    GLib.source_remove(source)
+            else:
+                event.wait(timeout)
+        finally:
+            for signal_name in self.listeners:
+                self.remove_listener(signal_name, check)
+        return event.is_set() or predicate()
+
+    def find_device(self, adapter_path, address):
+        """Look up a device object path by (adapter, address).
+
+        Args:
+            adapter_path: Adapter object path, e.g. /org/bluez/hci0.
+            address: Bluetooth device MAC address.
+        Returns:
+            Device object path, or None if not known.
+        """
+        with self.lock:
+            return self.device_index.get((adapter_path, str(address).upper()))
+
+    def get_child_paths(self, device_path, interface):
+        """Return the paths under a device that implement a media interface.
+
+        Args:
+            device_path: Device object path.
+            interface: One of MediaPlayer1, MediaTransport1 or MediaControl1.
+        Returns:
+            Sorted list of object paths.
+        """
+        with self.lock:
+            return sorted(self.child_index.get(device_path, {}).get(interface, ()))
+
+    def get_paths(self, interface):
+        """Return the set of object paths that implement an interface."""
+        with self.lock:
+            return set(self.interface_index.get(interface, ()))
+
+    def get_devices(self, adapter_path):
+        """Return (path, Device1 properties) for every device under an adapter."""
+        with self.lock:
+            return [(path, self.objects[path][constants.device_interface])
+                    for (adapter, _), path in self.device_index.items() if adapter == adapter_path]
+
+
+class DBusProxyPool:
+    """Bounded LRU pool of per-path proxy objects and their dbus.Interface wrappers.
+
+    Building a proxy with bus.get_object() may trigger an introspection round
+    trip, so proxies are reused across calls and evicted least-recently-used
+    once more than max_paths object paths are held.
+    """
+
+    def __init__(self, bus, service, max_paths=128):
+        """Initialize an empty pool.
+
+        Args:
+            bus: D-Bus connection used to create proxies.
+            service: Bus name that owns the pooled objects.
+            max_paths: Maximum number of object paths kept in the pool.
+        """
+        self.bus = bus
+        self.service = service
+        self.max_paths = max_paths
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_entry(self, path):
+        """Return the pool entry for a path, creating the proxy on a miss."""
+        path = str(path)
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None:
+                self.entries.move_to_end(path)
+                return entry
+        entry = {"proxy": self.bus.get_object(self.service, path), "interfaces": {}}
+        with self.lock:
+            entry = self.entries.setdefault(path, entry)
+            self.entries.move_to_end(path)
+            while len(self.entries) > self.max_paths:
+                self.entries.popitem(last=False)
+        return entry
+
+    def get_proxy(self, path):
+        """Return the pooled proxy object for a path."""
+        return self.get_entry(path)["proxy"]
+
+    def get_interface(self, path, interface):
+        """Return the pooled dbus.Interface wrapper for a path and interface name."""
+        entry = self.get_entry(path)
+        wrapper = entry["interfaces"].get(interface)
+        if wrapper is None:
+            wrapper = entry["interfaces"].setdefault(interface, dbus.Interface(entry["proxy"], interface))
+        return wrapper
+
+    def invalidate(self, path):
+        """Drop the entries for a path and every object below it."""
+        path = str(path)
+        prefix = path + "/"
+        with self.lock:
+            for key in [key for key in self.entries if key == path or key.startswith(prefix)]:
+                del self.entries[key]
+
+    def clear(self):
+        """Drop every pooled entry."""
+        with self.lock:
+            self.entries.clear()
+
+
+class DiscoveryStream:
+    """Device events for one adapter, de-duplicated and rate limited per device.
+
+    Events are dicts with keys ``type`` ("found", "changed" or "lost"), ``path``,
+    ``address``, ``properties`` (the full Device1 snapshot) and ``changed`` (only
+    the properties that differ from the last event for that device). Updates that
+    touch nothing but the noisy advertising properties are coalesced so that a
+    device produces at most one of them per ``min_interval`` seconds; any other
+    change is delivered immediately together with whatever was pending.
+    """
+
+    coalesced_properties = ("RSSI", "ManufacturerData", "ServiceData", "TxPower")
+
+    def __init__(self, object_cache, adapter_path, min_interval=0.5, callback=None, include_known=True):
+        """Initialize the stream.
+
+        Args:
+            object_cache: BluezObjectCache that mirrors the BlueZ object tree.
+            adapter_path: Adapter object path, e.g. /org/bluez/hci0.
+            min_interval: Minimum seconds between two coalesced updates of one device.
+            callback: Optional callable(event); when given, events are pushed to it from
+                the GLib main loop instead of being queued for events().
+            include_known: Report devices already known to BlueZ as "found" on start.
+        """
+        self.object_cache = object_cache
+        self.adapter_path = adapter_path
+        self.min_interval = min_interval
+        self.callback = callback
+        self.include_known = include_known
+        self.lock = threading.Lock()
+        self.ready = []
+        self.devices = {}
+        self.pending = {}
+        self.last_emitted = {}
+        self.flush_sources = {}
+        self.running = False
+
+    def start(self):
+        """Start following the object cache."""
+        if self.running:
+            return
+        self.object_cache.add_listener("InterfacesAdded", self.interfaces_added)
+        self.object_cache.add_listener("InterfacesRemoved", self.interfaces_removed)
+        self.object_cache.add_listener("PropertiesChanged", self.properties_changed)
+        self.running = True
+        if self.include_known:
+            for path, props in self.object_cache.get_devices(self.adapter_path):
+                self.device_found(path, props)
+
+    def stop(self):
+        """Stop following the object cache and drop anything still pending."""
+        if not self.running:
+            return
+        self.object_cache.remove_listener("InterfacesAdded", self.interfaces_added)
+        self.object_cache.remove_listener("InterfacesRemoved", self.interfaces_removed)
+        self.object_cache.remove_listener("PropertiesChanged", self.properties_changed)
+        self.running = False
+        with self.lock:
+            sources = list(self.flush_sources.values())
+            self.flush_sources.clear()
+            self.pending.clear()
+        for source in sources:
+            GLib.source_remove(source)
+
+    def interfaces_added(self, path, interfaces):
+        props = interfaces.get(constants.device_interface)
+        if props is not None and str(props.get("Adapter", "")) == self.adapter_path:
+            self.device_found(path, props)
+
+    def interfaces_removed(self, path, interfaces):
+        if constants.device_interface not in interfaces:
+            return
+        with self.lock:
+            props = self.devices.pop(path, None)
+            if props is None:
+                return
+            self.pending.pop(path, None)
+            self.last_emitted.pop(path, None)
+            source = self.flush_sources.pop(path, None)
+        if source is not None:
+            GLib.source_remove(source)
+        self.emit(self.make_event("lost", path, props, {}))
+
+    def properties_changed(self, path, interface, changed, invalidated):
+        if interface != constants.device_interface:
+            return
+        with self.lock:
+            if path not in self.devices:
+                return
+            old = self.devices[path]
+            changed = {name: value for name, value in changed.items() if old.get(name) != value}
+            invalidated = [name for name in invalidated if name in old]
+            if not changed and not invalidated:
+                return
+            props = dict(old)
+            props.update(changed)
+            for name in invalidated:
+                props.pop(name, None)
+            self.devices[path] = props
+        self.device_changed(path, props, changed)
+
+    def device_found(self, path, props):
+        with self.lock:
+            old = self.devices.get(path)
+            self.devices[path] = dict(props)
+        if old is not None:
+            changed = {name: value for name, value in props.items() if old.get(name) != value}
+            if changed:
+                self.device_changed(path, props, changed)
+        else:
+            with self.lock:
+                self.last_emitted[path] = time.monotonic()
+            self.emit(self.make_event("found", path, props, dict(props)))
+
+    def device_changed(self, path, props, changed):
+        """Deliver a change now, or hold it back if it only touches coalesced properties."""
+        with self.lock:
+            pending = self.pending.setdefault(path, {})
+            pending.update(changed)
+            if not pending:
+                return
+            noisy_only = all(name in self.coalesced_properties for name in pending)
+            due = time.monotonic() - self.last_emitted.get(path, 0) >= self.min_interval
+            if noisy_only and not due:
+                if self.callback is not None and path not in self.flush_sources:
+                    delay = self.min_interval - (time.monotonic() - self.last_emitted.get(path, 0))
+                    self.flush_sources[path] = GLib.timeout_add(max(int(delay * 1000), 1), self.flush_device, path)
+                return
+        self.flush_device(path)
+
+    def flush_device(self, path):
+        """Emit the pending change for one device, if any (also used as a GLib timeout)."""
+        with self.lock:
+            self.flush_sources.pop(path, None)
+            pending = self.pending.pop(path, None)
+            props = self.devices.get(path)
+            if not pending or props is None:
+                return False
+            self.last_emitted[path] = time.monotonic()
+        self.emit(self.make_event("changed", path, props, pending))
+        return False
+
+    def flush_due(self):
+        """Emit every coalesced change whose interval has elapsed (used by events())."""
+        now = time.monotonic()
+        with self.lock:
+            due = [path for path in self.pending if now - self.last_emitted.get(path, 0) >= self.min_interval]
+        for path in due:
+            self.flush_device(path)
+
+    def has_ready(self):
+        """Return True when events() has something to yield right now."""
+        now = time.monotonic()
+        with self.lock:
+            return bool(self.ready) or any(
+                now - self.last_emitted.get(path, 0) >= self.min_interval for path in self.pending)
+
+    def make_event(self, event_type, path, props, changed):
+        return {
+            "type": event_type,
+            "path": path,
+            "address": str(props.get("Address", "")),
+            "properties": dict(props),
+            "changed": dict(changed),
+        }
+
+    def emit(self, event):
+        if self.callback is not None:
+            self.callback(event)
+            return
+        with self.lock:
+            self.ready.append(event)
+
+    def events(self, duration=None):
+        """Yield events until the duration elapses (forever when None).
+
+        Args:
+            duration: Seconds to listen for, or None.
+        Yields:
+            Event dicts as described in the class docstring.
+        """
+        deadline = None if duration is None else time.monotonic() + duration
+        while True:
+            self.flush_due()
+            with self.lock:
+                batch, self.ready = self.ready, []
+            for event in batch:
+                yield event
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            remaining = self.min_interval if deadline is None else min(self.min_interval, deadline - time.monotonic())
+            self.object_cache.wait_until(self.has_ready, max(remaining, 0.01))
 
 
 class BluetoothDeviceManager:
     """A class for managing Bluetooth devices using the BlueZ D-Bus API."""
 
-    def __init__(self, log=None, interface=None):
+    # Operations that make the controller page a remote device.
+    paging_actions = ("pair", "connect")
+    # Adapter path -> (page limit, semaphore) shared by every manager on that adapter.
+    adapter_page_slots = {}
+    adapter_page_slots_lock = threading.Lock()
+
+    def __init__(self, log=None, interface=None, max_workers=4, max_parallel_pages=3):
         """Initialize the BluetoothDeviceManager by setting up the system bus and adapter.
 
         Args:
             log: Logger instance.
             interface: Bluetooth adapter interface (e.g., hci0).
+            max_workers: Number of worker threads used by the *_async operations.
+            max_parallel_pages: Maximum simultaneous pair/connect attempts on this adapter. The first
+                manager created on an adapter sets the limit; later managers share it.
         """
         self.bus = dbus.SystemBus()
         self.interface = interface
@@ -27,6 +635,28 @@ class BluetoothDeviceManager:
         self.adapter_proxy = self.bus.get_object(constants.bluez_service, self.adapter_path)
         self.adapter = dbus.Interface(self.adapter_proxy, constants.adapter_interface)
         self.object_manager = dbus.Interface(self.bus.get_object(constants.bluez_service, "/"), constants.object_manager_interface)
+        self.object_cache = BluezObjectCache(self.bus, self.object_manager, log=self.log)
+        self.proxy_pool = DBusProxyPool(self.bus, constants.bluez_service)
+        self.object_cache.add_listener("InterfacesRemoved", lambda path, interfaces: self.proxy_pool.invalidate(path))
+        self.object_cache.add_listener("NameOwnerChanged", lambda owner: self.proxy_pool.clear())
+        self.object_cache.start()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"bluez-{self.interface}")
+        with self.adapter_page_slots_lock:
+            if self.adapter_path not in self.adapter_page_slots:
+                self.adapter_page_slots[self.adapter_path] = (
+                    max_parallel_pages, threading.BoundedSemaphore(max_parallel_pages))
+            self.max_parallel_pages, self.page_slots = self.adapter_page_slots[self.adapter_path]
+        if self.max_parallel_pages != max_parallel_pages and self.log:
+            self.log.warning("%s already pages at most %d devices at once; ignoring max_parallel_pages=%d",
+                             self.adapter_path, self.max_parallel_pages, max_parallel_pages)
+        self.operations = {
+            "pair": self.pair,
+            "connect": self.connect,
+            "disconnect": self.disconnect,
+            "unpair": self.remove_device,
+        }
+        self.discovery_filter = {}
+        self.transfer_tracker = None
         self.last_session_path = None
         self.opp_process = None
         self.pulseaudio_process = None
@@ -39,19 +669,246 @@ class BluetoothDeviceManager:
             paired_devices: A dictionary of paired devices.
         """
         paired_devices = {}
-        for path, interfaces in self.object_manager.GetManagedObjects().items():
-            if constants.device_interface in interfaces:
-                device = interfaces[constants.device_interface]
-                if device.get("Paired") and device.get("Adapter") == self.adapter_path:
-                    address = device.get("Address")
-                    name = device.get("Name", "Unknown")
-                    paired_devices[address] = name
+        for path, device in self.object_cache.get_devices(self.adapter_path):
+            if device.get("Paired"):
+                address = device.get("Address")
+                name = device.get("Name", "Unknown")
+                paired_devices[address] = name
         return paired_devices
 
-    def start_discovery(self):
-        """Start scanning for nearby Bluetooth devices."""
+    def submit(self, action, address, **kwargs):
+        """Run a blocking device operation on the worker pool.
+
+        The D-Bus call and the wait for BlueZ to confirm the new state happen
+        off the calling thread, while signals keep being dispatched by the
+        main loop, so a GUI thread stays responsive.
+
+        Args:
+            action: One of 'pair', 'connect', 'disconnect' or 'unpair'.
+            address: Bluetooth MAC address.
+            **kwargs: Extra arguments for the operation, e.g. timeout.
+        Returns:
+            concurrent.futures.Future resolving to the operation's True/False result.
+        """
+        if action not in self.operations:
+            raise ValueError(f"Unknown device operation: {action}")
+        return self.executor.submit(self.run_operation, action, address, **kwargs)
+
+    def run_operation(self, action, address, timing=None, **kwargs):
+        """Run one device operation, holding an adapter page slot for pair/connect.
+
+        Args:
+            action: One of 'pair', 'connect', 'disconnect' or 'unpair'.
+            address: Bluetooth MAC address.
+            timing: Optional dict that receives the time.monotonic() at which the operation
+                "started" (after waiting for a page slot) and "finished".
+            **kwargs: Extra arguments for the operation, e.g. timeout.
+        Returns:
+            The operation's True/False result.
+        """
+        with self.page_slots if action in self.paging_actions else contextlib.nullcontext():
+            if timing is not None:
+                timing["started"] = time.monotonic()
+            try:
+                return self.operations[action](address, **kwargs)
+            finally:
+                if timing is not None:
+                    timing["finished"] = time.monotonic()
+
+    def iter_completed(self, futures, poll_interval=0.05):
+        """Yield futures as they complete, dispatching D-Bus signals meanwhile when on the main thread.
+
+        Workers waiting for a Paired/Connected change rely on the main thread's
+        GLib context to deliver PropertiesChanged; blocking it in as_completed()
+        would leave every such wait to run into its timeout.
+
+        Args:
+            futures: Futures to wait for.
+            poll_interval: Seconds between GLib context iterations on the main thread.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            yield from as_completed(futures)
+            return
+        context = GLib.MainContext.default()
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            yield from done
+            while context.pending():
+                context.iteration(False)
+
+    def run_many(self, action, addresses, max_parallel=None, **kwargs):
+        """Run the same operation against many devices concurrently.
+
+        Pair/connect attempts additionally share the adapter's page slots, so
+        the controller never sees more simultaneous pages than max_parallel_pages,
+        even if several batches run at once.
+
+        Args:
+            action: One of 'pair', 'connect', 'disconnect' or 'unpair'.
+            addresses: Iterable of Bluetooth MAC addresses.
+            max_parallel: Number of devices handled at once (defaults to the adapter's page limit).
+            **kwargs: Extra arguments for each operation, e.g. timeout.
+        Returns:
+            results: Dictionary of address to {"success", "elapsed", "waited", "error"},
+            with times in seconds.
+        """
+        if action not in self.operations:
+            raise ValueError(f"Unknown device operation: {action}")
+        addresses = list(dict.fromkeys(addresses))
+        if not addresses:
+            return {}
+        max_parallel = max_parallel or self.max_parallel_pages
+        results = {}
+        batch_start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=min(max_parallel, len(addresses)),
+                                thread_name_prefix=f"bluez-{self.interface}-{action}") as executor:
+            futures = {}
+            for address in addresses:
+                timing = {"queued": time.monotonic()}
+                future = executor.submit(self.run_operation, action, address, timing=timing, **kwargs)
+                futures[future] = (address, timing)
+            for future in self.iter_completed(futures):
+                address, timing = futures[future]
+                finished = timing.get("finished", time.monotonic())
+                started = timing.get("started", finished)
+                error = None
+                success = False
+                try:
+                    success = bool(future.result())
+                except Exception as e:
+                    error = str(e)
+                results[address] = {
+                    "success": success,
+                    "elapsed": finished - started,
+                    "waited": started - timing["queued"],
+                    "error": error,
+                }
+                self.log.info("%s %s: %s in %.2fs", action, address, "ok" if success else "failed",
+                              finished - started)
+        self.log.info("%s on %d devices finished in %.2fs (%d succeeded)", action, len(addresses),
+                      time.monotonic() - batch_start, sum(r["success"] for r in results.values()))
+        return results
+
+    def connect_many(self, addresses, max_parallel=None, **kwargs):
+        """Connect to many devices with bounded concurrency; see run_many()."""
+        return self.run_many("connect", addresses, max_parallel=max_parallel, **kwargs)
+
+    def pair_many(self, addresses, max_parallel=None, **kwargs):
+        """Pair with many devices with bounded concurrency; see run_many()."""
+        return self.run_many("pair", addresses, max_parallel=max_parallel, **kwargs)
+
+    def disconnect_many(self, addresses, max_parallel=None, **kwargs):
+        """Disconnect many devices concurrently; see run_many()."""
+        return self.run_many("disconnect", addresses, max_parallel=max_parallel, **kwargs)
+
+    def pair_async(self, address, **kwargs):
+        """Non-blocking pair(); returns a Future."""
+        return self.submit("pair", address, **kwargs)
+
+    def connect_async(self, address, **kwargs):
+        """Non-blocking connect(); returns a Future."""
+        return self.submit("connect", address, **kwargs)
+
+    def disconnect_async(self, address, **kwargs):
+        """Non-blocking disconnect(); returns a Future."""
+        return self.submit("disconnect", address, **kwargs)
+
+    def remove_device_async(self, address, **kwargs):
+        """Non-blocking remove_device(); returns a Future."""
+        return self.submit("unpair", address, **kwargs)
+
+    def shutdown(self):
+        """Stop the worker pool and the object cache subscriptions."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.object_cache.stop()
+        self.proxy_pool.clear()
+
+    def set_discovery_filter(self, transport=None, rssi=None, uuids=None, duplicate_data=None):
+        """Apply a discovery filter to the adapter; calling it with no arguments clears the filter.
+
+        Args:
+            transport: "auto", "bredr" or "le".
+            rssi: Only report devices whose RSSI is at least this value (dBm).
+            uuids: Only report devices advertising one of these service UUIDs.
+            duplicate_data: Whether BlueZ should report repeated advertising data.
+        """
+        discovery_filter = {}
+        if transport is not None:
+            discovery_filter["Transport"] = dbus.String(transport)
+        if rssi is not None:
+            discovery_filter["RSSI"] = dbus.Int16(rssi)
+        if uuids:
+            discovery_filter["UUIDs"] = dbus.Array([str(uuid) for uuid in uuids], signature="s")
+        if duplicate_data is not None:
+            discovery_filter["DuplicateData"] = dbus.Boolean(duplicate_data)
+        self.adapter.SetDiscoveryFilter(dbus.Dictionary(discovery_filter, signature="sv"))
+        self.discovery_filter = discovery_filter
+        if self.log:
+            self.log.info("Discovery filter set to %s", discovery_filter)
+
+    def start_discovery(self, transport=None, rssi=None, uuids=None, duplicate_data=None):
+        """Start scanning for nearby Bluetooth devices.
+
+        Args:
+            transport: Optional discovery filter transport ("auto", "bredr" or "le").
+            rssi: Optional RSSI threshold in dBm.
+            uuids: Optional list of service UUIDs to filter on.
+            duplicate_data: Optional DuplicateData filter flag.
+        """
+        if transport is not None or rssi is not None or uuids or duplicate_data is not None:
+            self.set_discovery_filter(transport, rssi, uuids, duplicate_data)
+        elif self.discovery_filter:
+            self.set_discovery_filter()
         self.adapter.StartDiscovery()
 
+    def open_discovery_stream(self, callback=None, min_interval=0.5, include_known=True, **discovery_filter):
+        """Start discovery and return a started DiscoveryStream for this adapter.
+
+        Args:
+            callback: Optional callable(event) run from the GLib main loop for each event.
+            min_interval: Minimum seconds between coalesced RSSI/advertising updates per device.
+            include_known: Report devices already known to BlueZ as "found".
+            **discovery_filter: transport, rssi, uuids and duplicate_data for SetDiscoveryFilter.
+        Returns:
+            The DiscoveryStream; call stop() on it and stop_discovery() when done.
+        """
+        stream = DiscoveryStream(self.object_cache, self.adapter_path, min_interval=min_interval,
+                                 callback=callback, include_known=include_known)
+        stream.start()
+        try:
+            self.start_discovery(**discovery_filter)
+        except Exception:
+            stream.stop()
+            raise
+        return stream
+
+    def stream_discovery(self, duration=None, min_interval=0.5, include_known=True, **discovery_filter):
+        """Run discovery and yield device events as BlueZ reports them.
+
+        Discovery is stopped when the duration elapses or the generator is closed.
+
+        Args:
+            duration: Seconds to scan for, or None to scan until the caller stops iterating.
+            min_interval: Minimum seconds between coalesced RSSI/advertising updates per device.
+            include_known: Report devices already known to BlueZ as "found".
+            **discovery_filter: transport, rssi, uuids and duplicate_data for SetDiscoveryFilter.
+        Yields:
+            Event dicts, see DiscoveryStream.
+        """
+        stream = self.open_discovery_stream(min_interval=min_interval, include_known=include_known,
+                                            **discovery_filter)
+        try:
+            for event in stream.events(duration):
+                yield event
+        finally:
+            stream.stop()
+            try:
+                self.stop_discovery()
+            except dbus.exceptions.DBusException as error:
+                if self.log:
+                    self.log.info("StopDiscovery failed: %s", error)
+
     def stop_discovery(self):
         """Stop Bluetooth device discovery."""
         self.adapter.StopDiscovery()
@@ -63,22 +920,18 @@ class BluetoothDeviceManager:
             discovered_devices: A list of discovered Bluetooth devices.
         """
         discovered_devices = []
-        for path, interfaces in self.object_manager.GetManagedObjects().items():
-            if constants.device_interface in interfaces:
-                device = interfaces[constants.device_interface]
-                if device.get("Adapter") != self.adapter_path:
-                    continue
-                try:
-                    address = device.get("Address")
-                    alias = device.get("Alias", "Unknown")
-                    discovered_devices.append({
-                        "path":path,
-                        "address":address,
-                        "alias":alias
-                    })
-                except Exception as e:
-                    if self.log:
-                        self.log.warning("Failed to extract device info from %s:%s", path, e)
+        for path, device in self.object_cache.get_devices(self.adapter_path):
+            try:
+                address = device.get("Address")
+                alias = device.get("Alias", "Unknown")
+                discovered_devices.append({
+                    "path":path,
+                    "address":address,
+                    "alias":alias
+                })
+            except Exception as e:
+                if self.log:
+                    self.log.warning("Failed to extract device info from %s:%s", path, e)
         return discovered_devices
 
     def find_device_path(self, address):
@@ -89,14 +942,50 @@ class BluetoothDeviceManager:
         Return:
             path: D-Bus object path or None if not found.
         """
-        formatted_interface_path = f"{constants.bluez_path}/{self.interface}/"
-        for path, interfaces in self.object_manager.GetManagedObjects().items():
-            if constants.device_interface in interfaces:
-                if formatted_interface_path in path:
-                    props = interfaces[constants.device_interface]
-                    if props.get("Address") == address:
-                        return path
-        return None
+        return self.object_cache.find_device(self.adapter_path, address)
+
+    def find_media_object_path(self, address, interface):
+        """Find the first media object of the given interface that belongs to a device.
+
+        Args:
+            address: Bluetooth device MAC address.
+            interface: MediaPlayer1, MediaTransport1 or MediaControl1 interface name.
+        Return:
+            path: D-Bus object path or None if not found.
+        """
+        device_path = self.find_device_path(address)
+        if not device_path:
+            return None
+        paths = self.object_cache.get_child_paths(device_path, interface)
+        return paths[0] if paths else None
+
+    def wait_for_device_property(self, device_path, name, value, timeout=10):
+        """Wait until a Device1 property reaches a value, driven by PropertiesChanged.
+
+        Args:
+            device_path: Device object path.
+            name: Device1 property name, e.g. Paired or Connected.
+            value: Expected property value.
+            timeout: Deadline in seconds.
+        Returns:
+            True if the property reached the value before the deadline, False otherwise.
+        """
+        def reached():
+            props = self.object_cache.get_properties(device_path, constants.device_interface)
+            return props is not None and bool(props.get(name)) == bool(value)
+        return self.object_cache.wait_until(reached, timeout)
+
+    def wait_for_device_removed(self, device_path, timeout=10):
+        """Wait until BlueZ reports the device object as removed.
+
+        Args:
+            device_path: Device object path.
+            timeout: Deadline in seconds.
+        Returns:
+            True if the device disappeared before the deadline, False otherwise.
+        """
+        return self.object_cache.wait_until(
+            lambda: self.object_cache.get_properties(device_path, constants.device_interface) is None, timeout)
 
     def register_agent(self, capability=None):
         """Register this object as a Bluetooth pairing agent."""
@@ -105,11 +994,12 @@ class BluetoothDeviceManager:
         agent_manager.RequestDefaultAgent(constants.agent_path)
         self.log.info("Registered with capability:%s", capability)
 
-    def pair(self, address):
+    def pair(self, address, timeout=10):
         """Pairs with a Bluetooth device using the given controller interface.
 
         Args:
             address: Bluetooth MAC address.
+            timeout: Seconds to wait for BlueZ to report Paired after Pair() returns.
         Return:
              True if successfully paired, False otherwise.
         """
@@ -118,9 +1008,8 @@ class BluetoothDeviceManager:
             self.log.info("Device path not found for %s on %s", address, self.interface)
             return False
         try:
-            device_proxy = self.bus.get_object(constants.bluez_service, device_path)
-            device = dbus.Interface(device_proxy, constants.device_interface)
-            properties = dbus.Interface(device_proxy, constants.properties_interface)
+            device = self.proxy_pool.get_interface(device_path, constants.device_interface)
+            properties = self.proxy_pool.get_interface(device_path, constants.properties_interface)
             try:
                 if properties.Get(constants.device_interface, "Paired"):
                     self.log.info("Device %s is already paired.", address)
@@ -129,38 +1018,34 @@ class BluetoothDeviceManager:
                 pass
             self.log.info("Initiating pairing with %s", address)
             device.Pair()
-            try:
-                paired = properties.Get(constants.device_interface, "Paired")
-                if paired:
-                    self.log.info("Successfully paired with %s", address)
-                    return True
-            except dbus.exceptions.DBusException as e:
-                self.log.warning("D-Bus error while checking pairing status:%s", e)
-            time.sleep(1)
+            if self.wait_for_device_property(device_path, "Paired", True, timeout):
+                self.log.info("Successfully paired with %s", address)
+                return True
             self.log.warning("Pairing not confirmed with %s within the timeout period.", address)
             return False
         except dbus.exceptions.DBusException as e:
             self.log.error("%s", e)
             return False
 
-    def connect(self, address):
+    def connect(self, address, timeout=10):
         """Establish a  connection to the specified Bluetooth device.
 
         Args:
             address: Bluetooth device MAC address.
+            timeout: Seconds to wait for BlueZ to report Connected after Connect() returns.
         Return:
             True if connected, False otherwise.
         """
         device_path = self.find_device_path(address)
         if device_path:
             try:
-                device = dbus.Interface(self.bus.get_object(constants.bluez_service, device_path), constants.device_interface)
+                device = self.proxy_pool.get_interface(device_path, constants.device_interface)
                 device.Connect()
-                properties = dbus.Interface(self.bus.get_object(constants.bluez_service, device_path), constants.properties_interface)
-                connected = properties.Get(constants.device_interface, "Connected")
-                if connected:
+                if self.wait_for_device_property(device_path, "Connected", True, timeout):
                     self.log.info("Connection successful to %s", address)
                     return True
+                self.log.info("Connection to %s not confirmed within %s seconds", address, timeout)
+                return False
             except Exception as e:
                 self.log.info("Connection failed:%s", e)
                 return False
@@ -168,51 +1053,52 @@ class BluetoothDeviceManager:
             self.log.info("Device path not found for address %s", address)
             return False
 
-    def disconnect(self, address):
+    def disconnect(self, address, timeout=10):
         """Disconnect a Bluetooth  device from the specified adapter.
 
         Args:
             address: Bluetooth MAC address of the device.
+            timeout: Seconds to wait for BlueZ to report Connected=False after Disconnect() returns.
         Return:
             True if disconnected or already disconnected, False if an error occurred.
         """
         device_path = self.find_device_path(address)
         if device_path:
             try:
-                device = dbus.Interface(self.bus.get_object(constants.bluez_service, device_path), constants.device_interface)
-                props = dbus.Interface(self.bus.get_object(constants.bluez_service, device_path), constants.properties_interface)
+                device = self.proxy_pool.get_interface(device_path, constants.device_interface)
+                props = self.proxy_pool.get_interface(device_path, constants.properties_interface)
                 connected = props.Get(constants.device_interface, "Connected")
                 if not connected:
                     self.log.info("Device %s is already disconnected.", address)
                     return True
                 device.Disconnect()
-                return True
+                if self.wait_for_device_property(device_path, "Connected", False, timeout):
+                    return True
+                self.log.info("Disconnection of %s not confirmed within %s seconds", address, timeout)
             except dbus.exceptions.DBusException as e:
                 self.log.info("Error disconnecting device %s:%s", address, e)
         return False
 
-    def remove_device(self, address):
+    def remove_device(self, address, timeout=10):
         """Removes a paired or known Bluetooth device from the system using BlueZ D-Bus.
 
         Args:
             address: The Bluetooth MAC address of the device to remove.
+            timeout: Seconds to wait for BlueZ to drop the device object.
         Returns:
             True if the device was removed successfully or already not present,
             False if the removal failed or the device still exists afterward.
         """
         try:
-            target_path = None
-            for path, interfaces in self.object_manager.GetManagedObjects().items():
-                if constants.device_interface in interfaces:
-                    if interfaces[constants.device_interface].get("Address") == address and path.startswith(self.adapter_path):
-                        target_path = path
-                        break
+            target_path = self.find_device_path(address)
             if not target_path:
                 self.log.info("Device with address %s not found on %s", address, self.interface)
                 return True
             self.adapter.RemoveDevice(target_path)
             self.log.info("Requested removal of device %s at path %s", address, target_path)
-            time.sleep(0.5)
+            if not self.wait_for_device_removed(target_path, timeout):
+                self.log.warning("Device %s still present after %s seconds", address, timeout)
+                return False
             self.log.info("Device %s removed successfully", address)
             return True
         except dbus.exceptions.DBusException as e:
@@ -229,7 +1115,7 @@ class BluetoothDeviceManager:
         device_path = self.find_device_path(device_address)
         if not device_path:
             return False
-        properties = dbus.Interface(self.bus.get_object(constants.bluez_service, device_path), constants.properties_interface)
+        properties = self.proxy_pool.get_interface(device_path, constants.properties_interface)
         try:
             return properties.Get(constants.device_interface, "Paired")
         except dbus.exceptions.DBusException:
@@ -248,7 +1134,7 @@ class BluetoothDeviceManager:
             self.log.debug("Device path not found for %s on %s", device_address, self.interface)
             return False
         try:
-            properties = dbus.Interface(self.bus.get_object(constants.bluez_service, device_path), constants.properties_interface)
+            properties = self.proxy_pool.get_interface(device_path, constants.properties_interface)
             connected = properties.Get(constants.device_interface, "Connected")
             if self.interface not in device_path:
                 self.log.debug("Device path %s does not match interface %s", device_path, self.interface)
@@ -323,12 +1209,10 @@ class BluetoothDeviceManager:
             The MediaControl1 D-Bus interface if found, otherwise None.
         """
         try:
-            formatted_addr = address.replace(":", "_").upper()
-            for path, interfaces in self.object_manager.GetManagedObjects().items():
-                if constants.media_control_interface in interfaces:
-                    if formatted_addr in path and path.startswith(self.adapter_path):
-                        self.log.info("Found MediaControl1 at %s", path)
-                        return dbus.Interface(self.bus.get_object(constants.bluez_service, path), constants.media_control_interface)
+            path = self.find_media_object_path(address, constants.media_control_interface)
+            if path:
+                self.log.info("Found MediaControl1 at %s", path)
+                return self.proxy_pool.get_interface(path, constants.media_control_interface)
             self.log.info(" No MediaControl1 interface found for %s under %s", address, self.adapter_path)
         except Exception as e:
             self.log.info(" Exception while getting MediaControl1 interface : %s", e)
@@ -347,19 +1231,26 @@ class BluetoothDeviceManager:
             self.log.warning("Unknown role %s", role)
         target_uuid = uuid_map[role]
         connected_a2dp_devices = {}
-        for path, interfaces in self.object_manager.GetManagedObjects().items():
-            if constants.device_interface in interfaces:
-                properties = interfaces[constants.device_interface]
-                if properties.get("Connected") and properties.get("Adapter") == self.adapter_path:
-                    uuids = properties.get("UUIDs", [])
-                    if any(target_uuid in uuid.lower() for uuid in uuids):
-                        address = properties.get("Address")
-                        name = properties.get("Name", "Unknown")
-                        connected_a2dp_devices[address] = name
+        for path, properties in self.object_cache.get_devices(self.adapter_path):
+            if properties.get("Connected"):
+                uuids = properties.get("UUIDs", [])
+                if any(target_uuid in uuid.lower() for uuid in uuids):
+                    address = properties.get("Address")
+                    name = properties.get("Name", "Unknown")
+                    connected_a2dp_devices[address] = name
         return connected_a2dp_devices
 
-    def send_file(self, device_address, file_path):
-        """Send a file using OPP and wait for real-time transfer status."""
+    def send_file(self, device_address, file_path, timeout=10, on_progress=None):
+        """Send a file using OPP and wait for real-time transfer status.
+
+        Args:
+            device_address: Bluetooth address of the receiver.
+            file_path: File to send.
+            timeout: Seconds to wait for the transfer to finish.
+            on_progress: Optional callable(TransferTracker) run on every progress update.
+        Returns:
+            Final Transfer1 status ("complete"/"error"), the last seen status on timeout, or "error".
+        """
         if not os.path.exists(file_path):
             self.log.info("File does not exist: %s", file_path)
             return "error"
@@ -378,21 +1269,21 @@ class BluetoothDeviceManager:
             self.last_session_path = session_path
             self.log.info(f"Created OBEX session : {session_path}")
             opp_interface= dbus.Interface(bus.get_object(constants.obex_service, session_path), constants.obex_object_push)
-            transfer_path, _ = opp_interface.SendFile(file_path)
-            self.log.info("Started transfer: %s", transfer_path)
-            self.transfer_status = {"status": "unknown"}
-            bus.add_signal_receiver(
-                self.obex_properties_changed,
-                dbus_interface = constants.properties_interface,
-                signal_name = "PropertiesChanged",
-                arg0 = constants.obex_object_transfer,
-                path = transfer_path,
-                path_keyword = "path"
-            )
-            self.transfer_loop = GLib.MainLoop()
-            GLib.timeout_add_seconds(10, self.transfer_loop.quit)
-            self.transfer_loop.run()
-            status = self.transfer_status["status"]
+            # Subscribe before SendFile: a small file can be sent before the call returns.
+            signals = TransferSignalBuffer(bus)
+            try:
+                transfer_path, transfer_props = opp_interface.SendFile(file_path)
+                self.log.info("Started transfer: %s", transfer_path)
+                self.transfer_tracker = TransferTracker(bus, transfer_path, transfer_props, on_progress, signals=signals)
+                status = self.transfer_tracker.wait(timeout)
+            finally:
+                signals.stop()
+            if status == "timeout":
+                status = self.transfer_tracker.status
+                self.transfer_tracker.stop()
+            rate = self.transfer_tracker.bytes_per_second()
+            self.log.info("Transfer %s: %s bytes in %.2fs (%s B/s)", status, self.transfer_tracker.transferred,
+                          self.transfer_tracker.elapsed(), int(rate) if rate else "-")
             try:
                 obex_manager.RemoveSession(session_path)
                 self.log.info("Removed OBEX session after transfer: %s", session_path)
@@ -404,14 +1295,6 @@ class BluetoothDeviceManager:
             self.log.info("OBEX signal-based send failed:%s", e)
             return "error"
 
-    def obex_properties_changed(self, interface, changed, invalidated, path):
-        if "Status" in changed:
-            status = str(changed["Status"])
-            self.log.info("Signal: Transfer status changed to:%s",status)
-            self.transfer_status["status"] = status
-            if hasattr(self, "transfer_loop") and self.transfer_loop.is_running():
-                self.transfer_loop.quit()
-
     '''def receive_file(self, save_directory = "/tmp", timeout = 60):
         """Start an OBEX Object Push server and wait for a file to be received."""
         try:
@@ -490,27 +1373,30 @@ class BluetoothDeviceManager:
              status, track, position (ms), duration (ms), or None if unavailable.
         """
         try:
-            formatted_addr = address.replace(":", "_").upper()
-            for path, interfaces in self.object_manager.GetManagedObjects().items():
-                if constants.media_player_interface in interfaces:
-                    if formatted_addr in path and path.startswith(self.adapter_path):
-                        media_player = dbus.Interface(self.bus.get_object(constants.bluez_service, path),
-                                                      constants.media_player_interface)
-                        props = dbus.Interface(media_player, constants.properties_interface)
-                        status = props.Get(constants.media_player_interface, "Status")
-                        track = props.Get(constants.media_player_interface, "Track")
-                        position = props.Get(constants.media_player_interface, "Position")
-                        duration = track.get("Duration", 0)
-                        return {
-                            "status": str(status),
-                            "track": {
-                                "title": str(track.get("Title", "")),
-                                "artist": str(track.get("Artist", "")),
-                                "album": str(track.get("Album", "")),
-                            },
-                            "position": int(position),
-                            "duration": int(duration)
-                        }
+            path = self.find_media_object_path(address, constants.media_player_interface)
+            props = self.object_cache.get_properties(path, constants.media_player_interface) if path else None
+            if props is not None:
+                status = props.get("Status", "")
+                track = props.get("Track", {})
+                # BlueZ computes Position on each Get while playing without signalling every change,
+                # so the cached value is only a fallback.
+                position = props.get("Position", 0)
+                try:
+                    player = self.proxy_pool.get_interface(path, constants.properties_interface)
+                    position = player.Get(constants.media_player_interface, "Position")
+                except dbus.exceptions.DBusException as e:
+                    self.log.debug("Live Position unavailable for %s: %s", path, e)
+                duration = track.get("Duration", 0)
+                return {
+                    "status": str(status),
+                    "track": {
+                        "title": str(track.get("Title", "")),
+                        "artist": str(track.get("Artist", "")),
+                        "album": str(track.get("Album", "")),
+                    },
+                    "position": int(position),
+                    "duration": int(duration)
+                }
         except Exception as e:
             self.log.warning("Failed to get media playback info: %s", e)
         return None
@@ -518,14 +1404,10 @@ class BluetoothDeviceManager:
     def get_media_volume(self, address):
         """Get the current A2DP volume for the given device."""
         try:
-            formatted_addr = address.replace(":", "_").upper()
-            for path, interfaces in self.object_manager.GetManagedObjects().items():
-                if constants.media_transport_interface in interfaces:
-                    if formatted_addr in path and path.startswith(self.adapter_path):
-                        transport = dbus.Interface(self.bus.get_object(constants.bluez_service, path),
-                                                   constants.properties_interface)
-                        volume = transport.Get(constants.media_transport_interface, "Volume")
-                        return int(volume)
+            path = self.find_media_object_path(address, constants.media_transport_interface)
+            props = self.object_cache.get_properties(path, constants.media_transport_interface) if path else None
+            if props is not None and props.get("Volume") is not None:
+                return int(props["Volume"])
         except Exception as e:
             self.log.warning("Failed to get volume: %s", e)
         return None
@@ -533,15 +1415,12 @@ class BluetoothDeviceManager:
     def set_media_volume(self, address, volume):
         """Set A2DP volume (0–127) for the given device."""
         try:
-            formatted_addr = address.replace(":", "_").upper()
-            for path, interfaces in self.object_manager.GetManagedObjects().items():
-                if constants.media_transport_interface in interfaces:
-                    if formatted_addr in path and path.startswith(self.adapter_path):
-                        transport = dbus.Interface(self.bus.get_object(constants.bluez_service, path),
-                                                   constants.properties_interface)
-                        transport.Set(constants.media_transport_interface, "Volume", dbus.UInt16(volume))
-                        self.log.info("Volume set to %d", volume)
-                        return True
+            path = self.find_media_object_path(address, constants.media_transport_interface)
+            if path:
+                transport = self.proxy_pool.get_interface(path, constants.properties_interface)
+                transport.Set(constants.media_transport_interface, "Volume", dbus.UInt16(volume))
+                self.log.info("Volume set to %d", volume)
+                return True
         except Exception as e:
             self.log.warning("Failed to set volume: %s", e)
         return False
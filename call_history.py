@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+
+
+def call_datetime(contact):
+    """Return (X-IRMC-CALL-DATETIME value, call type) of a call-history vCard, or (None, None)."""
+    for prop in contact["properties"]:
+        if prop["name"] == "X-IRMC-CALL-DATETIME":
+            call_type = (prop["params"].get("TYPE") or [None])[0]
+            return str(prop["value"]).strip().rstrip("Zz"), call_type.upper() if call_type else None
+    return None, None
+
+
+class CallHistoryTracker:
+    """Fetch only the call-history entries that are newer than the last poll.
+
+    PBAP call-history folders (ich, och, mch, cch) are ordered newest first, so
+    a poll pulls small pages from offset 0 and stops at the first entry that is
+    not newer than the stored watermark. The watermark is the newest
+    X-IRMC-CALL-DATETIME (plus its handle) per device, repository and folder,
+    together with digests of the entries that share that timestamp, so calls
+    within the same second are neither lost nor reported twice. Phones that do
+    not send call timestamps are tracked by the ordered digests of the newest
+    entries: a poll looks for that run in the folder and reports what precedes
+    it, so a repeated call from the same number is still seen as new. The
+    whole run must be found; when it is not within max_pages, the poll reports
+    nothing rather than guessing and starts again from the newest entries.
+    """
+
+    def __init__(self, pbap, state_path, page_size=10, max_pages=20, profile="call-history"):
+        """Initialize the tracker.
+
+        Args:
+            pbap: PhoneBookAccess with a session already created.
+            state_path: JSON file holding the watermarks between polls.
+            page_size: MaxCount of each PullAll page.
+            max_pages: Upper bound of pages fetched in one poll (also bounds the first poll).
+            profile: Projection profile used for the pulls.
+        """
+        self.pbap = pbap
+        self.state_path = state_path
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.profile = profile
+        self.state = {}
+        if os.path.exists(state_path):
+            with open(state_path, "r") as state_file:
+                self.state = json.load(state_file)
+
+    def save_state(self):
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, "w") as state_file:
+            json.dump(self.state, state_file, indent=1, sort_keys=True)
+        os.replace(temp_path, self.state_path)
+
+    def make_entry(self, contact, handle):
+        """Turn a pulled call-history vCard and its listed handle into an entry dict."""
+        datetime, call_type = call_datetime(contact)
+        number = contact["tel"][0]["number"] if contact["tel"] else None
+        name = contact["fn"] or " ".join(part for part in (contact["n"] or []) if part) or None
+        digest = hashlib.sha1(repr((datetime, call_type, number, name)).encode("utf-8")).hexdigest()
+        return {
+            "handle": handle,
+            "datetime": datetime,
+            "type": call_type,
+            "number": number,
+            "name": name,
+            "digest": digest,
+        }
+
+    def is_seen(self, entry, watermark):
+        """Return True when the entry is at or below the watermark."""
+        if entry["datetime"] and watermark.get("datetime"):
+            if entry["datetime"] != watermark["datetime"]:
+                return entry["datetime"] < watermark["datetime"]
+        return entry["digest"] in watermark.get("digests", [])
+
+    def count_new(self, entries, watermark):
+        """Return how many of the entries pulled so far are newer than the watermark.
+
+        Args:
+            entries: Entries pulled so far, newest first.
+            watermark: Stored watermark, or None on the first poll.
+        Returns:
+            The count, or None when the entries pulled so far do not tell.
+        """
+        if not watermark:
+            return None
+        if watermark.get("datetime"):
+            for position, entry in enumerate(entries):
+                if self.is_seen(entry, watermark):
+                    return position
+            return None
+        # No timestamps: the old entries start where the whole stored run of newest
+        # digests appears, with the run's newest digest at the head of the match.
+        run = watermark.get("digests", [])
+        digests = [entry["digest"] for entry in entries]
+        for position in range(len(digests) - len(run) + 1):
+            if digests[position:position + len(run)] == run:
+                return position
+        return None
+
+    def poll(self, location="int", folder="mch"):
+        """Return the entries added to a call-history folder since the previous poll, newest first.
+
+        Args:
+            location: Repository, e.g. "int" or "sim1".
+            folder: "ich", "och", "mch" or "cch".
+        Returns:
+            List of entry dicts with handle (None if List() did not report it), datetime, type,
+            number and name.
+        """
+        self.pbap.select_phonebook(location, folder)
+        key = f"{self.pbap.device_address}/{location}/{folder}"
+        watermark = self.state.get(key)
+        filters = self.pbap.projection_filters(self.profile)
+        # PullAll returns no handles: List() pages with the same offsets supply them.
+        handle_pages = self.pbap.handle_pages(self.page_size)
+        entries = []
+        new_count = None
+        offset = 0
+        for _ in range(self.max_pages):
+            handles = next(handle_pages, [])
+            contacts = self.pbap.pull_page(offset, self.page_size, filters=filters)
+            if len(handles) != len(contacts):
+                print(f" {key}: List() returned {len(handles)} handles where PullAll returned {len(contacts)} entries")
+                handles = handles[:len(contacts)] + [None] * (len(contacts) - len(handles))
+            entries.extend(self.make_entry(contact, handle) for contact, handle in zip(contacts, handles))
+            complete = len(contacts) < self.page_size
+            new_count = self.count_new(entries, watermark)
+            if new_count is not None or complete:
+                break
+            offset += self.page_size
+        if new_count is None and watermark and not watermark.get("datetime"):
+            # Without timestamps the entries cannot be told apart once the stored run
+            # is lost (too many new calls, or old ones deleted): report none of them.
+            print(f" {key}: last seen entries not found in the newest {len(entries)}, "
+                  f"resuming from the newest entry")
+            if entries:
+                self.state[key] = self.make_watermark(entries)
+                self.save_state()
+            return []
+        new_entries = entries if new_count is None else entries[:new_count]
+        if new_entries:
+            self.state[key] = self.make_watermark(entries, watermark)
+            self.save_state()
+        return new_entries
+
+    def make_watermark(self, entries, previous=None):
+        """Build the watermark from the newest entries of a poll.
+
+        Args:
+            entries: Entries pulled by the poll, newest first.
+            previous: Watermark the poll started from.
+        """
+        newest = entries[0]
+        if newest["datetime"]:
+            digests = [entry["digest"] for entry in entries if entry["datetime"] == newest["datetime"]]
+            if previous and previous.get("datetime") == newest["datetime"]:
+                # Still the same second: keep the digests of the calls seen in earlier polls.
+                digests = previous["digests"] + [digest for digest in digests if digest not in previous["digests"]]
+        else:
+            digests = [entry["digest"] for entry in entries[:self.page_size]]
+        return {"datetime": newest["datetime"], "handle": newest["handle"], "digests": digests}
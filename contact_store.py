@@ -0,0 +1,357 @@
+import base64
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+
+schema = """
+CREATE TABLE IF NOT EXISTS contacts (
+    address TEXT NOT NULL,
+    repository TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    handle TEXT NOT NULL,
+    fn TEXT,
+    name_key TEXT,
+    sound_key TEXT,
+    digest TEXT,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (address, repository, folder, handle)
+);
+CREATE INDEX IF NOT EXISTS contacts_name_key ON contacts (name_key);
+CREATE INDEX IF NOT EXISTS contacts_sound_key ON contacts (sound_key);
+CREATE TABLE IF NOT EXISTS numbers (
+    address TEXT NOT NULL,
+    repository TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    handle TEXT NOT NULL,
+    number TEXT NOT NULL,
+    normalized TEXT NOT NULL,
+    digits_reversed TEXT NOT NULL,
+    types TEXT
+);
+CREATE INDEX IF NOT EXISTS numbers_normalized ON numbers (normalized);
+CREATE INDEX IF NOT EXISTS numbers_digits_reversed ON numbers (digits_reversed);
+CREATE INDEX IF NOT EXISTS numbers_owner ON numbers (address, repository, folder, handle);
+CREATE TABLE IF NOT EXISTS counters (
+    address TEXT NOT NULL,
+    repository TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    database_identifier TEXT,
+    primary_counter TEXT,
+    secondary_counter TEXT,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (address, repository, folder)
+);
+"""
+
+
+def normalize_number(number, default_country_code=None):
+    """Normalize a phone number for matching.
+
+    Separators are dropped, an international "00" prefix becomes "+", and when a
+    default country code is given a national number with a leading trunk "0" is
+    rewritten to E.164 (e.g. "030 1234" with "49" -> "+49301234").
+
+    Args:
+        number: Number as found in a vCard or caller ID.
+        default_country_code: Country calling code without "+", e.g. "49".
+    Returns:
+        The normalized number ("" when it has no digits).
+    """
+    number = str(number).strip()
+    digits = re.sub(r"\D", "", number)
+    if not digits:
+        return ""
+    if number.startswith("+"):
+        return "+" + digits
+    if digits.startswith("00"):
+        return "+" + digits[2:]
+    if default_country_code and digits.startswith("0"):
+        return f"+{default_country_code}{digits[1:]}"
+    return digits
+
+
+def number_digits(number):
+    """Return only the digits of a number."""
+    return re.sub(r"\D", "", str(number))
+
+
+def normalize_name(name):
+    """Case-fold a name and strip accents and extra whitespace for indexed prefix matching."""
+    decomposed = unicodedata.normalize("NFKD", str(name or ""))
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def contact_name(contact):
+    """Return the display name of a parsed contact (FN, falling back to N)."""
+    if contact.get("fn"):
+        return contact["fn"]
+    components = [part for part in (contact.get("n") or []) if part]
+    if len(components) >= 2:
+        return f"{components[1]} {components[0]}"
+    return " ".join(components)
+
+
+def contact_sound(contact):
+    """Return the phonetic name of a parsed contact (SOUND, or the X-PHONETIC-* names)."""
+    phonetic = []
+    for prop in contact.get("properties", []):
+        if prop["name"] == "SOUND" and isinstance(prop["value"], str):
+            return prop["value"]
+        if prop["name"] in ("X-PHONETIC-FIRST-NAME", "X-PHONETIC-LAST-NAME") and isinstance(prop["value"], str):
+            phonetic.append(prop["value"])
+    return " ".join(phonetic)
+
+
+def json_default(value):
+    """json.dumps() default that base64-encodes binary values such as PHOTO."""
+    if isinstance(value, bytes):
+        return {"__bytes__": base64.b64encode(value).decode("ascii")}
+    raise TypeError(type(value))
+
+
+def encode_contact(contact):
+    """Serialize a parsed contact to JSON, base64-encoding binary values such as PHOTO."""
+    return json.dumps(contact, default=json_default)
+
+
+def decode_contact(data):
+    """Inverse of encode_contact()."""
+    def hook(value):
+        if set(value) == {"__bytes__"}:
+            return base64.b64decode(value["__bytes__"])
+        return value
+    return json.loads(data, object_hook=hook)
+
+
+class ContactStore:
+    """SQLite store of pulled PBAP contacts keyed by (device address, repository, folder, handle).
+
+    Names and phone numbers are indexed so that caller-ID lookups and repeat
+    queries are answered locally. The store is safe to share between threads.
+    """
+
+    def __init__(self, db_path, default_country_code=None):
+        """Open (and create if needed) the store.
+
+        Args:
+            db_path: SQLite database file, or ":memory:".
+            default_country_code: Country calling code used to normalize national numbers.
+        """
+        self.db_path = db_path
+        self.default_country_code = default_country_code
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        if db_path != ":memory:":
+            self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(schema)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def upsert_contacts(self, address, repository, folder, contacts, digests=None):
+        """Insert or replace contacts of one folder.
+
+        Args:
+            address: Phone Bluetooth address.
+            repository: PBAP repository, e.g. "int" or "sim1".
+            folder: PBAP folder, e.g. "pb" or "ich".
+            contacts: Iterable of (handle, parsed contact).
+            digests: Optional {handle: digest} stored alongside each contact.
+        Returns:
+            Number of contacts written.
+        """
+        digests = digests or {}
+        now = time.time()
+        count = 0
+        with self.lock, self.connection:
+            for handle, contact in contacts:
+                name = contact_name(contact)
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO contacts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (address, repository, folder, handle, name, normalize_name(name),
+                     normalize_name(contact_sound(contact)), digests.get(handle), encode_contact(contact), now))
+                self.connection.execute(
+                    "DELETE FROM numbers WHERE address = ? AND repository = ? AND folder = ? AND handle = ?",
+                    (address, repository, folder, handle))
+                for tel in contact.get("tel", []):
+                    digits = number_digits(tel["number"])
+                    if not digits:
+                        continue
+                    self.connection.execute(
+                        "INSERT INTO numbers VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (address, repository, folder, handle, tel["number"],
+                         normalize_number(tel["number"], self.default_country_code),
+                         digits[::-1], ",".join(tel.get("types", []))))
+                count += 1
+        return count
+
+    def delete_handles(self, address, repository, folder, handles):
+        """Remove the given handles of one folder."""
+        with self.lock, self.connection:
+            for handle in handles:
+                for table in ("contacts", "numbers"):
+                    self.connection.execute(
+                        f"DELETE FROM {table} WHERE address = ? AND repository = ? AND folder = ? AND handle = ?",
+                        (address, repository, folder, handle))
+
+    def clear_folder(self, address, repository, folder):
+        """Remove every contact and the counters of one folder."""
+        with self.lock, self.connection:
+            for table in ("contacts", "numbers", "counters"):
+                self.connection.execute(
+                    f"DELETE FROM {table} WHERE address = ? AND repository = ? AND folder = ?",
+                    (address, repository, folder))
+
+    def set_counters(self, address, repository, folder, counters):
+        """Record the PBAP version counters the stored folder corresponds to."""
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO counters VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (address, repository, folder, counters.get("DatabaseIdentifier"),
+                 counters.get("PrimaryCounter"), counters.get("SecondaryCounter"), time.time()))
+
+    def get_counters(self, address, repository, folder):
+        """Return the stored counters of one folder (with synced_at), or None if it was never synced."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT * FROM counters WHERE address = ? AND repository = ? AND folder = ?",
+                (address, repository, folder)).fetchone()
+        if row is None:
+            return None
+        return {
+            "DatabaseIdentifier": row["database_identifier"],
+            "PrimaryCounter": row["primary_counter"],
+            "SecondaryCounter": row["secondary_counter"],
+            "synced_at": row["synced_at"],
+        }
+
+    def get_contact(self, address, repository, folder, handle):
+        """Return one stored contact, or None."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT data FROM contacts WHERE address = ? AND repository = ? AND folder = ? AND handle = ?",
+                (address, repository, folder, handle)).fetchone()
+        return decode_contact(row["data"]) if row else None
+
+    def get_handles(self, address, repository, folder):
+        """Return {handle: digest} for one folder."""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT handle, digest FROM contacts WHERE address = ? AND repository = ? AND folder = ?",
+                (address, repository, folder)).fetchall()
+        return {row["handle"]: row["digest"] for row in rows}
+
+    def owner_clause(self, address, repository, folder, table):
+        """Build the optional WHERE terms restricting a query to one device/repository/folder."""
+        clauses = []
+        params = []
+        for column, value in (("address", address), ("repository", repository), ("folder", folder)):
+            if value is not None:
+                clauses.append(f"{table}.{column} = ?")
+                params.append(value)
+        return clauses, params
+
+    def rows_to_results(self, rows):
+        return [{
+            "address": row["address"],
+            "repository": row["repository"],
+            "folder": row["folder"],
+            "handle": row["handle"],
+            "name": row["fn"],
+        } for row in rows]
+
+    def lookup_number(self, number, address=None, repository=None, folder=None):
+        """Find contacts whose stored number normalizes to the same value as number.
+
+        Returns:
+            List of dicts with address, repository, folder, handle and name.
+        """
+        normalized = normalize_number(number, self.default_country_code)
+        if not normalized:
+            return []
+        clauses, params = self.owner_clause(address, repository, folder, "numbers")
+        query = ("SELECT DISTINCT contacts.address, contacts.repository, contacts.folder, contacts.handle, contacts.fn "
+                 "FROM numbers JOIN contacts USING (address, repository, folder, handle) "
+                 "WHERE " + " AND ".join(["numbers.normalized = ?"] + clauses))
+        with self.lock:
+            rows = self.connection.execute(query, [normalized] + params).fetchall()
+        return self.rows_to_results(rows)
+
+    def find_by_name_prefix(self, prefix, address=None, repository=None, folder=None, limit=50, column="name_key"):
+        """Find contacts whose normalized name starts with prefix (served from the name index).
+
+        Falls back to matching the start of any word of the name when no full-name prefix matches.
+        A limit of None returns every match.
+        """
+        key = normalize_name(prefix)
+        limit = -1 if limit is None else limit
+        clauses, params = self.owner_clause(address, repository, folder, "contacts")
+        query = ("SELECT address, repository, folder, handle, fn FROM contacts WHERE "
+                 + " AND ".join([f"{column} >= ? AND {column} < ?"] + clauses)
+                 + f" ORDER BY {column} LIMIT ?")
+        with self.lock:
+            rows = self.connection.execute(query, [key, key + "\uffff"] + params + [limit]).fetchall()
+            if not rows and key:
+                query = ("SELECT address, repository, folder, handle, fn FROM contacts WHERE "
+                         + " AND ".join([f"instr(' ' || {column}, ?) > 0"] + clauses)
+                         + f" ORDER BY {column} LIMIT ?")
+                rows = self.connection.execute(query, [" " + key] + params + [limit]).fetchall()
+        return self.rows_to_results(rows)
+
+    def find_by_number(self, number, address=None, repository=None, folder=None, suffix_digits=7, limit=50):
+        """Find contacts by phone number.
+
+        A stored number matches when its normalized form equals or starts with the
+        normalized query (so "+49 30 1234" finds "030 1234" with country code 49),
+        or when both share the same last suffix_digits digits (caller IDs often
+        arrive in a different national/international format). A limit of None
+        returns every match.
+        """
+        normalized = normalize_number(number, self.default_country_code)
+        digits = number_digits(number)
+        if not normalized:
+            return []
+        clauses, params = self.owner_clause(address, repository, folder, "numbers")
+        match_terms = ["(numbers.normalized >= ? AND numbers.normalized < ?)"]
+        match_params = [normalized, normalized + "\uffff"]
+        if len(digits) >= suffix_digits:
+            suffix = digits[-suffix_digits:][::-1]
+            match_terms.append("(numbers.digits_reversed >= ? AND numbers.digits_reversed < ?)")
+            match_params += [suffix, suffix + "\uffff"]
+        query = ("SELECT DISTINCT contacts.address, contacts.repository, contacts.folder, contacts.handle, contacts.fn "
+                 "FROM numbers JOIN contacts USING (address, repository, folder, handle) "
+                 "WHERE (" + " OR ".join(match_terms) + ")"
+                 + "".join(f" AND {clause}" for clause in clauses) + " LIMIT ?")
+        with self.lock:
+            rows = self.connection.execute(query, match_params + params + [-1 if limit is None else limit]).fetchall()
+        return self.rows_to_results(rows)
+
+    def search(self, search_field, search_value, address=None, repository=None, folder=None, suffix_digits=7,
+               limit=None):
+        """Local equivalent of PhonebookAccess1.Search.
+
+        Args:
+            search_field: "name", "number" or "sound".
+            search_value: Value to match.
+            limit: Maximum number of results; None returns every match, like the remote Search.
+        Returns:
+            List of (handle, name) tuples, the same shape the remote Search returns.
+        """
+        field = str(search_field).lower()
+        if field == "number":
+            results = self.find_by_number(search_value, address, repository, folder, suffix_digits, limit)
+        elif field == "sound":
+            results = self.find_by_name_prefix(search_value, address, repository, folder, limit, column="sound_key")
+        elif field == "name":
+            results = self.find_by_name_prefix(search_value, address, repository, folder, limit)
+        else:
+            raise ValueError(f"Unsupported search field: {search_field}")
+        return [(result["handle"], result["name"]) for result in results]
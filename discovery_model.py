@@ -0,0 +1,131 @@
+from PyQt6.QtCore import QAbstractTableModel
+from PyQt6.QtCore import QModelIndex
+from PyQt6.QtCore import Qt
+
+from libraries.bluetooth import constants
+
+
+class DiscoveryTableModel(QAbstractTableModel):
+    """Table model of the devices under one adapter, updated row by row from the BlueZ object cache."""
+
+    headers = ["DEVICE NAME", "BD_ADDR", "RSSI", "PAIRED"]
+    columns = ["Alias", "Address", "RSSI", "Paired"]
+
+    def __init__(self, object_cache, adapter_path, parent=None):
+        """Initialize an empty model.
+
+        Args:
+            object_cache: BluezObjectCache that mirrors the BlueZ object tree.
+            adapter_path: Adapter object path whose devices are shown, e.g. /org/bluez/hci0.
+            parent: Parent QObject.
+        """
+        super().__init__(parent)
+        self.object_cache = object_cache
+        self.adapter_path = adapter_path
+        self.rows = []
+        self.row_index = {}
+        self.listening = False
+
+    def start(self):
+        """Load the devices already known to BlueZ and start following cache signals."""
+        self.reload()
+        if not self.listening:
+            self.object_cache.add_listener("InterfacesAdded", self.interfaces_added)
+            self.object_cache.add_listener("InterfacesRemoved", self.interfaces_removed)
+            self.object_cache.add_listener("PropertiesChanged", self.properties_changed)
+            self.object_cache.add_listener("NameOwnerChanged", self.name_owner_changed)
+            self.listening = True
+
+    def stop(self):
+        """Stop following cache signals."""
+        if self.listening:
+            self.object_cache.remove_listener("InterfacesAdded", self.interfaces_added)
+            self.object_cache.remove_listener("InterfacesRemoved", self.interfaces_removed)
+            self.object_cache.remove_listener("PropertiesChanged", self.properties_changed)
+            self.object_cache.remove_listener("NameOwnerChanged", self.name_owner_changed)
+            self.listening = False
+
+    def reload(self):
+        """Rebuild every row from the cache (used on start and when bluetoothd restarts)."""
+        self.beginResetModel()
+        self.rows = [[path, dict(props)] for path, props in self.object_cache.get_devices(self.adapter_path)]
+        self.row_index = {path: row for row, (path, _) in enumerate(self.rows)}
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        props = self.rows[index.row()][1]
+        column = self.columns[index.column()]
+        if column == "Alias":
+            return str(props.get("Alias", "Unknown"))
+        if column == "Paired":
+            return "Yes" if props.get("Paired") else "No"
+        value = props.get(column)
+        return "" if value is None else str(value)
+
+    def device_address(self, row):
+        """Return the Bluetooth address shown in a row, or None for an invalid row."""
+        if 0 <= row < len(self.rows):
+            return str(self.rows[row][1].get("Address"))
+        return None
+
+    def interfaces_added(self, path, interfaces):
+        """Insert a row for a new device under this adapter."""
+        props = interfaces.get(constants.device_interface)
+        if props is None or str(props.get("Adapter", "")) != self.adapter_path:
+            return
+        if path in self.row_index:
+            self.update_row(path, props)
+            return
+        row = len(self.rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.rows.append([path, dict(props)])
+        self.row_index[path] = row
+        self.endInsertRows()
+
+    def interfaces_removed(self, path, interfaces):
+        """Remove the row of a device that BlueZ dropped."""
+        if constants.device_interface not in interfaces or path not in self.row_index:
+            return
+        row = self.row_index[path]
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.rows[row]
+        del self.row_index[path]
+        for later_path, _ in self.rows[row:]:
+            self.row_index[later_path] -= 1
+        self.endRemoveRows()
+
+    def properties_changed(self, path, interface, changed, invalidated):
+        """Refresh only the cells whose Device1 properties changed."""
+        if interface != constants.device_interface or path not in self.row_index:
+            return
+        props = dict(self.rows[self.row_index[path]][1])
+        props.update(changed)
+        for name in invalidated:
+            props.pop(name, None)
+        self.update_row(path, props)
+
+    def update_row(self, path, props):
+        """Store new properties for a row and emit dataChanged for the columns that differ."""
+        row = self.row_index[path]
+        old = self.rows[row][1]
+        changed_columns = [column for column, name in enumerate(self.columns) if old.get(name) != props.get(name)]
+        self.rows[row][1] = dict(props)
+        if changed_columns:
+            self.dataChanged.emit(self.index(row, min(changed_columns)), self.index(row, max(changed_columns)))
+
+    def name_owner_changed(self, owner):
+        """Rebuild the rows after bluetoothd restarted or went away."""
+        self.reload()
@@ -0,0 +1,125 @@
+import os
+import shlex
+import subprocess
+import threading
+
+from Backend_lib.Linux import constants
+from hci_decoder import BtsnoopReader
+from hci_decoder import format_record
+
+
+class HciCapture:
+    """Record HCI traffic as a binary btsnoop capture and decode it as it grows.
+
+    btmon writes the packets in the Linux monitor btsnoop format, which is far
+    smaller than hcidump -Xt hex text and keeps every field. A background
+    thread follows the capture with BtsnoopReader and writes one decoded line
+    per packet to a text log for the dump-log panes; subscribers registered
+    with add_listener() receive the structured records. A synthetic capture
+    (see hci_decoder.BtsnoopWriter) can be followed the same way by passing
+    command="" so that no capture process is started.
+    """
+
+    def __init__(self, interface, capture_path, text_path=None, command=None, poll_interval=0.2, log=None):
+        """Initialize the capture.
+
+        Args:
+            interface: Controller interface, e.g. "hci0".
+            capture_path: btsnoop file written by the capture process.
+            text_path: Decoded text log; capture_path + ".log" when None.
+            command: Capture command template; constants.btmon_capture_command when None,
+                an empty string to only follow an existing file.
+            poll_interval: Seconds between reads of the capture file.
+            log: Logger instance; messages are printed when None.
+        """
+        self.interface = interface
+        self.capture_path = capture_path
+        self.text_path = text_path or f"{capture_path}.log"
+        self.command = constants.btmon_capture_command if command is None else command
+        self.poll_interval = poll_interval
+        self.log = log
+        self.process = None
+        self.listeners = []
+        self.listeners_lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+        self.records = 0
+
+    def info(self, message, *args):
+        if self.log:
+            self.log.info(message, *args)
+        else:
+            print(message % args if args else message)
+
+    def add_listener(self, callback):
+        """Call callback(records) from the capture thread for every batch of decoded records."""
+        with self.listeners_lock:
+            self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self.listeners_lock:
+            if callback in self.listeners:
+                self.listeners.remove(callback)
+
+    def start(self):
+        """Start the capture process and the decoding thread.
+
+        Returns:
+            Path of the decoded text log, like start_dump_logs() returns the hcidump log.
+        """
+        if self.command:
+            if os.path.exists(self.capture_path):
+                os.remove(self.capture_path)
+            command = self.command.format(interface=self.interface, capture_file=self.capture_path)
+            self.process = subprocess.Popen(shlex.split(command), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            self.info("Started HCI capture: %s", command)
+        open(self.text_path, "w").close()
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, name=f"hci-capture-{self.interface}", daemon=True)
+        self.thread.start()
+        return self.text_path
+
+    def stop(self):
+        """Stop the capture process and decode what is left in the file."""
+        if self.process:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process = None
+        self.stopped.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+        self.info("Stopped HCI capture of %s: %d packets in %s", self.interface, self.records, self.capture_path)
+
+    def run(self):
+        stream = None
+        reader = None
+        with open(self.text_path, "a") as text_file:
+            while True:
+                stopping = self.stopped.is_set()
+                if stream is None and os.path.exists(self.capture_path):
+                    stream = open(self.capture_path, "rb")
+                    reader = BtsnoopReader(stream)
+                if reader is not None:
+                    try:
+                        records = reader.read_records()
+                    except ValueError as e:
+                        self.info("Cannot decode %s: %s", self.capture_path, e)
+                        break
+                    if records:
+                        self.records += len(records)
+                        text_file.write("".join(format_record(record) + "\n" for record in records))
+                        text_file.flush()
+                        with self.listeners_lock:
+                            listeners = list(self.listeners)
+                        for callback in listeners:
+                            callback(records)
+                        continue
+                if stopping:
+                    break
+                self.stopped.wait(self.poll_interval)
+        if stream:
+            stream.close()
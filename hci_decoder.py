@@ -0,0 +1,525 @@
+import argparse
+import json
+import struct
+import sys
+import time
+
+
+btsnoop_magic = b"btsnoop\x00"
+btsnoop_version = 1
+# Microseconds between the btsnoop epoch (midnight, January 1st, 0 AD) and the Unix epoch.
+btsnoop_epoch_delta = 0x00DCDDB30F2F8000
+
+# btsnoop datalink types.
+datalink_hci = 1001
+datalink_h4 = 1002
+datalink_monitor = 2001
+
+file_header = struct.Struct(">8sII")
+record_header = struct.Struct(">IIIIq")
+
+# H4 packet indicators.
+packet_types = {0x01: "command", 0x02: "acl", 0x03: "sco", 0x04: "event", 0x05: "iso"}
+packet_indicators = {name: indicator for indicator, name in packet_types.items()}
+
+# Linux monitor (btmon) opcodes: opcode -> (record type, direction).
+monitor_opcodes = {
+    0: ("new-index", None),
+    1: ("delete-index", None),
+    2: ("command", "tx"),
+    3: ("event", "rx"),
+    4: ("acl", "tx"),
+    5: ("acl", "rx"),
+    6: ("sco", "tx"),
+    7: ("sco", "rx"),
+    8: ("open-index", None),
+    9: ("close-index", None),
+    10: ("index-info", None),
+    11: ("vendor-diag", None),
+    12: ("note", None),
+    13: ("user-logging", None),
+    14: ("control-open", None),
+    15: ("control-close", None),
+    16: ("control-command", None),
+    17: ("control-event", None),
+    18: ("iso", "tx"),
+    19: ("iso", "rx"),
+}
+monitor_packet_opcodes = {(record_type, direction): opcode
+                          for opcode, (record_type, direction) in monitor_opcodes.items() if direction}
+
+ogf_names = {
+    0x01: "Link Control",
+    0x02: "Link Policy",
+    0x03: "Controller & Baseband",
+    0x04: "Informational",
+    0x05: "Status Parameters",
+    0x06: "Testing",
+    0x08: "LE Controller",
+    0x3F: "Vendor",
+}
+
+# Opcode -> command name.
+command_names = {
+    0x0401: "Inquiry",
+    0x0402: "Inquiry Cancel",
+    0x0405: "Create Connection",
+    0x0406: "Disconnect",
+    0x0408: "Create Connection Cancel",
+    0x0409: "Accept Connection Request",
+    0x040A: "Reject Connection Request",
+    0x040B: "Link Key Request Reply",
+    0x040C: "Link Key Request Negative Reply",
+    0x040D: "PIN Code Request Reply",
+    0x040E: "PIN Code Request Negative Reply",
+    0x0411: "Authentication Requested",
+    0x0413: "Set Connection Encryption",
+    0x0419: "Remote Name Request",
+    0x041A: "Remote Name Request Cancel",
+    0x041B: "Read Remote Supported Features",
+    0x041C: "Read Remote Extended Features",
+    0x041D: "Read Remote Version Information",
+    0x0428: "Setup Synchronous Connection",
+    0x0429: "Accept Synchronous Connection Request",
+    0x042B: "IO Capability Request Reply",
+    0x042C: "User Confirmation Request Reply",
+    0x042D: "User Confirmation Request Negative Reply",
+    0x043D: "Enhanced Setup Synchronous Connection",
+    0x0803: "Sniff Mode",
+    0x0804: "Exit Sniff Mode",
+    0x0809: "Role Discovery",
+    0x080B: "Switch Role",
+    0x080C: "Read Link Policy Settings",
+    0x080D: "Write Link Policy Settings",
+    0x080F: "Write Default Link Policy Settings",
+    0x0C01: "Set Event Mask",
+    0x0C03: "Reset",
+    0x0C05: "Set Event Filter",
+    0x0C13: "Write Local Name",
+    0x0C14: "Read Local Name",
+    0x0C16: "Write Connection Accept Timeout",
+    0x0C18: "Write Page Timeout",
+    0x0C1A: "Write Scan Enable",
+    0x0C1C: "Write Page Scan Activity",
+    0x0C1E: "Write Inquiry Scan Activity",
+    0x0C23: "Read Class of Device",
+    0x0C24: "Write Class of Device",
+    0x0C33: "Host Buffer Size",
+    0x0C45: "Write Inquiry Mode",
+    0x0C52: "Write Extended Inquiry Response",
+    0x0C56: "Write Simple Pairing Mode",
+    0x0C6D: "Write LE Host Supported",
+    0x0C7A: "Write Secure Connections Host Support",
+    0x1001: "Read Local Version Information",
+    0x1002: "Read Local Supported Commands",
+    0x1003: "Read Local Supported Features",
+    0x1004: "Read Local Extended Features",
+    0x1005: "Read Buffer Size",
+    0x1009: "Read BD ADDR",
+    0x1401: "Read Failed Contact Counter",
+    0x1403: "Read Link Quality",
+    0x1405: "Read RSSI",
+    0x2001: "LE Set Event Mask",
+    0x2002: "LE Read Buffer Size",
+    0x2003: "LE Read Local Supported Features",
+    0x2005: "LE Set Random Address",
+    0x2006: "LE Set Advertising Parameters",
+    0x2008: "LE Set Advertising Data",
+    0x2009: "LE Set Scan Response Data",
+    0x200A: "LE Set Advertising Enable",
+    0x200B: "LE Set Scan Parameters",
+    0x200C: "LE Set Scan Enable",
+    0x200D: "LE Create Connection",
+    0x200E: "LE Create Connection Cancel",
+    0x2011: "LE Add Device To Filter Accept List",
+    0x2013: "LE Connection Update",
+    0x2016: "LE Read Remote Features",
+    0x2019: "LE Enable Encryption",
+    0x2022: "LE Set Data Length",
+    0x2031: "LE Set Default PHY",
+    0x2032: "LE Set PHY",
+    0x2036: "LE Set Extended Advertising Parameters",
+    0x2037: "LE Set Extended Advertising Data",
+    0x2039: "LE Set Extended Advertising Enable",
+    0x2041: "LE Set Extended Scan Parameters",
+    0x2042: "LE Set Extended Scan Enable",
+    0x2043: "LE Extended Create Connection",
+}
+
+# Commands whose first parameter is a connection handle.
+command_handle_opcodes = {
+    0x0406, 0x0411, 0x0413, 0x041B, 0x041C, 0x041D, 0x0428, 0x043D, 0x0803, 0x0804, 0x0809, 0x080C,
+    0x080D, 0x1401, 0x1403, 0x1405, 0x2013, 0x2016, 0x2019, 0x2022, 0x2032,
+}
+
+# Event code -> (name, offset of the status byte or None, offset of the connection handle or None).
+event_layouts = {
+    0x01: ("Inquiry Complete", 0, None),
+    0x02: ("Inquiry Result", None, None),
+    0x03: ("Connection Complete", 0, 1),
+    0x04: ("Connection Request", None, None),
+    0x05: ("Disconnection Complete", 0, 1),
+    0x06: ("Authentication Complete", 0, 1),
+    0x07: ("Remote Name Request Complete", 0, None),
+    0x08: ("Encryption Change", 0, 1),
+    0x0B: ("Read Remote Supported Features Complete", 0, 1),
+    0x0C: ("Read Remote Version Information Complete", 0, 1),
+    0x0E: ("Command Complete", 3, None),
+    0x0F: ("Command Status", 0, None),
+    0x10: ("Hardware Error", None, None),
+    0x12: ("Role Change", 0, None),
+    0x13: ("Number of Completed Packets", None, None),
+    0x14: ("Mode Change", 0, 1),
+    0x16: ("PIN Code Request", None, None),
+    0x17: ("Link Key Request", None, None),
+    0x18: ("Link Key Notification", None, None),
+    0x1B: ("Max Slots Change", None, 0),
+    0x22: ("Inquiry Result with RSSI", None, None),
+    0x23: ("Read Remote Extended Features Complete", 0, 1),
+    0x2C: ("Synchronous Connection Complete", 0, 1),
+    0x2F: ("Extended Inquiry Result", None, None),
+    0x30: ("Encryption Key Refresh Complete", 0, 1),
+    0x31: ("IO Capability Request", None, None),
+    0x32: ("IO Capability Response", None, None),
+    0x33: ("User Confirmation Request", None, None),
+    0x36: ("Simple Pairing Complete", 0, None),
+    0x3E: ("LE Meta", None, None),
+    0xFF: ("Vendor", None, None),
+}
+
+# LE Meta subevent -> (name, status offset, handle offset); offsets count the subevent byte.
+le_subevent_layouts = {
+    0x01: ("LE Connection Complete", 1, 2),
+    0x02: ("LE Advertising Report", None, None),
+    0x03: ("LE Connection Update Complete", 1, 2),
+    0x04: ("LE Read Remote Features Complete", 1, 2),
+    0x05: ("LE Long Term Key Request", None, 1),
+    0x07: ("LE Data Length Change", None, 1),
+    0x0A: ("LE Enhanced Connection Complete", 1, 2),
+    0x0C: ("LE PHY Update Complete", 1, 2),
+    0x0D: ("LE Extended Advertising Report", None, None),
+}
+
+
+def split_opcode(opcode):
+    """Return (OGF, OCF) of an HCI command opcode."""
+    return opcode >> 10, opcode & 0x03FF
+
+
+def make_opcode(ogf, ocf):
+    return (ogf << 10) | ocf
+
+
+def command_name(opcode):
+    ogf, ocf = split_opcode(opcode)
+    return command_names.get(opcode, f"{ogf_names.get(ogf, 'Unknown')} 0x{ocf:04x}")
+
+
+def read_handle(data, offset):
+    if offset is None or len(data) < offset + 2:
+        return None
+    return struct.unpack_from("<H", data, offset)[0] & 0x0FFF
+
+
+def decode_command(data):
+    """Decode an HCI command packet (without the H4 indicator)."""
+    if len(data) < 3:
+        return {"truncated": True}
+    opcode, plen = struct.unpack_from("<HB", data)
+    ogf, ocf = split_opcode(opcode)
+    params = data[3:]
+    fields = {"opcode": opcode, "ogf": ogf, "ocf": ocf, "name": command_name(opcode), "plen": plen}
+    if opcode in command_handle_opcodes:
+        fields["handle"] = read_handle(params, 0)
+    return fields
+
+
+def decode_event(data):
+    """Decode an HCI event packet (without the H4 indicator)."""
+    if len(data) < 2:
+        return {"truncated": True}
+    code, plen = struct.unpack_from("<BB", data)
+    params = data[2:]
+    name, status_offset, handle_offset = event_layouts.get(code, (f"Unknown 0x{code:02x}", None, None))
+    fields = {"event": code, "name": name, "plen": plen}
+    if code == 0x3E and params:
+        subevent = params[0]
+        name, status_offset, handle_offset = le_subevent_layouts.get(
+            subevent, (f"LE Meta 0x{subevent:02x}", None, None))
+        fields["subevent"] = subevent
+        fields["name"] = name
+    elif code == 0x0E and len(params) >= 3:
+        fields["command_opcode"] = struct.unpack_from("<H", params, 1)[0]
+        fields["command_name"] = command_name(fields["command_opcode"])
+    elif code == 0x0F and len(params) >= 4:
+        fields["command_opcode"] = struct.unpack_from("<H", params, 2)[0]
+        fields["command_name"] = command_name(fields["command_opcode"])
+    elif code == 0x13 and params:
+        count = params[0]
+        fields["handles"] = [read_handle(params, 1 + index * 4) for index in range(count)
+                             if len(params) >= 3 + index * 4]
+    if status_offset is not None and len(params) > status_offset:
+        fields["status"] = params[status_offset]
+    handle = read_handle(params, handle_offset)
+    if handle is not None:
+        fields["handle"] = handle
+    return fields
+
+
+def decode_acl(data):
+    """Decode an ACL data packet header."""
+    if len(data) < 4:
+        return {"truncated": True}
+    handle_flags, dlen = struct.unpack_from("<HH", data)
+    return {"handle": handle_flags & 0x0FFF, "pb": (handle_flags >> 12) & 0x3, "bc": (handle_flags >> 14) & 0x3,
+            "dlen": dlen}
+
+
+def decode_sco(data):
+    """Decode a SCO data packet header."""
+    if len(data) < 3:
+        return {"truncated": True}
+    handle_flags, dlen = struct.unpack_from("<HB", data)
+    return {"handle": handle_flags & 0x0FFF, "dlen": dlen}
+
+
+def decode_iso(data):
+    """Decode an ISO data packet header."""
+    if len(data) < 4:
+        return {"truncated": True}
+    handle_flags, length = struct.unpack_from("<HH", data)
+    return {"handle": handle_flags & 0x0FFF, "pb": (handle_flags >> 12) & 0x3, "ts": (handle_flags >> 14) & 0x1,
+            "dlen": length & 0x3FFF}
+
+
+packet_decoders = {
+    "command": decode_command,
+    "event": decode_event,
+    "acl": decode_acl,
+    "sco": decode_sco,
+    "iso": decode_iso,
+}
+
+
+def decode_packet(record_type, data):
+    """Decode the header fields of one HCI packet.
+
+    Args:
+        record_type: "command", "event", "acl", "sco" or "iso".
+        data: Packet bytes without the H4 indicator.
+    Returns:
+        Dict of decoded fields (empty for record types without a decoder).
+    """
+    decoder = packet_decoders.get(record_type)
+    return decoder(data) if decoder else {}
+
+
+def make_record(offset, timestamp_us, dropped, index, record_type, direction, data):
+    """Build the structured record of one captured packet."""
+    record = {
+        "offset": offset,
+        "timestamp": (timestamp_us - btsnoop_epoch_delta) / 1e6,
+        "index": index,
+        "type": record_type,
+        "direction": direction,
+        "length": len(data),
+        "dropped": dropped,
+    }
+    if record_type == "note":
+        record["text"] = data.rstrip(b"\x00").decode("utf-8", errors="replace")
+    else:
+        record.update(decode_packet(record_type, data))
+    return record
+
+
+class BtsnoopReader:
+    """Incremental reader of btsnoop captures (HCI, H4 or Linux monitor datalink).
+
+    read_records() returns only complete records and stops in front of a
+    partly written one, so a capture that is still being written can be
+    followed by calling it again later.
+    """
+
+    def __init__(self, stream):
+        """Initialize the reader.
+
+        Args:
+            stream: Binary file object positioned at the start of the capture.
+        """
+        self.stream = stream
+        self.datalink = None
+        self.position = 0
+
+    def read_header(self):
+        """Read the file header; returns False while it is not complete yet.
+
+        Raises:
+            ValueError: When the stream is not a btsnoop capture.
+        """
+        self.stream.seek(0)
+        data = self.stream.read(file_header.size)
+        if len(data) < file_header.size:
+            return False
+        magic, version, datalink = file_header.unpack(data)
+        if magic != btsnoop_magic or version != btsnoop_version:
+            raise ValueError("Not a btsnoop version 1 capture")
+        if datalink not in (datalink_hci, datalink_h4, datalink_monitor):
+            raise ValueError(f"Unsupported btsnoop datalink {datalink}")
+        self.datalink = datalink
+        self.position = file_header.size
+        return True
+
+    def read_records(self, limit=None):
+        """Return the complete records after the last one read, as structured dicts."""
+        if self.datalink is None and not self.read_header():
+            return []
+        records = []
+        self.stream.seek(self.position)
+        while limit is None or len(records) < limit:
+            header = self.stream.read(record_header.size)
+            if len(header) < record_header.size:
+                break
+            original_length, included_length, flags, dropped, timestamp_us = record_header.unpack(header)
+            data = self.stream.read(included_length)
+            if len(data) < included_length:
+                break
+            records.append(self.decode(self.position, flags, dropped, timestamp_us, data))
+            self.position += record_header.size + included_length
+        self.stream.seek(self.position)
+        return records
+
+    def decode(self, offset, flags, dropped, timestamp_us, data):
+        index = 0
+        if self.datalink == datalink_monitor:
+            index, opcode = flags >> 16, flags & 0xFFFF
+            record_type, direction = monitor_opcodes.get(opcode, (f"monitor-0x{opcode:04x}", None))
+        else:
+            direction = "rx" if flags & 0x01 else "tx"
+            if self.datalink == datalink_h4:
+                record_type = packet_types.get(data[0], "unknown") if data else "unknown"
+                data = data[1:]
+            elif flags & 0x02:
+                record_type = "event" if direction == "rx" else "command"
+            else:
+                record_type = "acl"
+        return make_record(offset, timestamp_us, dropped, index, record_type, direction, data)
+
+
+def read_btsnoop(path):
+    """Yield the structured records of a btsnoop capture file."""
+    with open(path, "rb") as stream:
+        reader = BtsnoopReader(stream)
+        while True:
+            records = reader.read_records(limit=4096)
+            if not records:
+                return
+            yield from records
+
+
+class BtsnoopWriter:
+    """Write a btsnoop capture, e.g. a synthetic packet file for tests and replays."""
+
+    def __init__(self, path, datalink=datalink_monitor):
+        """Create the file and write its header.
+
+        Args:
+            path: Capture file path.
+            datalink: datalink_monitor, datalink_h4 or datalink_hci.
+        """
+        self.datalink = datalink
+        self.stream = open(path, "wb")
+        self.stream.write(file_header.pack(btsnoop_magic, btsnoop_version, datalink))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.stream.close()
+
+    def write_packet(self, record_type, data, direction=None, timestamp=None, index=0, dropped=0):
+        """Append one packet.
+
+        Args:
+            record_type: "command", "event", "acl", "sco" or "iso" ("note" on the monitor datalink).
+            data: Packet bytes without the H4 indicator.
+            direction: "tx" (host to controller) or "rx"; defaults to tx for commands, rx otherwise.
+            timestamp: Unix time in seconds; now when None.
+            index: Controller index (monitor datalink only).
+            dropped: Cumulative number of dropped packets.
+        """
+        if direction is None:
+            direction = "tx" if record_type == "command" else "rx"
+        if self.datalink == datalink_monitor:
+            opcode = 12 if record_type == "note" else monitor_packet_opcodes[(record_type, direction)]
+            flags = (index << 16) | opcode
+        else:
+            flags = (0x01 if direction == "rx" else 0x00) | (0x02 if record_type in ("command", "event") else 0x00)
+            if self.datalink == datalink_h4:
+                data = bytes([packet_indicators[record_type]]) + data
+        timestamp_us = int((time.time() if timestamp is None else timestamp) * 1e6) + btsnoop_epoch_delta
+        self.stream.write(record_header.pack(len(data), len(data), flags, dropped, timestamp_us))
+        self.stream.write(data)
+        self.stream.flush()
+
+
+def command_packet(opcode, params=b""):
+    """Build an HCI command packet."""
+    return struct.pack("<HB", opcode, len(params)) + params
+
+
+def event_packet(code, params=b""):
+    """Build an HCI event packet."""
+    return struct.pack("<BB", code, len(params)) + params
+
+
+def acl_packet(handle, payload=b"", pb=0x2, bc=0x0):
+    """Build an ACL data packet."""
+    return struct.pack("<HH", (handle & 0x0FFF) | (pb << 12) | (bc << 14), len(payload)) + payload
+
+
+def format_record(record):
+    """Return a one-line, hcidump-like text rendering of a record for the log panes."""
+    when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record["timestamp"]))
+    when += f".{int(record['timestamp'] * 1e6) % 1000000:06d}"
+    arrow = {"tx": "<", "rx": ">"}.get(record["direction"], "=")
+    record_type = record["type"]
+    if record.get("truncated"):
+        text = f"{record_type} (truncated, {record['length']} bytes)"
+    elif record_type == "command":
+        text = f"HCI Command: {record['name']} (0x{record['ogf']:02x}|0x{record['ocf']:04x}) plen {record['plen']}"
+    elif record_type == "event":
+        text = f"HCI Event: {record['name']} (0x{record['event']:02x}) plen {record['plen']}"
+        if "command_opcode" in record:
+            ogf, ocf = split_opcode(record["command_opcode"])
+            text += f" {record['command_name']} (0x{ogf:02x}|0x{ocf:04x})"
+    elif record_type in ("acl", "sco", "iso"):
+        text = f"{record_type.upper()} data: handle 0x{record['handle']:04x}"
+        if "pb" in record:
+            text += f" flags 0x{record['pb'] | (record.get('bc', 0) << 2):02x}"
+        text += f" dlen {record['dlen']}"
+    elif record_type == "note":
+        text = f"Note: {record['text']}"
+    else:
+        text = f"{record_type} ({record['length']} bytes)"
+    if "status" in record:
+        text += f" status 0x{record['status']:02x}"
+    if "handle" in record and record_type in ("command", "event"):
+        text += f" handle 0x{record['handle']:04x}"
+    return f"{when} {arrow} {text}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Decode a btsnoop/btmon HCI capture.")
+    parser.add_argument("capture", help="btsnoop capture file")
+    parser.add_argument("--json", action="store_true", help="Write one JSON record per line instead of text")
+    args = parser.parse_args(argv)
+    for record in read_btsnoop(args.capture):
+        print(json.dumps(record) if args.json else format_record(record))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
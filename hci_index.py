@@ -0,0 +1,320 @@
+import datetime
+import heapq
+import threading
+from array import array
+from bisect import bisect_left
+from bisect import bisect_right
+
+from hci_decoder import BtsnoopReader
+from hci_decoder import make_opcode
+from hci_decoder import record_header
+
+
+# Words of a filter query that only make it read naturally.
+filler_words = ("all", "for", "with", "on", "packets", "records")
+# Shortcuts selecting a record type.
+type_words = {"commands": "command", "command": "command", "events": "event", "event": "event", "acl": "acl",
+              "sco": "sco", "iso": "iso", "notes": "note"}
+# Query keywords taking a numeric value -> query() argument.
+value_keys = {"handle": "handle", "opcode": "opcode", "ogf": "ogf", "ocf": "ocf", "event": "event",
+              "code": "event", "subevent": "subevent"}
+
+
+def post(postings, key, number):
+    numbers = postings.get(key)
+    if numbers is None:
+        numbers = postings[key] = array("I")
+    numbers.append(number)
+
+
+def parse_time(text, reference):
+    """Parse a query time: Unix seconds, HH:MM[:SS[.ffffff]] on the capture's day, or +seconds from its start.
+
+    Args:
+        text: Time as typed.
+        reference: Timestamp of the first record of the capture (None when it is empty).
+    """
+    if text.startswith("+"):
+        return (reference or 0.0) + float(text[1:])
+    if ":" in text:
+        day = datetime.datetime.fromtimestamp(reference) if reference else datetime.datetime.now()
+        parts = text.split(":")
+        seconds = float(parts[2]) if len(parts) > 2 else 0.0
+        moment = day.replace(hour=int(parts[0]), minute=int(parts[1]), second=0, microsecond=0)
+        return moment.timestamp() + seconds
+    return float(text)
+
+
+def parse_query(text, reference=None):
+    """Turn a filter such as "all events for handle 0x0040 between 12:00:01 and 12:00:05" into query() arguments.
+
+    Keywords: handle, opcode, ogf, ocf, event (or code), subevent, type, the
+    type words commands/events/acl/sco/iso/notes, and from/to/between ... and ...
+    for the time range. Numbers may be decimal or 0x-prefixed.
+
+    Raises:
+        ValueError: For an unknown word or a missing value.
+    """
+    tokens = text.replace(",", " ").split()
+    criteria = {}
+    index = 0
+
+    def value():
+        if index + 1 >= len(tokens):
+            raise ValueError(f"Missing value after {tokens[index]}")
+        return tokens[index + 1]
+
+    while index < len(tokens):
+        word = tokens[index].lower()
+        if word in filler_words:
+            index += 1
+        elif word in value_keys and (word != "event" or index + 1 < len(tokens) and tokens[index + 1][:1].isdigit()):
+            criteria[value_keys[word]] = int(value(), 0)
+            index += 2
+        elif word in type_words:
+            criteria["record_type"] = type_words[word]
+            index += 1
+        elif word == "type":
+            criteria["record_type"] = type_words.get(value().lower(), value().lower())
+            index += 2
+        elif word in ("from", "after", "since"):
+            criteria["start"] = parse_time(value(), reference)
+            index += 2
+        elif word in ("to", "until", "before"):
+            criteria["end"] = parse_time(value(), reference)
+            index += 2
+        elif word == "between":
+            if index + 3 >= len(tokens) or tokens[index + 2].lower() != "and":
+                raise ValueError("Expected: between <time> and <time>")
+            criteria["start"] = parse_time(tokens[index + 1], reference)
+            criteria["end"] = parse_time(tokens[index + 3], reference)
+            index += 4
+        else:
+            raise ValueError(f"Unknown filter word {tokens[index]}")
+    return criteria
+
+
+class HciIndex:
+    """Offset index over a btsnoop capture for fast filtering.
+
+    For every record the index keeps its byte offset and timestamp, plus
+    posting lists (sorted arrays of record numbers) keyed by connection
+    handle, opcode, OGF, event code, LE subevent and record type. Command
+    Complete/Status events are also filed under the opcode they answer.
+    Records are numbered in capture order, which is timestamp order, so a
+    time range is a binary search over the timestamps. A query bisects the
+    posting lists to that range and intersects them by bisecting the longer
+    lists for each candidate of the shortest, so its cost follows the number
+    of matches rather than the size of the capture. Only the matching records
+    are read back from the capture, contiguous ones in a single read.
+
+    The index is fed either by an HciCapture listener (add_records) or by
+    its own background thread following the file (start).
+    """
+
+    def __init__(self, capture_path, poll_interval=0.5):
+        """Initialize an empty index.
+
+        Args:
+            capture_path: btsnoop capture file.
+            poll_interval: Seconds between reads when following the file with start().
+        """
+        self.capture_path = capture_path
+        self.poll_interval = poll_interval
+        self.lock = threading.Lock()
+        self.offsets = array("Q")
+        self.timestamps = array("d")
+        self.by_handle = {}
+        self.by_opcode = {}
+        self.by_ogf = {}
+        self.by_event = {}
+        self.by_subevent = {}
+        self.by_type = {}
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def first_timestamp(self):
+        with self.lock:
+            return self.timestamps[0] if self.timestamps else None
+
+    def add_records(self, records):
+        """Index decoded records (hci_decoder dicts carrying their file offset), in capture order."""
+        with self.lock:
+            for record in records:
+                number = len(self.offsets)
+                self.offsets.append(record["offset"])
+                self.timestamps.append(record["timestamp"])
+                post(self.by_type, record["type"], number)
+                handles = set(record.get("handles") or ())
+                if record.get("handle") is not None:
+                    handles.add(record["handle"])
+                for handle in handles:
+                    post(self.by_handle, handle, number)
+                opcode = record.get("opcode", record.get("command_opcode"))
+                if opcode is not None:
+                    post(self.by_opcode, opcode, number)
+                    post(self.by_ogf, opcode >> 10, number)
+                if record["type"] == "event" and "event" in record:
+                    post(self.by_event, record["event"], number)
+                    if "subevent" in record:
+                        post(self.by_subevent, record["subevent"], number)
+
+    def start(self):
+        """Follow the capture file on a background thread."""
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, name="hci-index", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def run(self):
+        stream = None
+        try:
+            while not self.stopped.is_set():
+                if stream is None:
+                    try:
+                        stream = open(self.capture_path, "rb")
+                    except FileNotFoundError:
+                        self.stopped.wait(self.poll_interval)
+                        continue
+                    reader = BtsnoopReader(stream)
+                records = reader.read_records(limit=4096)
+                if records:
+                    self.add_records(records)
+                else:
+                    self.stopped.wait(self.poll_interval)
+        finally:
+            if stream:
+                stream.close()
+
+    def build(self):
+        """Index the whole capture file on the calling thread."""
+        with open(self.capture_path, "rb") as stream:
+            reader = BtsnoopReader(stream)
+            while True:
+                records = reader.read_records(limit=4096)
+                if not records:
+                    return self
+                self.add_records(records)
+
+    def query(self, handle=None, opcode=None, ogf=None, ocf=None, event=None, subevent=None, record_type=None,
+              start=None, end=None, limit=None):
+        """Return the numbers of the records matching every given criterion, in capture order.
+
+        Args:
+            handle: Connection handle (commands, events and data packets).
+            opcode: Command opcode (commands and the Command Complete/Status events answering them).
+            ogf: Command group; with ocf it selects one opcode.
+            ocf: Command number within its group.
+            event: Event code.
+            subevent: LE Meta subevent code.
+            record_type: "command", "event", "acl", "sco", "iso" or "note".
+            start: Earliest Unix timestamp.
+            end: Latest Unix timestamp.
+            limit: Maximum number of results (the first ones).
+        """
+        with self.lock:
+            first = bisect_left(self.timestamps, start) if start is not None else 0
+            last = bisect_right(self.timestamps, end) if end is not None else len(self.timestamps)
+            postings = []
+            if handle is not None:
+                postings.append(self.by_handle.get(handle, ()))
+            if ogf is not None and ocf is not None:
+                if opcode is not None and opcode != make_opcode(ogf, ocf):
+                    return []
+                opcode, ogf, ocf = make_opcode(ogf, ocf), None, None
+            if opcode is not None:
+                postings.append(self.by_opcode.get(opcode, ()))
+            if ogf is not None:
+                postings.append(self.by_ogf.get(ogf, ()))
+            if ocf is not None:
+                # One opcode per group: merge their lists, each cut to the time range first.
+                postings.append(list(heapq.merge(*(
+                    numbers[bisect_left(numbers, first):bisect_left(numbers, last)]
+                    for key, numbers in self.by_opcode.items() if key & 0x03FF == ocf))))
+            if event is not None:
+                postings.append(self.by_event.get(event, ()))
+            if subevent is not None:
+                postings.append(self.by_subevent.get(subevent, ()))
+            if record_type is not None:
+                postings.append(self.by_type.get(record_type, ()))
+            if not postings:
+                stop = last if limit is None else min(last, first + limit)
+                return list(range(first, stop))
+            bounds = [(bisect_left(numbers, first), bisect_left(numbers, last)) for numbers in postings]
+            order = sorted(range(len(postings)), key=lambda index: bounds[index][1] - bounds[index][0])
+            shortest = postings[order[0]]
+            others = [(postings[index], bounds[index][0], bounds[index][1]) for index in order[1:]]
+            cursors = [low for _, low, _ in others]
+            results = []
+            for number in shortest[bounds[order[0]][0]:bounds[order[0]][1]]:
+                for position, (numbers, _, high) in enumerate(others):
+                    cursor = bisect_left(numbers, number, cursors[position], high)
+                    cursors[position] = cursor
+                    if cursor == high or numbers[cursor] != number:
+                        break
+                else:
+                    results.append(number)
+                    if limit is not None and len(results) >= limit:
+                        break
+            return results
+
+    def read(self, numbers):
+        """Read and decode the given records from the capture.
+
+        Consecutive record numbers are fetched with one read per run.
+
+        Returns:
+            List of record dicts in the order of numbers (sorted).
+        """
+        with self.lock:
+            numbers = sorted(numbers)
+            offsets = [(number, self.offsets[number],
+                        self.offsets[number + 1] if number + 1 < len(self.offsets) else None) for number in numbers]
+        records = []
+        with open(self.capture_path, "rb") as stream:
+            reader = BtsnoopReader(stream)
+            if not reader.read_header():
+                return records
+            run = []
+            for entry in offsets:
+                if run and entry[0] != run[-1][0] + 1:
+                    records.extend(self.read_run(stream, reader, run))
+                    run = []
+                run.append(entry)
+            if run:
+                records.extend(self.read_run(stream, reader, run))
+        return records
+
+    def read_run(self, stream, reader, run):
+        """Read a run of consecutive records with a single read."""
+        start = run[0][1]
+        end = run[-1][2]
+        if end is None:
+            # Last indexed record: its length comes from its own header.
+            stream.seek(run[-1][1])
+            header = stream.read(record_header.size)
+            end = run[-1][1] + record_header.size + record_header.unpack(header)[1]
+        stream.seek(start)
+        data = stream.read(end - start)
+        records = []
+        position = 0
+        for _, offset, _ in run:
+            original_length, included_length, flags, dropped, timestamp_us = record_header.unpack_from(data, position)
+            body_start = position + record_header.size
+            body = data[body_start:body_start + included_length]
+            records.append(reader.decode(offset, flags, dropped, timestamp_us, body))
+            position = body_start + included_length
+        return records
+
+    def search(self, text, limit=None):
+        """Parse a filter query (see parse_query) and return the matching records read from the capture."""
+        criteria = parse_query(text, self.first_timestamp())
+        return self.read(self.query(limit=limit, **criteria))
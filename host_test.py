@@ -3,7 +3,9 @@ import re
 
 from PyQt6.QtCore import Qt
 from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import pyqtSignal
 from PyQt6.QtGui import QFont, QColor
+from PyQt6.QtWidgets import QAbstractItemView
 from PyQt6.QtWidgets import QComboBox, QSlider
 from PyQt6.QtWidgets import QFileDialog
 from PyQt6.QtWidgets import QGridLayout
@@ -19,12 +21,12 @@ from PyQt6.QtWidgets import QMessageBox
 from PyQt6.QtWidgets import QPushButton
 from PyQt6.QtWidgets import QSizePolicy
 from PyQt6.QtWidgets import QTabWidget
-from PyQt6.QtWidgets import QTableWidget
-from PyQt6.QtWidgets import QTableWidgetItem
+from PyQt6.QtWidgets import QTableView
 from PyQt6.QtWidgets import QVBoxLayout
 from PyQt6.QtWidgets import QWidget
 
 import style_sheet as styles
+from discovery_model import DiscoveryTableModel
 from libraries.bluetooth.bluez import BluetoothDeviceManager
 from libraries.bluetooth import constants
 from Utils.utils import get_controller_interface_details
@@ -34,6 +36,8 @@ from Utils.utils import start_dump_logs
 class TestApplication(QWidget):
     """Main GUI class for the Bluetooth Test Host."""
 
+    device_operation_finished = pyqtSignal(str, str, bool, bool)
+
     def __init__(self, interface=None, back_callback=None, log=None):
         """Initialize the Test Host widget.
 
@@ -51,6 +55,8 @@ class TestApplication(QWidget):
         self.log = log
         self.bluetooth_device_manager = BluetoothDeviceManager(log=self.log, interface=self.interface)
         self.paired_devices={}
+        self.pending_operations = set()
+        self.device_operation_finished.connect(self.on_device_operation_finished)
         self.device_tab_widget = None
         self.gap_button = None
         self.grid = None
@@ -60,8 +66,31 @@ class TestApplication(QWidget):
         self.profile_methods_widget = None
         self.profiles_list_widget = None
         self.refresh_button = None
+        self.table_widget = None
+        self.discovery_table_view = None
+        self.discovery_model = None
         self.test_application_clicked()
 
+    def release_resources(self):
+        """Stop polling, the discovery model's cache listeners and the device manager's signals and workers."""
+        if getattr(self, "playback_timer", None):
+            self.playback_timer.stop()
+        self.clear_discovery_table_widgets()
+        if self.bluetooth_device_manager:
+            self.bluetooth_device_manager.shutdown()
+            self.bluetooth_device_manager = None
+
+    def go_back(self):
+        """Release this window's Bluetooth resources and return to the previous window."""
+        self.release_resources()
+        if self.back_callback:
+            self.back_callback()
+
+    def closeEvent(self, event):
+        """Release the Bluetooth resources when the window is closed."""
+        self.release_resources()
+        super().closeEvent(event)
+
     def populate_device_list(self):
         """Loads and displays all paired  Bluetooth devices into the profiles list widget."""
         list_index = self.profiles_list_widget.count() - 1
@@ -131,6 +160,7 @@ class TestApplication(QWidget):
             self.set_discovery_on_button.setEnabled(False)
             self.set_discovery_off_button.setEnabled(True)
             self.bluetooth_device_manager.start_discovery()
+            self.show_discovery_table()
         else:
             self.timer = QTimer()
             self.timer.timeout.connect(self.show_discovery_table_timeout)
@@ -139,6 +169,7 @@ class TestApplication(QWidget):
             self.set_discovery_on_button.setEnabled(False)
             self.set_discovery_off_button.setEnabled(True)
             self.bluetooth_device_manager.start_discovery()
+            self.show_discovery_table()
 
     def show_discovery_table_timeout(self):
         """Function to show the discovery table when timeout is over"""
@@ -161,63 +192,82 @@ class TestApplication(QWidget):
             self.set_discovery_off_button.setEnabled(False)
 
     def show_discovery_table(self):
-        """Display discovered devices in a table with options to pair or connect."""
-        self.timer.stop()
+        """Display discovered devices in a live table with options to pair or connect.
+
+        The table is backed by a DiscoveryTableModel that follows the BlueZ object cache, so
+        rows are inserted and updated in place as devices appear or their name, RSSI or paired
+        state change. Calling this again while the table is shown does not rebuild it.
+        """
+        if self.table_widget:
+            return
         bold_font = QFont()
         bold_font.setBold(True)
         small_font = QFont()
         small_font.setBold(True)
         small_font.setPointSize(8)
-        discovered_devices = self.bluetooth_device_manager.get_discovered_devices()
-        self.clear_discovery_table_widgets()
-        self.table_widget = QTableWidget(0, 3)
-        self.table_widget.setHorizontalHeaderLabels(["DEVICE NAME", "BD_ADDR", "PROCEDURES"])
-        self.table_widget.setFont(bold_font)
-        header = self.table_widget.horizontalHeader()
+        self.discovery_model = DiscoveryTableModel(self.bluetooth_device_manager.object_cache,
+                                                   self.bluetooth_device_manager.adapter_path, parent=self)
+        self.discovery_model.start()
+        self.discovery_table_view = QTableView()
+        self.discovery_table_view.setModel(self.discovery_model)
+        self.discovery_table_view.setFont(bold_font)
+        self.discovery_table_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.discovery_table_view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        header = self.discovery_table_view.horizontalHeader()
         header.setStyleSheet(styles.horizontal_header_style_sheet)
         header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        vertical_header = self.table_widget.verticalHeader()
+        vertical_header = self.discovery_table_view.verticalHeader()
         vertical_header.setStyleSheet(styles.vertical_header_style_sheet)
-        row = 0
-        for device in discovered_devices:
-            device_address = device["address"]
-            device_name = device["alias"]
-            self.table_widget.insertRow(row)
-            self.table_widget.setItem(row, 0, QTableWidgetItem(device_name))
-            self.table_widget.setItem(row, 1, QTableWidgetItem(device_address))
-            button_widget = QWidget()
-            button_layout = QHBoxLayout()
-            button_layout.setContentsMargins(0, 0, 0, 0)
-            button_layout.setSpacing(5)
-            pair_button = QPushButton("PAIR")
-            pair_button.setFont(small_font)
-            pair_button.clicked.connect(lambda _, addr = device_address: self.manage_device('pair', addr, load_profiles=False))
-            button_layout.addWidget(pair_button)
-            connect_button = QPushButton("CONNECT")
-            connect_button.setFont(small_font)
-            connect_button.clicked.connect(lambda _, addr = device_address: self.manage_device('connect', addr, load_profiles=False))
-            button_layout.addWidget(connect_button)
-            button_widget.setLayout(button_layout)
-            self.table_widget.setCellWidget(row, 2, button_widget)
-            row += 1
+        button_layout = QHBoxLayout()
+        button_layout.setContentsMargins(0, 0, 0, 0)
+        button_layout.setSpacing(5)
+        pair_button = QPushButton("PAIR")
+        pair_button.setFont(small_font)
+        pair_button.clicked.connect(lambda: self.manage_selected_device('pair'))
+        button_layout.addWidget(pair_button)
+        connect_button = QPushButton("CONNECT")
+        connect_button.setFont(small_font)
+        connect_button.clicked.connect(lambda: self.manage_selected_device('connect'))
+        button_layout.addWidget(connect_button)
+        self.table_widget = QWidget()
+        table_layout = QVBoxLayout(self.table_widget)
+        table_layout.setContentsMargins(0, 0, 0, 0)
+        table_layout.addWidget(self.discovery_table_view)
+        table_layout.addLayout(button_layout)
         self.profile_methods_layout.insertWidget(self.profile_methods_layout.count() - 1, self.table_widget)
         self.table_widget.show()
-        self.set_discovery_off_button.setEnabled(False)
+
+    def manage_selected_device(self, action):
+        """Run a pair or connect operation on the device selected in the discovery table.
+
+        Args:
+            action: 'pair' or 'connect'.
+        """
+        selected_rows = self.discovery_table_view.selectionModel().selectedRows()
+        if not selected_rows:
+            QMessageBox.information(self, "Discovery", "Select a device in the table first.")
+            return
+        device_address = self.discovery_model.device_address(selected_rows[0].row())
+        if device_address:
+            self.manage_device(action, device_address, load_profiles=False)
 
     def clear_discovery_table_widgets(self):
         """Removes the discovery table if it exists to avoid stacking."""
-        if hasattr(self, 'table_widget') and self.table_widget:
+        if self.discovery_model:
+            self.discovery_model.stop()
+            self.discovery_model.deleteLater()
+            self.discovery_model = None
+        if self.table_widget:
             self.profile_methods_layout.removeWidget(self.table_widget)
             self.table_widget.deleteLater()
             self.table_widget = None
+            self.discovery_table_view = None
 
     def refresh(self):
         """Refresh and clear the device discovery table."""
         self.log.info("Refresh Button is pressed")
-        if hasattr(self, 'table_widget') and self.table_widget:
-            self.profile_methods_layout.removeWidget(self.table_widget)
-            self.table_widget.deleteLater()
-            self.table_widget = None
+        if self.table_widget:
+            self.clear_discovery_table_widgets()
             self.inquiry_timeout_input.setText("0")
             self.refresh_button.setEnabled(False)
             self.set_discovery_on_button.setEnabled(True)
@@ -1191,26 +1241,52 @@ class TestApplication(QWidget):
         layout.addLayout(button_layout)
 
     def manage_device(self, action, device_address, load_profiles):
-        """Performs a Bluetooth device action and updates the UI.
+        """Starts a Bluetooth device action in the background; the UI is updated when it completes.
 
         Args:
             action: One of 'pair', 'connect', 'disconnect', or 'unpair'.
             device_address: The Bluetooth address of the device.
+            load_profiles: Reload the profile tabs for the device once the action succeeds.
         """
+        if action not in ('pair', 'connect', 'disconnect', 'unpair'):
+            self.log.error("Unknown action:%s", action)
+            return
         if action == 'pair':
             self.log.info("Attempting to pair with %s", device_address)
             if self.bluetooth_device_manager.is_device_paired(device_address):
                 QMessageBox.information(self, "Already Paired", f"{device_address} is already paired.")
                 self.add_device(device_address)
                 return
-            success = self.bluetooth_device_manager.pair(device_address)
+        if (action, device_address) in self.pending_operations:
+            self.log.info("%s already in progress for %s", action, device_address)
+            return
+        self.pending_operations.add((action, device_address))
+        future = self.bluetooth_device_manager.submit(action, device_address)
+        future.add_done_callback(
+            lambda done, a=action, addr=device_address: self.emit_device_operation_result(a, addr, load_profiles, done))
+
+    def emit_device_operation_result(self, action, device_address, load_profiles, future):
+        """Forwards a finished operation from the worker thread to the GUI thread via a queued signal."""
+        success = not future.cancelled() and future.exception() is None and bool(future.result())
+        self.device_operation_finished.emit(action, device_address, success, load_profiles)
+
+    def on_device_operation_finished(self, action, device_address, success, load_profiles):
+        """Updates the UI with the result of a device action (runs on the GUI thread).
+
+        Args:
+            action: One of 'pair', 'connect', 'disconnect', or 'unpair'.
+            device_address: The Bluetooth address of the device.
+            success: Whether the action succeeded.
+            load_profiles: Reload the profile tabs for the device once the action succeeds.
+        """
+        self.pending_operations.discard((action, device_address))
+        if action == 'pair':
             if success:
                 QMessageBox.information(self, "Pairing Successful", f"{device_address} was paired.")
                 self.add_device(device_address)
             else:
                 QMessageBox.critical(self, "Pairing Failed", f"Pairing with {device_address} failed.")
         elif action == 'connect':
-            success = self.bluetooth_device_manager.connect(device_address)
             if success:
                 QMessageBox.information(self, "Connection Successful", f"{device_address} was connected.")
                 self.log.info("%s connected successfully", device_address)
@@ -1219,7 +1295,6 @@ class TestApplication(QWidget):
             else:
                 QMessageBox.warning(self, "Connection Failed", f"Failed to connect to {device_address}")
         elif action == 'disconnect':
-            success = self.bluetooth_device_manager.disconnect(device_address)
             if success:
                 QMessageBox.information(self, "Disconnection Successful", f"{device_address} was disconnected.")
                 self.log.info("Disconnected from %s", device_address)
@@ -1227,7 +1302,6 @@ class TestApplication(QWidget):
                 QMessageBox.warning(self, "Disconnection Failed", f"Could not disconnect from {device_address}")
             self.load_profile_tabs_for_device(device_address)
         elif action == 'unpair':
-            success = self.bluetooth_device_manager.remove_device(device_address)
             if success:
                 QMessageBox.information(self, "Unpair Successful", f"{device_address} was unpaired.")
                 self.log.info("Unpaired %s", device_address)
@@ -1238,8 +1312,6 @@ class TestApplication(QWidget):
                 self.profiles_list_widget.itemSelectionChanged.connect(self.profile_selected)
             else:
                 self.load_profile_tabs_for_device(device_address)
-        else:
-            self.log.error("Unknown action:%s", action)
 
     def remove_unpaired_device(self, unpaired_address):
         """Removes a specific unpaired device from the profiles list (if present)."""
@@ -1340,7 +1412,7 @@ class TestApplication(QWidget):
         back_button = QPushButton("Back")
         back_button.setFixedSize(100, 40)
         back_button.setStyleSheet(styles.back_button_style_sheet)
-        back_button.clicked.connect(lambda: self.back_callback())
+        back_button.clicked.connect(self.go_back)
         back_layout = QHBoxLayout()
         back_layout.addWidget(back_button)
         back_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
@@ -0,0 +1,191 @@
+import os
+import threading
+
+
+# One tailer per log file, shared by every viewer of that file.
+tailers = {}
+tailers_lock = threading.Lock()
+
+
+def subscribe(path, callback):
+    """Subscribe to the lines appended to a log file, starting its shared tailer if needed.
+
+    Args:
+        path: Log file path.
+        callback: Callable(event, lines, end) run on the tailer thread; see LogTailer.
+    Returns:
+        Byte offset just after the last complete line already delivered to the
+        other subscribers. The new subscriber receives every line from there on.
+    """
+    key = os.path.abspath(path)
+    with tailers_lock:
+        tailer = tailers.get(key)
+        if tailer is None:
+            tailer = tailers[key] = LogTailer(key)
+        return tailer.add_subscriber(callback)
+
+
+def unsubscribe(path, callback):
+    """Remove a subscriber; the tailer thread stops with its last subscriber."""
+    key = os.path.abspath(path)
+    with tailers_lock:
+        tailer = tailers.get(key)
+        if tailer is None:
+            return
+        if not tailer.remove_subscriber(callback):
+            del tailers[key]
+            tailer.stop()
+
+
+class LogTailer:
+    """Follow one log file on a background thread and fan its lines out to subscribers.
+
+    The file is read once, in chunks, whoever is watching it. Each subscriber
+    is called as callback(event, lines, end) from the tailer thread:
+    event "lines" carries a list of (byte offset, line bytes) for complete
+    lines, event "reset" means the file was rotated (new inode) or truncated
+    and offsets start again from 0. end is the offset just after the last
+    complete line delivered. A subscriber whose callback raises RuntimeError
+    (e.g. a deleted Qt widget) is dropped.
+    """
+
+    def __init__(self, path, poll_interval=0.2, chunk_size=65536):
+        """Initialize the tailer; the thread starts with the first subscriber.
+
+        Args:
+            path: Log file path.
+            poll_interval: Seconds between checks for new data, rotation and truncation.
+            chunk_size: Bytes read per call.
+        """
+        self.path = path
+        self.poll_interval = poll_interval
+        self.chunk_size = chunk_size
+        self.lock = threading.Lock()
+        self.subscribers = []
+        self.log_file = None
+        self.inode = None
+        self.position = 0
+        self.pending = b""
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def add_subscriber(self, callback):
+        with self.lock:
+            self.subscribers.append(callback)
+            end = self.position - len(self.pending)
+            if self.thread is None:
+                # The first subscriber starts from the current end of the file.
+                self.open_file(seek_end=True)
+                end = self.position - len(self.pending)
+                self.thread = threading.Thread(target=self.run, name=f"tail-{os.path.basename(self.path)}",
+                                               daemon=True)
+                self.thread.start()
+            return end
+
+    def remove_subscriber(self, callback):
+        """Return the number of remaining subscribers."""
+        with self.lock:
+            if callback in self.subscribers:
+                self.subscribers.remove(callback)
+            return len(self.subscribers)
+
+    def stop(self):
+        self.stopped.set()
+
+    def release(self):
+        """Remove this tailer from the registry and stop it if nobody subscribed meanwhile."""
+        with tailers_lock:
+            with self.lock:
+                if self.subscribers:
+                    return
+            if tailers.get(self.path) is self:
+                del tailers[self.path]
+            self.stop()
+
+    def open_file(self, seek_end=False):
+        """(Re)open the path; returns False when it does not exist (yet)."""
+        if self.log_file:
+            self.log_file.close()
+            self.log_file = None
+        self.position = 0
+        self.pending = b""
+        try:
+            self.log_file = open(self.path, "rb")
+        except OSError:
+            self.inode = None
+            return False
+        stat = os.fstat(self.log_file.fileno())
+        self.inode = stat.st_ino
+        if seek_end and stat.st_size:
+            # Keep the trailing partial line pending so it is delivered once completed.
+            tail_start = max(stat.st_size - self.chunk_size, 0)
+            self.log_file.seek(tail_start)
+            tail = self.log_file.read(stat.st_size - tail_start)
+            newline = tail.rfind(b"\n")
+            if newline != -1 or tail_start == 0:
+                self.pending = tail[newline + 1:]
+            self.position = stat.st_size
+        return True
+
+    def run(self):
+        while not self.stopped.is_set():
+            try:
+                self.poll()
+            except OSError:
+                pass
+            if not self.subscribers:
+                # Every subscriber was dropped by dispatch().
+                self.release()
+            self.stopped.wait(self.poll_interval)
+        with self.lock:
+            if self.log_file:
+                self.log_file.close()
+                self.log_file = None
+
+    def poll(self):
+        """Deliver new lines, then handle rotation and truncation."""
+        with self.lock:
+            if self.log_file is None:
+                if self.open_file():
+                    self.dispatch("reset", [])
+                else:
+                    return
+            self.read_available()
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                # Rotated away and not recreated yet; keep the old file until it is.
+                return
+            if stat.st_ino != self.inode:
+                # Rotated: the rest of the old file was read above, continue with the new one.
+                self.open_file()
+                self.dispatch("reset", [])
+                self.read_available()
+            elif stat.st_size < self.position:
+                self.open_file()
+                self.dispatch("reset", [])
+                self.read_available()
+
+    def read_available(self):
+        while True:
+            chunk = self.log_file.read(self.chunk_size)
+            if not chunk:
+                return
+            line_offset = self.position - len(self.pending)
+            self.position += len(chunk)
+            pieces = (self.pending + chunk).split(b"\n")
+            self.pending = pieces.pop()
+            lines = []
+            for piece in pieces:
+                lines.append((line_offset, piece))
+                line_offset += len(piece) + 1
+            if lines:
+                self.dispatch("lines", lines)
+
+    def dispatch(self, event, lines):
+        end = self.position - len(self.pending)
+        for callback in list(self.subscribers):
+            try:
+                callback(event, lines, end)
+            except RuntimeError:
+                self.subscribers.remove(callback)
@@ -0,0 +1,285 @@
+import os
+import threading
+import time
+from collections import deque
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtWidgets import QPlainTextEdit
+
+import log_tailer
+
+
+# Lines kept in a log pane; anything older is read back from the file on demand.
+default_max_lines = 5000
+# Upper bound of widget updates per second for a pane, however often the file changes.
+default_flushes_per_second = 10
+read_chunk_size = 65536
+
+
+def decode_line(line):
+    return line.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+def read_lines_before(path, offset, count, chunk_size=read_chunk_size):
+    """Read up to count complete lines that end at or before a byte offset, reading the file backwards.
+
+    Args:
+        path: Log file path.
+        offset: Byte offset to stop at (normally the start of a line or the file size).
+        count: Maximum number of lines.
+        chunk_size: Bytes read per step.
+    Returns:
+        Tuple of (list of (line offset, line bytes), bytes of a trailing partial line).
+    """
+    with open(path, "rb") as log_file:
+        position = offset
+        data = b""
+        while position > 0 and data.count(b"\n") <= count:
+            step = min(chunk_size, position)
+            position -= step
+            log_file.seek(position)
+            data = log_file.read(step) + data
+    pieces = data.split(b"\n")
+    partial = pieces.pop()
+    lines = []
+    line_offset = position
+    for index, piece in enumerate(pieces):
+        # The first piece is cut in the middle unless it starts the file.
+        if index > 0 or position == 0:
+            lines.append((line_offset, piece))
+        line_offset += len(piece) + 1
+    return lines[-count:] if count else [], partial
+
+
+def read_lines_from(path, offset, count, chunk_size=read_chunk_size):
+    """Read up to count complete lines starting at a byte offset.
+
+    Returns:
+        List of (line offset, line bytes); a trailing line without a newline is left out.
+    """
+    lines = []
+    with open(path, "rb") as log_file:
+        log_file.seek(offset)
+        remainder = b""
+        line_offset = offset
+        while len(lines) < count:
+            chunk = log_file.read(chunk_size)
+            if not chunk:
+                break
+            pieces = (remainder + chunk).split(b"\n")
+            remainder = pieces.pop()
+            for piece in pieces:
+                lines.append((line_offset, piece))
+                line_offset += len(piece) + 1
+    return lines[:count]
+
+
+class LogViewer(QPlainTextEdit):
+    """Read-only pane that follows a growing log file while holding at most max_lines lines.
+
+    The document is capped with maximumBlockCount, so the oldest lines are
+    dropped as new ones arrive and memory stays bounded however long the
+    daemon runs. Only the byte offset of each displayed line is remembered.
+    Scrolling to the top pages older lines back in from the file, which stops
+    following; scrolling back down pages forward and resumes following once
+    the end of the file is reached.
+
+    New lines come from the shared log_tailer thread of the file, so every
+    pane showing the same log costs one reader, and rotation or truncation
+    restarts the pane. They are buffered (at most max_lines) and flushed to
+    the widget at most flushes_per_second times a second, each flush being
+    a single append. The counters in stats (signals, flushes, bytes,
+    deferred_bytes, dropped_bytes) are shown in the pane's tooltip.
+    """
+
+    lines_ready = pyqtSignal()
+
+    def __init__(self, max_lines=default_max_lines, page_lines=None, parent=None,
+                 flushes_per_second=default_flushes_per_second):
+        """Initialize the viewer.
+
+        Args:
+            max_lines: Maximum number of lines held by the widget.
+            page_lines: Lines loaded per step when paging through older lines (a quarter of max_lines by default).
+            parent: Parent widget.
+            flushes_per_second: Maximum widget updates per second.
+        """
+        super().__init__(parent)
+        self.max_lines = max_lines
+        self.page_lines = page_lines or max(max_lines // 4, 1)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setMaximumBlockCount(max_lines)
+        self.path = None
+        self.line_offsets = deque(maxlen=max_lines)
+        self.window_end = 0
+        self.file_end = 0
+        self.following = True
+        self.paging = False
+        self.showing_results = False
+        self.flush_interval = 1.0 / flushes_per_second
+        self.last_flush = 0.0
+        self.deferred = False
+        self.stats = {"signals": 0, "flushes": 0, "bytes": 0, "deferred_bytes": 0, "dropped_bytes": 0}
+        # Filled by the tailer thread, drained by flush() on the GUI thread.
+        self.lock = threading.Lock()
+        self.incoming = deque()
+        self.incoming_end = 0
+        self.reset_received = False
+        self.notified = False
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self.flush)
+        self.lines_ready.connect(self.refresh)
+        self.verticalScrollBar().valueChanged.connect(self.scrolled)
+
+    def open(self, path):
+        """Start following a log file, showing its last max_lines lines."""
+        self.close_file()
+        self.path = path
+        self.file_end = self.incoming_end = log_tailer.subscribe(path, self.receive)
+        self.show_tail()
+
+    def close_file(self):
+        """Stop following the file (the shared tailer stops with its last viewer)."""
+        self.flush_timer.stop()
+        if self.path:
+            log_tailer.unsubscribe(self.path, self.receive)
+
+    def receive(self, event, lines, end):
+        """Tailer callback, run on the tailer thread: buffer the lines and wake the GUI thread once."""
+        with self.lock:
+            if event == "reset":
+                self.incoming.clear()
+                self.reset_received = True
+            for line in lines:
+                if len(self.incoming) == self.max_lines:
+                    # The pane could not show it anyway; it stays in the file.
+                    _, dropped = self.incoming.popleft()
+                    self.stats["dropped_bytes"] += len(dropped) + 1
+                self.incoming.append(line)
+                self.stats["bytes"] += len(line[1]) + 1
+            self.incoming_end = end
+            notify = not self.notified
+            self.notified = True
+        if notify:
+            self.lines_ready.emit()
+
+    def show_tail(self):
+        """Show the last max_lines lines delivered so far and follow the file."""
+        lines = []
+        if os.path.exists(self.path):
+            lines, _ = read_lines_before(self.path, self.file_end, self.max_lines)
+        self.following = True
+        self.showing_results = False
+        self.render(lines, self.file_end)
+        self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+
+    def show_results(self, texts):
+        """Show lines such as the result of a filter query instead of the file; clear_results() goes back."""
+        self.following = False
+        self.showing_results = True
+        self.render([], self.window_end)
+        self.paging = True
+        self.setPlainText("\n".join(texts))
+        self.verticalScrollBar().setValue(self.verticalScrollBar().minimum())
+        self.paging = False
+
+    def clear_results(self):
+        """Leave the query results and follow the file again."""
+        if self.showing_results:
+            self.show_tail()
+
+    def refresh(self):
+        """Flush the buffered lines now or schedule a flush within the rate limit."""
+        self.stats["signals"] += 1
+        if self.flush_timer.isActive():
+            return
+        wait = self.last_flush + self.flush_interval - time.monotonic()
+        if wait <= 0:
+            self.flush()
+            return
+        self.deferred = True
+        self.flush_timer.start(int(wait * 1000) + 1)
+
+    def flush(self):
+        """Show the lines buffered since the last flush in one insert."""
+        self.last_flush = time.monotonic()
+        deferred, self.deferred = self.deferred, False
+        with self.lock:
+            lines = list(self.incoming)
+            self.incoming.clear()
+            reset, self.reset_received = self.reset_received, False
+            self.file_end = self.incoming_end
+            self.notified = False
+        if deferred:
+            self.stats["deferred_bytes"] += sum(len(line) + 1 for _, line in lines)
+        if reset and not self.showing_results:
+            # Rotated or truncated: offsets start again from 0.
+            self.following = True
+            self.render([], 0)
+        self.append_lines(lines)
+        self.update_stats()
+
+    def update_stats(self):
+        self.stats["flushes"] += 1
+        self.setToolTip(f"{self.stats['bytes']} bytes in {self.stats['flushes']} updates for "
+                        f"{self.stats['signals']} notifications, {self.stats['deferred_bytes']} bytes deferred, "
+                        f"{self.stats['dropped_bytes']} bytes skipped")
+
+    def append_lines(self, lines):
+        """Append (offset, line bytes) pairs while following; otherwise they stay in the file only."""
+        if not lines or not self.following:
+            return
+        self.line_offsets.extend(offset for offset, _ in lines)
+        self.window_end = lines[-1][0] + len(lines[-1][1]) + 1
+        self.paging = True
+        if self.document().isEmpty():
+            self.setPlainText("\n".join(decode_line(line) for _, line in lines))
+        else:
+            self.appendPlainText("\n".join(decode_line(line) for _, line in lines))
+        self.paging = False
+
+    def render(self, lines, window_end):
+        """Replace the displayed lines with a window of the file."""
+        self.paging = True
+        self.line_offsets = deque((offset for offset, _ in lines), maxlen=self.max_lines)
+        self.window_end = window_end
+        self.setPlainText("\n".join(decode_line(line) for _, line in lines))
+        self.paging = False
+
+    def scrolled(self, value):
+        if self.paging or self.showing_results or not self.path:
+            return
+        bar = self.verticalScrollBar()
+        if value == bar.minimum() and self.line_offsets and self.line_offsets[0] > 0:
+            self.show_older()
+        elif value == bar.maximum() and not self.following:
+            self.show_newer()
+
+    def show_older(self):
+        """Page page_lines older lines in from the file and stop following."""
+        older, _ = read_lines_before(self.path, self.line_offsets[0], self.page_lines)
+        if not older:
+            return
+        lines = read_lines_from(self.path, older[0][0], self.max_lines)
+        self.following = False
+        self.render(lines, lines[-1][0] + len(lines[-1][1]) + 1)
+        self.paging = True
+        self.verticalScrollBar().setValue(len(older))
+        self.paging = False
+
+    def show_newer(self):
+        """Page page_lines newer lines in from the file; resume following at the end of the file."""
+        newer = read_lines_from(self.path, self.window_end, self.page_lines)
+        end = newer[-1][0] + len(newer[-1][1]) + 1 if newer else self.window_end
+        if end >= self.file_end:
+            self.show_tail()
+            return
+        lines, _ = read_lines_before(self.path, end, self.max_lines)
+        self.render(lines, end)
+        self.paging = True
+        bar = self.verticalScrollBar()
+        bar.setValue(max(bar.maximum() - len(newer), bar.minimum() + 1))
+        self.paging = False
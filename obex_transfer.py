@@ -0,0 +1,247 @@
+import dbus
+import os
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from gi.repository import GLib
+
+
+obex_service = "org.bluez.obex"
+transfer_interface = "org.bluez.obex.Transfer1"
+properties_interface = "org.freedesktop.DBus.Properties"
+
+
+class TransferSignalBuffer:
+    """Collect Transfer1 PropertiesChanged signals before the transfer path is known.
+
+    Create it before the call that starts a transfer (SendFile, Pull...). A short
+    transfer can finish, and obexd remove its object, before that call returns;
+    the buffer keeps the signals so the tracker still sees the final Status.
+    """
+
+    def __init__(self, bus):
+        self.lock = threading.Lock()
+        self.events = {}
+        self.listeners = {}
+        self.match = bus.add_signal_receiver(
+            self.properties_changed,
+            dbus_interface=properties_interface,
+            signal_name="PropertiesChanged",
+            arg0=transfer_interface,
+            path_keyword="path")
+
+    def properties_changed(self, interface, changed, invalidated, path=None):
+        with self.lock:
+            listener = self.listeners.get(str(path))
+            if listener is None:
+                self.events.setdefault(str(path), []).append(changed)
+        if listener is not None:
+            listener(changed)
+
+    def attach(self, transfer_path, listener):
+        """Replay the signals buffered for transfer_path to listener and forward later ones."""
+        with self.lock:
+            events = self.events.pop(str(transfer_path), [])
+            self.listeners[str(transfer_path)] = listener
+        for changed in events:
+            listener(changed)
+
+    def stop(self):
+        """Remove the signal subscription."""
+        if self.match is not None:
+            self.match.remove()
+            self.match = None
+
+
+class TransferTracker:
+    """Follow one obexd Transfer1 object from start to completion.
+
+    The tracker subscribes to the transfer's PropertiesChanged signal (Status,
+    Transferred, Size) as soon as it is created. It exposes a
+    concurrent.futures.Future that resolves to the final status ("complete" or
+    "error"), plus the live transfer rate and an ETA. Signals are dispatched
+    by the GLib main loop. wait() runs a nested loop when called on the main
+    thread; any other thread simply blocks on the future.
+    """
+
+    final_states = ("complete", "error")
+
+    def __init__(self, bus, transfer_path, properties=None, on_progress=None, target_file=None, signals=None):
+        """Start tracking a transfer.
+
+        Args:
+            bus: Session bus connection obexd is on.
+            transfer_path: Object path returned by PullAll/Pull/SendFile.
+            properties: Optional property dict returned together with the path.
+            on_progress: Optional callable(tracker) run on every update.
+            target_file: File a pull writes to, used to tell a finished transfer from a
+                failed one when its object is already gone.
+            signals: Optional TransferSignalBuffer created before the transfer was started.
+        """
+        self.bus = bus
+        self.transfer_path = str(transfer_path)
+        self.on_progress = on_progress
+        self.target_file = target_file
+        self.future = Future()
+        self.lock = threading.Lock()
+        self.loops = []
+        self.status = "queued"
+        self.transferred = 0
+        self.size = None
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        self.first_sample = None
+        self.last_sample = None
+        self.match = bus.add_signal_receiver(
+            self.properties_changed,
+            dbus_interface=properties_interface,
+            signal_name="PropertiesChanged",
+            arg0=transfer_interface,
+            path=self.transfer_path)
+        if properties:
+            self.update(properties)
+        if signals is not None:
+            signals.attach(self.transfer_path, self.update)
+        if not self.future.done():
+            self.refresh()
+
+    def refresh(self):
+        """Read the current properties, in case the transfer moved before the signal was subscribed."""
+        try:
+            props_iface = dbus.Interface(self.bus.get_object(obex_service, self.transfer_path), properties_interface)
+            props = props_iface.GetAll(transfer_interface)
+        except dbus.exceptions.DBusException:
+            # obexd removes the transfer object as soon as it has finished, whether it
+            # completed or failed, so only a received file or a full byte count
+            # proves it completed.
+            self.finish("complete" if self.target_received() or self.all_sent() else "error")
+            return
+        self.update(props)
+
+    def target_received(self):
+        """Return True if target_file exists with the announced Size (or, when none was announced, is not empty)."""
+        if not self.target_file or not os.path.exists(self.target_file):
+            return False
+        size = os.path.getsize(self.target_file)
+        return size == self.size if self.size is not None else size > 0
+
+    def all_sent(self):
+        """Return True if the last Transferred update reached the announced Size."""
+        with self.lock:
+            return self.size is not None and self.transferred >= self.size
+
+    def properties_changed(self, interface, changed, invalidated):
+        self.update(changed)
+
+    def update(self, props):
+        """Apply a set of Transfer1 properties."""
+        with self.lock:
+            if "Size" in props and int(props["Size"]) > 0:
+                self.size = int(props["Size"])
+            if "Transferred" in props:
+                self.transferred = int(props["Transferred"])
+                self.last_sample = (time.monotonic(), self.transferred)
+                if self.first_sample is None:
+                    self.first_sample = self.last_sample
+            if "Status" in props:
+                self.status = str(props["Status"])
+            status = self.status
+        if self.on_progress:
+            self.on_progress(self)
+        if status in self.final_states:
+            self.finish(status)
+
+    def finish(self, status):
+        """Resolve the future and stop listening."""
+        with self.lock:
+            if self.future.done():
+                return
+            self.status = status
+            self.finished_at = time.monotonic()
+            if self.size is not None and status == "complete":
+                self.transferred = self.size
+        self.stop()
+        self.future.set_result(status)
+        for loop in list(self.loops):
+            if loop.is_running():
+                loop.quit()
+
+    def stop(self):
+        """Remove the signal subscription."""
+        if self.match is not None:
+            self.match.remove()
+            self.match = None
+
+    def cancel(self):
+        """Ask obexd to cancel the transfer."""
+        transfer = dbus.Interface(self.bus.get_object(obex_service, self.transfer_path), transfer_interface)
+        transfer.Cancel()
+
+    def elapsed(self):
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def bytes_per_second(self):
+        """Return the transfer rate measured from the Transferred updates, or None before any data."""
+        with self.lock:
+            first, last = self.first_sample, self.last_sample
+            transferred = self.transferred
+        if first and last and last[0] > first[0]:
+            return (last[1] - first[1]) / (last[0] - first[0])
+        elapsed = self.elapsed()
+        if transferred and elapsed > 0:
+            return transferred / elapsed
+        return None
+
+    def eta(self):
+        """Return the estimated seconds left, or None when the size or rate is unknown."""
+        if self.future.done():
+            return 0.0
+        rate = self.bytes_per_second()
+        if not self.size or not rate:
+            return None
+        return max(self.size - self.transferred, 0) / rate
+
+    def progress(self):
+        """Return a snapshot of status, bytes, size, rate and ETA."""
+        return {
+            "path": self.transfer_path,
+            "status": self.status,
+            "transferred": self.transferred,
+            "size": self.size,
+            "elapsed": self.elapsed(),
+            "bytes_per_second": self.bytes_per_second(),
+            "eta": self.eta(),
+        }
+
+    def wait(self, timeout=60):
+        """Block until the transfer finishes.
+
+        Args:
+            timeout: Seconds to wait.
+        Returns:
+            "complete", "error", or "timeout" if it is still running.
+        """
+        if not self.future.done():
+            if threading.current_thread() is threading.main_thread():
+                loop = GLib.MainLoop()
+                timer = {"fired": False}
+
+                def expire():
+                    timer["fired"] = True
+                    loop.quit()
+                    return False
+
+                self.loops.append(loop)
+                source = GLib.timeout_add(max(int(timeout * 1000), 1), expire)
+                if not self.future.done():
+                    loop.run()
+                self.loops.remove(loop)
+                if not timer["fired"]:
+                    GLib.source_remove(source)
+            else:
+                try:
+                    self.future.result(timeout)
+                except FutureTimeoutError:
+                    pass
+        return self.future.result() if self.future.done() else "timeout"
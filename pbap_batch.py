@@ -0,0 +1,275 @@
+import contextlib
+import dbus
+import json
+import os
+import sys
+import time
+
+from PhonebookProfileMethods import PhoneBookAccess
+from call_history import CallHistoryTracker
+from contact_store import json_default
+from pbap_sync import PhonebookSync
+
+
+# Operations accepted by --ops and the manifest "ops" entry, with the number of
+# ':'-separated arguments each one takes.
+batch_operations = {
+    "size": 0,
+    "list": 0,
+    "pull": 1,
+    "pull-all": 0,
+    "search": 2,
+    "property": 1,
+    "counters": 0,
+    "filters": 0,
+    "sync": 0,
+    "calls": 0,
+}
+output_formats = ("jsonl", "json", "text")
+
+
+def parse_operations(operations):
+    """Parse operations such as "size,pull:5.vcf,search:name:John" into (name, args) tuples.
+
+    Args:
+        operations: Comma-separated string or list of operation strings.
+    Returns:
+        List of (name, list of arguments) tuples.
+    Raises:
+        ValueError: For an unknown operation or a wrong number of arguments.
+    """
+    if isinstance(operations, str):
+        operations = operations.split(",")
+    parsed = []
+    for operation in operations:
+        operation = operation.strip()
+        if not operation:
+            continue
+        name, *args = operation.split(":", 2)
+        if name not in batch_operations:
+            raise ValueError(f"Unknown operation {name}, expected one of {', '.join(batch_operations)}")
+        if len(args) != batch_operations[name]:
+            raise ValueError(f"Operation {name} takes {batch_operations[name]} argument(s), got {operation}")
+        parsed.append((name, args))
+    return parsed
+
+
+def read_manifest(path):
+    """Read the device entries of a manifest file.
+
+    The manifest is either a JSON list or JSON lines; each entry is an object
+    with an "address" and optionally "repository", "folder", "ops" and
+    "profile" that override the command-line defaults. A bare string is taken
+    as an address.
+
+    Returns:
+        List of entry dicts.
+    """
+    with open(path, "r") as manifest_file:
+        text = manifest_file.read()
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        entries = json.loads(stripped)
+    else:
+        entries = [json.loads(line) for line in text.splitlines() if line.strip() and not line.lstrip().startswith("#")]
+    return [{"address": entry} if isinstance(entry, str) else entry for entry in entries]
+
+
+class PbapBatchRunner:
+    """Run PBAP operations against one or more phones without user interaction.
+
+    Every device is handled in the same process one after another. dbus-python
+    hands out a single shared session bus connection, so obexd is reached over
+    one connection for the whole run. Each result is written as one record as
+    soon as it is available: JSON lines (one object per line) by default, a
+    single JSON array, or plain text. Messages of the PBAP helpers go to stderr
+    so that stdout only carries records.
+    """
+
+    def __init__(self, output=None, output_format="jsonl", store=None, state_dir="/tmp", target_dir="/tmp",
+                 page_size=100, profile=None, timeout=60):
+        """Initialize the runner.
+
+        Args:
+            output: Writable text stream for the records; stdout when None.
+            output_format: "jsonl", "json" or "text".
+            store: Optional ContactStore used by search and sync.
+            state_dir: Directory of the sync and call-history state files.
+            target_dir: Directory for the temporary vCard files.
+            page_size: Contacts per PullAll/List page.
+            profile: Default projection profile for pulls.
+            timeout: Seconds to wait for each transfer.
+        """
+        if output_format not in output_formats:
+            raise ValueError(f"Unknown output format {output_format}, expected one of {', '.join(output_formats)}")
+        self.output = output or sys.stdout
+        self.output_format = output_format
+        self.store = store
+        self.state_dir = state_dir
+        self.target_dir = target_dir
+        self.page_size = page_size
+        self.profile = profile
+        self.timeout = timeout
+        self.records = []
+        self.errors = 0
+
+    def emit(self, record):
+        """Write one record in the configured format."""
+        if record.get("status") == "error":
+            self.errors += 1
+        if self.output_format == "json":
+            self.records.append(record)
+            return
+        if self.output_format == "jsonl":
+            self.output.write(json.dumps(record, default=json_default) + "\n")
+        else:
+            self.output.write(self.format_text(record) + "\n")
+        self.output.flush()
+
+    def format_text(self, record):
+        prefix = f"{record['device']} {record['op']}"
+        if "item" in record:
+            return f"{prefix} {json.dumps(record['item'], default=json_default)}"
+        if record["status"] == "error":
+            return f"{prefix} error: {record['error']}"
+        result = record.get("result")
+        result_text = "" if result is None else " " + json.dumps(result, default=json_default)
+        return f"{prefix} ok in {record['elapsed']:.2f}s{result_text}"
+
+    def close(self):
+        """Flush a "json" run as one array."""
+        if self.output_format == "json":
+            json.dump(self.records, self.output, default=json_default, indent=1)
+            self.output.write("\n")
+            self.records = []
+        self.output.flush()
+
+    def run(self, entries, operations="size", repository="int", folder="pb"):
+        """Run the operations on every device in turn.
+
+        Args:
+            entries: Device entries as returned by read_manifest().
+            operations: Default operations for entries without "ops".
+            repository: Default repository, e.g. "int" or "sim1".
+            folder: Default phonebook object, e.g. "pb" or "mch".
+        Returns:
+            Number of error records written.
+        """
+        # Validate everything before the first phone is paged.
+        plans = []
+        for entry in entries:
+            plans.append((entry, parse_operations(entry.get("ops", operations))))
+        with contextlib.redirect_stdout(sys.stderr):
+            for entry, parsed in plans:
+                self.run_device(entry["address"], parsed, entry.get("repository", repository),
+                                entry.get("folder", folder), entry.get("profile", self.profile))
+        self.close()
+        return self.errors
+
+    def run_device(self, address, operations, repository, folder, profile):
+        """Open a session to one phone, run its operations and remove the session."""
+        base = {"device": address, "repository": repository, "folder": folder}
+        start = time.monotonic()
+        try:
+            pbap = PhoneBookAccess(address)
+            pbap.create_session()
+            pbap.select_phonebook(repository, folder)
+        except Exception as e:
+            self.emit(dict(base, op="session", status="error", error=str(e), elapsed=time.monotonic() - start))
+            return
+        self.emit(dict(base, op="session", status="ok", elapsed=time.monotonic() - start))
+        try:
+            for name, args in operations:
+                start = time.monotonic()
+                try:
+                    result = self.run_operation(pbap, name, args, repository, folder, profile, base)
+                except Exception as e:
+                    self.emit(dict(base, op=name, args=args, status="error", error=str(e),
+                                   elapsed=time.monotonic() - start))
+                    continue
+                self.emit(dict(base, op=name, args=args, status="ok", elapsed=time.monotonic() - start, result=result))
+        finally:
+            try:
+                pbap.disconnect()
+            except dbus.exceptions.DBusException as e:
+                print(f" Failed to remove the session for {address}: {e}")
+
+    def state_path(self, kind, address):
+        return os.path.join(self.state_dir, f"pbap_{kind}_{address.replace(':', '')}.json")
+
+    def run_operation(self, pbap, name, args, repository, folder, profile, base):
+        """Run one operation; list-like results are streamed as item records.
+
+        Returns:
+            The result stored in the operation's summary record.
+        """
+        # Sync and call-history polls select other folders; put the session back first.
+        if (pbap.location, pbap.folder) != (repository, folder):
+            pbap.select_phonebook(repository, folder)
+        if name == "size":
+            return {"size": pbap.get_size()}
+        if name == "list":
+            count = 0
+            for entries in pbap.list_pages(self.page_size):
+                for handle, contact_name in entries:
+                    self.emit(dict(base, op=name, item={"handle": handle, "name": contact_name}))
+                    count += 1
+            return {"entries": count}
+        if name == "pull":
+            target_file = os.path.join(self.target_dir, f"pbap_{pbap.device_address.replace(':', '')}_single.vcf")
+            try:
+                return pbap.pull_contact(args[0], target_file, pbap.projection_filters(profile), self.timeout)
+            finally:
+                if os.path.exists(target_file):
+                    os.remove(target_file)
+        if name == "pull-all":
+            bytes_before = pbap.bytes_transferred
+
+            def emit_page(page):
+                for handle, contact in page:
+                    self.emit(dict(base, op=name, item={"handle": handle, "contact": contact}))
+
+            if self.store is not None:
+                # Keep the store complete for later local searches.
+                count = pbap.pull_all_into(self.store, self.page_size, target_dir=self.target_dir,
+                                           timeout=self.timeout, profile=profile, on_page=emit_page)
+            else:
+                count = 0
+                for page in pbap.pull_listed_pages(pbap.list_handles(), self.page_size, self.target_dir,
+                                                   timeout=self.timeout, profile=profile):
+                    emit_page(page)
+                    count += len(page)
+            return {"contacts": count, "bytes": pbap.bytes_transferred - bytes_before}
+        if name == "search":
+            if self.store is not None:
+                results = pbap.search_cached(self.store, args[0], args[1])
+            else:
+                results = pbap.search_contacts(args[0], args[1])
+            return [{"handle": str(handle), "name": str(contact_name)} for handle, contact_name in results]
+        if name == "property":
+            value = pbap.get_property(args[0])
+            return {args[0]: None if value is None else str(value)}
+        if name == "counters":
+            return pbap.read_counters()
+        if name == "filters":
+            return pbap.supported_fields()
+        if name == "sync":
+            sync = PhonebookSync(pbap, self.state_path("sync", pbap.device_address), self.page_size,
+                                 self.timeout, self.store)
+            result = sync.sync(repository, folder)
+            for handle, contact in result["added"].items():
+                self.emit(dict(base, op=name, item={"change": "added", "handle": handle, "contact": contact}))
+            for handle, contact in result["changed"].items():
+                self.emit(dict(base, op=name, item={"change": "changed", "handle": handle, "contact": contact}))
+            for handle in result["removed"]:
+                self.emit(dict(base, op=name, item={"change": "removed", "handle": handle}))
+            return {"mode": result["mode"], "added": len(result["added"]), "changed": len(result["changed"]),
+                    "removed": len(result["removed"])}
+        if name == "calls":
+            tracker = CallHistoryTracker(pbap, self.state_path("calls", pbap.device_address),
+                                         profile=profile or "call-history")
+            entries = tracker.poll(repository, folder)
+            for entry in entries:
+                self.emit(dict(base, op=name, item=entry))
+            return {"new": len(entries)}
+        raise ValueError(f"Unknown operation {name}")
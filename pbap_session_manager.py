@@ -0,0 +1,162 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from gi.repository import GLib
+
+from PhonebookProfileMethods import PhoneBookAccess
+
+
+class PbapSessionManager:
+    """Open PBAP sessions to many phones and pull their phonebooks concurrently.
+
+    Each phone gets a worker thread. Session setup is limited by
+    max_parallel_connects (every CreateSession pages a phone), and
+    max_transfers caps the OBEX transfers in flight across all phones. A slot
+    is held for one page at a time, so the phones take turns page by page.
+    """
+
+    def __init__(self, addresses, max_transfers=4, max_parallel_connects=3, page_size=100,
+                 target_dir="/tmp", store=None, log=None):
+        """Initialize the manager.
+
+        Args:
+            addresses: Bluetooth addresses of the phones.
+            max_transfers: Maximum simultaneous OBEX transfers across all phones.
+            max_parallel_connects: Maximum simultaneous CreateSession calls.
+            page_size: Contacts per PullAll page.
+            target_dir: Directory for the temporary page files.
+            store: Optional ContactStore that receives every pulled contact.
+            log: Logger instance; messages are printed when None.
+        """
+        self.addresses = list(addresses)
+        self.page_size = page_size
+        self.target_dir = target_dir
+        self.store = store
+        self.log = log
+        self.transfer_slots = threading.BoundedSemaphore(max_transfers)
+        self.connect_slots = threading.BoundedSemaphore(max_parallel_connects)
+        self.sessions = {}
+        self.sessions_lock = threading.Lock()
+
+    def info(self, message, *args):
+        if self.log:
+            self.log.info(message, *args)
+        else:
+            print(message % args if args else message)
+
+    def open_session(self, address):
+        """Return the open PBAP session for a phone, creating it if needed.
+
+        Returns:
+            Tuple of (PhoneBookAccess, seconds spent setting the session up).
+        """
+        with self.sessions_lock:
+            pbap = self.sessions.get(address)
+        if pbap is not None and pbap.session_path:
+            return pbap, 0.0
+        start = time.monotonic()
+        with self.connect_slots:
+            pbap = PhoneBookAccess(address)
+            pbap.create_session()
+        with self.sessions_lock:
+            self.sessions[address] = pbap
+        return pbap, time.monotonic() - start
+
+    def pull_device(self, address, location="int", folder="pb", filters=None, max_retries=2, timeout=60):
+        """Pull one phone's folder page by page, holding a transfer slot per page.
+
+        Returns:
+            Dict with address, contacts, pages, bytes, transfer_time (seconds from each
+            page request to its completion, parsing and storing excluded), session_setup,
+            elapsed, throughput (bytes per second of transfer_time), completed_at and error.
+        """
+        report = {"address": address, "contacts": 0, "pages": 0, "bytes": 0, "transfer_time": 0.0,
+                  "session_setup": None, "elapsed": None, "throughput": None, "completed_at": None, "error": None}
+        start = time.monotonic()
+        try:
+            pbap, report["session_setup"] = self.open_session(address)
+            pbap.select_phonebook(location, folder)
+            bytes_before = pbap.bytes_transferred
+            time_before = pbap.transfer_time
+            if self.store is not None:
+                self.store.clear_folder(address, location, folder)
+            with self.transfer_slots:
+                handles = pbap.list_handles()
+            # One transfer at a time per phone, so the slot really bounds what is in flight.
+            pages = pbap.pull_listed_pages(handles, self.page_size, self.target_dir, filters, max_retries, timeout,
+                                           prefetch=False)
+            try:
+                while True:
+                    with self.transfer_slots:
+                        page = next(pages, None)
+                    if page is None:
+                        break
+                    if self.store is not None:
+                        self.store.upsert_contacts(address, location, folder, page)
+                    report["contacts"] += len(page)
+                    report["pages"] += 1
+            finally:
+                pages.close()
+            report["bytes"] = pbap.bytes_transferred - bytes_before
+            report["transfer_time"] = pbap.transfer_time - time_before
+            if self.store is not None:
+                self.store.set_counters(address, location, folder, pbap.read_counters())
+        except Exception as e:
+            report["error"] = str(e)
+            self.info("PBAP pull from %s failed: %s", address, e)
+        report["elapsed"] = time.monotonic() - start
+        report["completed_at"] = time.time()
+        if report["transfer_time"]:
+            report["throughput"] = report["bytes"] / report["transfer_time"]
+        return report
+
+    def pull_all(self, location="int", folder="pb", filters=None, max_retries=2, timeout=60):
+        """Pull the same folder from every phone concurrently.
+
+        When called on the main thread, the GLib main loop runs here until every
+        phone is done, so that transfer signals reach the worker threads.
+
+        Returns:
+            {address: report} as returned by pull_device().
+        """
+        results = {}
+        loop = GLib.MainLoop() if threading.current_thread() is threading.main_thread() else None
+        remaining = {"count": len(self.addresses)}
+        lock = threading.Lock()
+
+        def finished(future):
+            with lock:
+                remaining["count"] -= 1
+                last = remaining["count"] == 0
+            if last and loop:
+                GLib.idle_add(loop.quit)
+
+        with ThreadPoolExecutor(max_workers=max(len(self.addresses), 1), thread_name_prefix="pbap") as executor:
+            futures = {}
+            for address in self.addresses:
+                future = executor.submit(self.pull_device, address, location, folder, filters, max_retries, timeout)
+                futures[future] = address
+            for future in futures:
+                future.add_done_callback(finished)
+            if loop and self.addresses:
+                loop.run()
+            for future, address in futures.items():
+                results[address] = future.result()
+        for address in self.addresses:
+            report = results[address]
+            throughput = f"{report['throughput'] / 1024:.1f} KiB/s" if report["throughput"] else "-"
+            self.info("%s: %d contacts, %d bytes in %.2fs (session %.2fs, %s)%s", address, report["contacts"],
+                      report["bytes"], report["elapsed"], report["session_setup"] or 0.0, throughput,
+                      f" error: {report['error']}" if report["error"] else "")
+        return results
+
+    def close(self):
+        """Remove every open session."""
+        with self.sessions_lock:
+            sessions = list(self.sessions.values())
+            self.sessions.clear()
+        for pbap in sessions:
+            try:
+                pbap.disconnect()
+            except Exception as e:
+                self.info("Failed to remove PBAP session for %s: %s", pbap.device_address, e)
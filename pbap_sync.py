@@ -0,0 +1,200 @@
+import hashlib
+import json
+import os
+import time
+
+
+def contact_digest(contact):
+    """Return a stable digest of a parsed contact's properties."""
+    items = [(prop["name"], sorted(prop["params"].items()), prop["value"]) for prop in contact["properties"]]
+    return hashlib.sha1(repr(items).encode("utf-8")).hexdigest()
+
+
+def name_digest(name):
+    """Return the digest of the name List() reports for a handle."""
+    return hashlib.sha1(str(name).encode("utf-8")).hexdigest()
+
+
+def counter_delta(old, new):
+    """Return how far a hex version counter moved, or None when either value is missing or not hex."""
+    try:
+        return int(new, 16) - int(old, 16)
+    except (TypeError, ValueError):
+        return None
+
+
+def sync_mode(handles, removed, to_pull, delta):
+    """Return how a sync whose counters moved fetches the folder.
+
+    Args:
+        handles: Handle digests kept from the previous sync, empty when there are none.
+        removed: Handles that disappeared from List().
+        to_pull: Handles that are new or whose listed name changed.
+        delta: How far PrimaryCounter moved (counter_delta), or None when unknown.
+    Returns:
+        "full" without previous handles, "targeted" when the List() differences
+        account for every counter step, "full-compare" otherwise.
+    """
+    if not handles:
+        return "full"
+    # Each add, delete or edit steps PrimaryCounter; when List() accounts for every
+    # step, no other contact can have changed.
+    if (removed or to_pull) and delta == len(removed) + len(to_pull):
+        return "targeted"
+    return "full-compare"
+
+
+class PhonebookSync:
+    """Incremental PBAP phonebook sync driven by the PhonebookAccess1 version counters.
+
+    For each (device, repository, folder) the last seen DatabaseIdentifier,
+    PrimaryCounter and SecondaryCounter are stored together with a digest of
+    every handle's List() entry and pulled vCard. A sync then
+
+    * does nothing when the counters have not moved,
+    * pulls everything page by page on the first sync or when the
+      DatabaseIdentifier changed (handles are no longer valid),
+    * otherwise lists the folder and pulls only handles that are new or whose
+      listed name changed, dropping handles that disappeared, provided the
+      PrimaryCounter moved by exactly that many changes,
+    * and in any other case (e.g. a phone number edited besides an added
+      contact, or a phone stepping its counters by more than one) pulls the
+      folder page by page and compares every handle's digest, so that edits
+      List() cannot show are not missed while callers still only see the
+      contacts that changed.
+
+    obexd refreshes the counters from the responses of GetSize/List/Pull, so
+    they are read after such a request, never straight after Select.
+    """
+
+    def __init__(self, pbap, state_path, page_size=100, timeout=60, store=None):
+        """Initialize the sync engine.
+
+        Args:
+            pbap: PhoneBookAccess with a session already created.
+            state_path: JSON file holding the counters and digests between runs.
+            page_size: Page size used for List() and full pulls.
+            timeout: Per-transfer timeout in seconds.
+            store: Optional ContactStore kept in step with every sync.
+        """
+        self.pbap = pbap
+        self.store = store
+        self.state_path = state_path
+        self.page_size = page_size
+        self.timeout = timeout
+        self.state = self.load_state()
+
+    def load_state(self):
+        """Read the persisted state, or start empty when there is none."""
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, "r") as state_file:
+            return json.load(state_file)
+
+    def save_state(self):
+        """Write the state atomically so an interrupted sync never leaves a truncated file."""
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, "w") as state_file:
+            json.dump(self.state, state_file, indent=1, sort_keys=True)
+        os.replace(temp_path, self.state_path)
+
+    def state_key(self, location, folder):
+        return f"{self.pbap.device_address}/{location}/{folder}"
+
+    def list_handles(self):
+        """Return {handle: listed name} for the selected folder."""
+        entries = {}
+        for page in self.pbap.list_indexed(self.page_size):
+            for handle, name in page:
+                entries[handle] = name
+        return entries
+
+    def sync(self, location="int", folder="pb"):
+        """Bring one folder up to date with as few transfers as possible.
+
+        Args:
+            location: Repository, e.g. "int" or "sim1".
+            folder: Phonebook object, e.g. "pb", "ich", "och", "mch", "cch".
+        Returns:
+            Dict with added/changed ({handle: contact}), removed (list of handles),
+            skipped (True when the counters were unchanged), mode and elapsed seconds.
+        """
+        start = time.monotonic()
+        self.pbap.select_phonebook(location, folder)
+        key = self.state_key(location, folder)
+        previous = self.state.get(key, {})
+        self.pbap.get_size()
+        counters = self.pbap.read_counters()
+        result = {"added": {}, "changed": {}, "removed": [], "skipped": False, "mode": None}
+
+        counters_known = all(counters[name] is not None for name in ("PrimaryCounter", "SecondaryCounter"))
+        store_current = self.store is None or self.store.get_counters(
+            self.pbap.device_address, location, folder) is not None
+        if counters_known and store_current and previous.get("counters") == counters:
+            result["skipped"] = True
+            result["mode"] = "unchanged"
+            result["elapsed"] = time.monotonic() - start
+            return result
+
+        listed = self.list_handles()
+        counters = self.pbap.read_counters()
+        handles = previous.get("handles", {})
+        address = self.pbap.device_address
+        if previous.get("counters", {}).get("DatabaseIdentifier") != counters["DatabaseIdentifier"]:
+            handles = {}
+        if self.store is not None and self.store.get_counters(address, location, folder) is None:
+            # The store never saw this folder, so it needs every contact, not just the changes.
+            handles = {}
+        if self.store is not None and not handles:
+            self.store.clear_folder(address, location, folder)
+
+        removed = [handle for handle in handles if handle not in listed]
+        to_pull = [handle for handle, name in listed.items()
+                   if handle not in handles or handles[handle]["name"] != name_digest(name)]
+        delta = counter_delta(previous.get("counters", {}).get("PrimaryCounter"), counters["PrimaryCounter"])
+        result["mode"] = sync_mode(handles, removed, to_pull, delta)
+
+        if result["mode"] != "targeted":
+            # First sync (or a new database): one paged PullAll beats a Pull per handle.
+            # Changes List() does not account for: compare every digest.
+            new_handles = self.compare_all(listed, handles, result)
+        else:
+            new_handles = {handle: entry for handle, entry in handles.items() if handle in listed}
+            for handle in to_pull:
+                contact = self.pbap.pull_contact(handle, timeout=self.timeout)
+                if contact is None:
+                    continue
+                digest = contact_digest(contact)
+                bucket = "changed" if handle in handles else "added"
+                if bucket == "added" or handles[handle]["digest"] != digest:
+                    result[bucket][handle] = contact
+                new_handles[handle] = {"name": name_digest(listed[handle]), "digest": digest}
+        result["removed"] = removed
+
+        if self.store is not None:
+            updated = list(result["added"].items()) + list(result["changed"].items())
+            self.store.upsert_contacts(address, location, folder, updated,
+                                       {handle: new_handles[handle]["digest"] for handle, _ in updated})
+            self.store.delete_handles(address, location, folder, removed)
+            self.store.set_counters(address, location, folder, counters)
+        self.state[key] = {"counters": counters, "handles": new_handles}
+        self.save_state()
+        result["elapsed"] = time.monotonic() - start
+        return result
+
+    def compare_all(self, listed, handles, result):
+        """Pull the folder page by page and report the handles whose vCard digest changed.
+
+        Each pulled vCard is matched back to its List() handle by
+        PhoneBookAccess.pull_listed_pages().
+        """
+        new_handles = {}
+        for page in self.pbap.pull_listed_pages(list(listed), self.page_size, timeout=self.timeout):
+            for handle, contact in page:
+                digest = contact_digest(contact)
+                if handle not in handles:
+                    result["added"][handle] = contact
+                elif handles[handle]["digest"] != digest:
+                    result["changed"][handle] = contact
+                new_handles[handle] = {"name": name_digest(listed[handle]), "digest": digest}
+        return new_handles
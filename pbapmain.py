@@ -1,44 +1,126 @@
+import argparse
+import sys
+
 from PhonebookProfileMethods import PhoneBookAccess
+from PhonebookProfileMethods import projection_profiles
+from pbap_sync import PhonebookSync
+from contact_store import ContactStore
+from call_history import CallHistoryTracker
+from pbap_batch import PbapBatchRunner
+from pbap_batch import batch_operations
+from pbap_batch import output_formats
+from pbap_batch import read_manifest
+
+
+def parse_arguments(argv):
+   parser = argparse.ArgumentParser(
+      description="PBAP client. Without --address or --manifest an interactive menu is shown.")
+   parser.add_argument("--address", action="append", default=[],
+                       help="Bluetooth address of the phone (repeat for several phones)")
+   parser.add_argument("--manifest", help="JSON list or JSON-lines file of device entries "
+                       "(address plus optional repository, folder, ops and profile)")
+   parser.add_argument("--repository", default="int", help="Repository: int, sim1 (default int)")
+   parser.add_argument("--folder", default="pb", help="Phonebook object: pb, ich, och, mch, cch, fav, spd (default pb)")
+   parser.add_argument("--ops", default="size",
+                       help=f"Comma-separated operations, arguments after ':' "
+                            f"(e.g. size,pull:1.vcf,search:name:John). One of: {', '.join(batch_operations)}")
+   parser.add_argument("--output", default="-", help="Output file, - for stdout (default)")
+   parser.add_argument("--format", default="jsonl", choices=output_formats, help="Output format (default jsonl)")
+   parser.add_argument("--profile", choices=list(projection_profiles), help="Projection profile for pulls")
+   parser.add_argument("--page-size", type=int, default=100, help="Contacts per page (default 100)")
+   parser.add_argument("--timeout", type=int, default=60, help="Seconds to wait for each transfer (default 60)")
+   parser.add_argument("--store", default="/tmp/pbap_contacts.db", help="Contact store database, empty to disable")
+   parser.add_argument("--state-dir", default="/tmp", help="Directory of the sync and call-history state files")
+   return parser.parse_args(argv)
+
+
+def run_batch(args):
+   entries = [{"address": address} for address in args.address]
+   if args.manifest:
+      entries.extend(read_manifest(args.manifest))
+   store = ContactStore(args.store) if args.store else None
+   output = sys.stdout if args.output == "-" else open(args.output, "w")
+   try:
+      runner = PbapBatchRunner(output, args.format, store, args.state_dir, page_size=args.page_size,
+                               profile=args.profile, timeout=args.timeout)
+      errors = runner.run(entries, args.ops, args.repository, args.folder)
+   finally:
+      if output is not sys.stdout:
+         output.close()
+   return 1 if errors else 0
+
+
+def interactive():
+   pbap = PhoneBookAccess(input('Enter the device address: '))
+   store = ContactStore("/tmp/pbap_contacts.db")
+   pbap.create_session()
+
+   while True:
+         print("\n1. Select phonebook")
+         print("2. Get size")
+         print("3. List vcards")
+         print("4. Pull vcard")
+         print("5. Pull All ")
+         print("6. Search")
+         print("7. Get property")
+         print('8. Display the filters')
+         print('9. Exit')
+         print('10. Incremental sync')
+         print('11. Measure projection profiles')
+         print('12. New call history entries')
+         print('13. Pull All into the contact store')
+         choice = input("Choose: ")
+
+         if choice == "1":
+            user_input=input('Select a repository -- Internal/sim1: ')
+            folder=input('Enter which pbap object pb,ich,och,mch,fav,spd:')
+            pbap.select_phonebook(user_input,folder)
 
-pbap = PhoneBookAccess(input('Enter the device address: '))
-pbap.create_session()
- 
-while True:
-      print("\n1. Select phonebook")
-      print("2. Get size")
-      print("3. List vcards")
-      print("4. Pull vcard")
-      print("5. Pull All ")
-      print("6. Search")
-      print("7. Get property")
-      print('8. Display the filters')
-      print('9. Exit')
-      choice = input("Choose: ")
- 
-      if choice == "1":
-         user_input=input('Select a repository -- Internal/sim1: ')
-         folder=input('Enter which pbap object pb,ich,och,mch,fav,spd:')
-         pbap.select_phonebook(user_input,folder)
- 
-      elif choice == "2":
-         pbap.get_size()
-      elif choice == "3":
-         pbap.list_contacts()
-      elif choice == '4':
-         pbap.pull(input('Enter the vcard handle you want to pull :'))
-      elif choice == '5':
-         pbap.pull_all()
-      elif choice == '6':
-         searchfield=input('Enter the field for search operation :')
-         searchvalue=input('Enter the value name/number/sound: ')
-         pbap.search_contacts(searchfield,searchvalue)
-      elif choice == '7':
-         prop_name=input('Enter the property name :Folder/DatabaseIdentifier/PrimaryCounter/SecondaryCounter/FixedImageSize: ')
-         pbap.get_property(prop_name)
-      elif choice == '8':
-         pbap.list_filters()
-      elif choice == '9':
-         pbap.disconnect()
-         break
+         elif choice == "2":
+            pbap.get_size()
+         elif choice == "3":
+            pbap.list_contacts()
+         elif choice == '4':
+            handle=input('Enter the vcard handle you want to pull :')
+            profile=input(f"Projection profile {'/'.join(projection_profiles)} [full]: ").strip() or 'full'
+            pbap.pull(handle, profile=profile)
+         elif choice == '5':
+            profile=input(f"Projection profile {'/'.join(projection_profiles)} [full]: ").strip() or 'full'
+            pbap.pull_all(profile=profile)
+         elif choice == '6':
+            searchfield=input('Enter the field for search operation :')
+            searchvalue=input('Enter the value name/number/sound: ')
+            pbap.search_cached(store,searchfield,searchvalue)
+         elif choice == '7':
+            prop_name=input('Enter the property name :Folder/DatabaseIdentifier/PrimaryCounter/SecondaryCounter/FixedImageSize: ')
+            pbap.get_property(prop_name)
+         elif choice == '8':
+            pbap.list_filters()
+         elif choice == '10':
+            user_input=input('Select a repository -- int/sim1: ')
+            folder=input('Enter which pbap object pb,ich,och,mch,cch:')
+            sync = PhonebookSync(pbap, f"/tmp/pbap_sync_{pbap.device_address.replace(':', '')}.json", store=store)
+            result = sync.sync(user_input, folder)
+            print(f"{result['mode']}: {len(result['added'])} added, {len(result['changed'])} changed, "
+                  f"{len(result['removed'])} removed in {result['elapsed']:.2f}s")
+         elif choice == '11':
+            pbap.measure_profiles()
+         elif choice == '12':
+            user_input=input('Select a repository -- int/sim1: ')
+            folder=input('Enter which call history ich,och,mch,cch:')
+            tracker = CallHistoryTracker(pbap, f"/tmp/pbap_calls_{pbap.device_address.replace(':', '')}.json")
+            for entry in tracker.poll(user_input, folder):
+               print(f"{entry['datetime']} {entry['type'] or ''} {entry['number']} {entry['name'] or ''}")
+         elif choice == '13':
+            profile=input(f"Projection profile {'/'.join(projection_profiles)} [full]: ").strip() or 'full'
+            pbap.pull_all_into(store, profile=profile)
+         elif choice == '9':
+            pbap.disconnect()
+            break
 
 
+if __name__ == "__main__":
+   arguments = parse_arguments(sys.argv[1:])
+   if arguments.address or arguments.manifest:
+      sys.exit(run_batch(arguments))
+   interactive()
@@ -1,13 +1,14 @@
 from PyQt6.QtWidgets import (QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QTextEdit,
                              QScrollArea, QWidget, QListWidget, QComboBox, QTreeWidget, QTreeWidgetItem, QGridLayout)
-from PyQt6.QtCore import Qt, QFileSystemWatcher
+from PyQt6.QtCore import Qt
 
 import style_sheet as ss
+from log_viewer import LogViewer
+from log_viewer import default_max_lines
 
 
 from Backend_lib.Linux import hci_commands as hci
 
-from PyQt6.QtCore import QFileSystemWatcher
 from PyQt6.QtWidgets import QTextBrowser
 
 import logging
@@ -23,10 +24,10 @@ class TestControllerUI(QWidget):
     UI component for displaying and executing HCI commands for a Bluetooth controller.
 
     Allows dynamic construction of command parameter inputs, executes commands through a backend controller,
-    and displays real-time HCI dump logs using QFileSystemWatcher.
+    and displays real-time HCI dump logs from the shared log tailer.
     """
 
-    def __init__(self, controller, log, bluez_logger, back_callback):
+    def __init__(self, controller, log, bluez_logger, back_callback, log_max_lines=default_max_lines):
         """
         Initializes the TestControllerUI widget.
 
@@ -35,6 +36,7 @@ class TestControllerUI(QWidget):
             log: Logger instance to log debug or operational messages.
             bluez_logger: An instance of BluezLogger used for handling HCI dump logs.
             back_callback (function): Callback function to return to the previous UI screen.
+            log_max_lines (int): Lines kept in the dump log pane; older lines are read back from the file on demand.
 
         returns:
             None
@@ -44,6 +46,7 @@ class TestControllerUI(QWidget):
         self.log = log
         self.back_callback = back_callback
         self.bluez_logger = bluez_logger
+        self.log_max_lines = log_max_lines
         self.scroll = None
         self.content_layout = None
         self.content_widget = None
@@ -55,7 +58,6 @@ class TestControllerUI(QWidget):
         self.empty_list = None
         self.logs_layout = None
         self.dump_log_output = None
-        self.file_watcher = None
 
         self.controller_ui()
 
@@ -109,25 +111,16 @@ class TestControllerUI(QWidget):
         logs_label.setAlignment(Qt.AlignmentFlag.AlignHCenter)
         self.logs_layout.addWidget(logs_label)
 
-        self.dump_log_output = QTextEdit()
-        self.dump_log_output.setReadOnly(True)
+        if self.dump_log_output:
+            self.dump_log_output.close_file()
+        self.dump_log_output = LogViewer(self.log_max_lines)
         self.dump_log_output.setStyleSheet("background: transparent;color: black;border: 2px solid black;")
 
         # Start HCI dump logging
         self.log_file_path=self.bluez_logger.start_dump_logs(interface=self.controller.interface)
 
         #self.log_file_path=self.bluez_logger.hcidump_log_name
-        self.log_file_fd=open(self.log_file_path, "r")
-
-        if self.log_file_fd:
-            content=self.log_file_fd.read()
-            self.dump_log_output.append(content)
-            self.file_position=self.log_file_fd.tell()
-
-
-        self.file_watcher = QFileSystemWatcher()
-        self.file_watcher.addPath(self.log_file_path)
-        self.file_watcher.fileChanged.connect(self.update_log)
+        self.dump_log_output.open(self.log_file_path)
         self.logs_layout.addWidget(self.dump_log_output)
 
         # Add the logs_layout to the main_layout in column 2, row 0
@@ -163,20 +156,6 @@ class TestControllerUI(QWidget):
 
         self.setLayout(main_layout)
 
-    def update_log(self):
-        """
-        Updates the log output widget when the log file changes.
-
-        args: None
-        returns: None
-        """
-        if not self.log_file_fd:
-            return
-        self.log_file_fd.seek(self.file_position)
-        content = self.log_file_fd.read()
-        self.file_position = self.log_file_fd.tell()
-        self.dump_log_output.append(content)
-
     def run_hci_cmd(self, text_selected):
         """
         Builds the dynamic UI input form for a selected HCI command.
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from call_history import CallHistoryTracker
+from vcard_parser import parse_vcards
+
+
+def entry(digest, datetime=None):
+    return {"handle": None, "datetime": datetime, "digest": digest}
+
+
+def entries(digests):
+    return [entry(digest) for digest in digests]
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    return CallHistoryTracker(None, str(tmp_path / "calls.json"), page_size=3)
+
+
+def test_first_poll_has_no_count(tracker):
+    assert tracker.count_new(entries("abc"), None) is None
+
+
+def test_timestamped_stops_at_watermark(tracker):
+    watermark = {"datetime": "20240101T100000", "digests": ["b"]}
+    pulled = [entry("x", "20240101T100500"), entry("a", "20240101T100000"), entry("b", "20240101T100000"),
+              entry("y", "20240101T095900")]
+    # "a" shares the watermark's second but was not seen: a new call within that second.
+    assert tracker.count_new(pulled, watermark) == 2
+    assert tracker.count_new(pulled[:2], watermark) is None
+    assert tracker.count_new(pulled[::3], watermark) == 1
+
+
+@pytest.mark.parametrize("digests, run, expected", [
+    ("abc", "abc", 0),
+    ("xyabc", "abc", 2),
+    # A partial match of the run's head earlier in the list is not the anchor.
+    ("abxabc", "abc", 3),
+    # The same call repeated: only the call in front of the whole run is new.
+    ("aaab", "aab", 1),
+    # Only part of the run pulled (or its tail deleted): undetermined rather than "all new".
+    ("xyab", "abc", None),
+    ("xyz", "abc", None),
+])
+def test_untimestamped_needs_whole_run(tracker, digests, run, expected):
+    watermark = {"datetime": None, "digests": list(run)}
+    assert tracker.count_new(entries(digests), watermark) == expected
+
+
+class FakePbap:
+    device_address = "AA"
+
+    def __init__(self, numbers):
+        self.numbers = numbers
+
+    def select_phonebook(self, location, folder):
+        pass
+
+    def projection_filters(self, profile):
+        return {}
+
+    def handle_pages(self, page_size):
+        for offset in range(0, len(self.numbers) + 1, page_size):
+            yield [f"{position + 1}.vcf" for position in range(offset, min(offset + page_size, len(self.numbers)))]
+
+    def pull_page(self, offset, page_size, filters=None):
+        data = "".join(f"BEGIN:VCARD\r\nVERSION:2.1\r\nTEL:{number}\r\nEND:VCARD\r\n"
+                       for number in self.numbers[offset:offset + page_size])
+        return list(parse_vcards(data.encode("utf-8")))
+
+
+def test_poll_untimestamped(tmp_path):
+    state_path = str(tmp_path / "calls.json")
+    pbap = FakePbap(["3", "2", "1"])
+    tracker = CallHistoryTracker(pbap, state_path, page_size=2, max_pages=2)
+    assert [call["number"] for call in tracker.poll()] == ["3", "2", "1"]
+    assert tracker.poll() == []
+    pbap.numbers[:0] = ["1", "1"]
+    assert [(call["handle"], call["number"]) for call in tracker.poll()] == [("1.vcf", "1"), ("2.vcf", "1")]
+
+
+def test_poll_reports_nothing_when_run_is_lost(tmp_path):
+    state_path = str(tmp_path / "calls.json")
+    pbap = FakePbap(["3", "2", "1"])
+    tracker = CallHistoryTracker(pbap, state_path, page_size=2, max_pages=2)
+    tracker.poll()
+    pbap.numbers[:] = ["6", "5", "4", "3"]
+    assert tracker.poll() == []
+    with open(state_path) as state_file:
+        watermark = json.load(state_file)["AA/int/mch"]
+    assert watermark["handle"] == "1.vcf"
+    pbap.numbers.insert(0, "7")
+    assert [call["number"] for call in tracker.poll()] == ["7"]
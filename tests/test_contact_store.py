@@ -0,0 +1,44 @@
+import pytest
+
+from contact_store import ContactStore
+from contact_store import normalize_number
+from vcard_parser import parse_vcards
+
+
+@pytest.mark.parametrize("number, country_code, expected", [
+    ("+49 30 1234-56", None, "+4930123456"),
+    ("0049 (30) 123456", None, "+4930123456"),
+    ("030 123456", "49", "+4930123456"),
+    ("030 123456", None, "030123456"),
+    ("555-0100", "49", "5550100"),
+    ("  ", None, ""),
+    ("n/a", "49", ""),
+])
+def test_normalize_number(number, country_code, expected):
+    assert normalize_number(number, country_code) == expected
+
+
+def make_store(count):
+    data = "".join(f"BEGIN:VCARD\r\nVERSION:3.0\r\nFN:Anna {index:03d}\r\nTEL:030 5550{index:03d}\r\nEND:VCARD\r\n"
+                   for index in range(count)).encode("utf-8")
+    store = ContactStore(":memory:", default_country_code="49")
+    store.upsert_contacts("AA", "int", "pb", [(f"{index}.vcf", contact)
+                                              for index, contact in enumerate(parse_vcards(data))])
+    return store
+
+
+def test_search_without_limit_returns_every_match():
+    store = make_store(60)
+    assert len(store.search("name", "anna")) == 60
+    assert len(store.search("number", "+49 30 5550")) == 60
+
+
+def test_search_limit():
+    store = make_store(60)
+    assert store.search("name", "Anna", limit=5) == [(f"{index}.vcf", f"Anna {index:03d}") for index in range(5)]
+    assert len(store.search("number", "0305550", limit=5)) == 5
+
+
+def test_search_number_suffix():
+    store = make_store(3)
+    assert store.search("number", "+49 (30) 5550-002") == [("2.vcf", "Anna 002")]
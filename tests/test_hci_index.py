@@ -0,0 +1,60 @@
+import itertools
+
+import pytest
+
+from hci_decoder import BtsnoopWriter
+from hci_decoder import acl_packet
+from hci_decoder import command_packet
+from hci_decoder import make_opcode
+from hci_decoder import read_btsnoop
+from hci_index import HciIndex
+
+base = 1700000000.0
+reset = make_opcode(0x03, 0x0003)
+read_bd_addr = make_opcode(0x04, 0x0009)
+
+
+@pytest.fixture
+def capture(tmp_path):
+    path = str(tmp_path / "hci.btsnoop")
+    with BtsnoopWriter(path) as writer:
+        for number in range(60):
+            # Pairs of records share a timestamp, so the range bounds hit duplicates.
+            timestamp = base + (number // 2) * 0.25
+            if number % 3 == 0:
+                writer.write_packet("command", command_packet(reset if number % 2 else read_bd_addr), timestamp=timestamp)
+            else:
+                writer.write_packet("acl", acl_packet(0x0040 + number % 2, b"\x00" * 4), timestamp=timestamp)
+    return path
+
+
+def brute_force(path, start=None, end=None, **criteria):
+    return [number for number, record in enumerate(read_btsnoop(path))
+            if (start is None or record["timestamp"] >= start) and (end is None or record["timestamp"] <= end)
+            and all(record.get(key) == value for key, value in criteria.items())]
+
+
+def test_time_range_bisect(capture):
+    index = HciIndex(capture).build()
+    assert len(index) == 60
+    bounds = [None, base - 1, base, base + 0.1, base + 2.0, base + 2.25, base + 7.25, base + 100]
+    for start, end in itertools.product(bounds, repeat=2):
+        assert index.query(start=start, end=end) == brute_force(capture, start, end), (start, end)
+
+
+def test_time_range_with_criteria(capture):
+    index = HciIndex(capture).build()
+    for start, end in [(None, None), (base + 1.0, base + 5.0), (base + 1.25, base + 1.25), (base + 6, base + 1)]:
+        assert index.query(handle=0x0040, start=start, end=end) == brute_force(capture, start, end, handle=0x0040)
+        assert index.query(record_type="command", start=start, end=end) == \
+            brute_force(capture, start, end, type="command")
+        assert index.query(ogf=0x03, ocf=0x0003, start=start, end=end) == \
+            brute_force(capture, start, end, opcode=reset)
+        assert index.query(ocf=0x0009, start=start, end=end) == brute_force(capture, start, end, opcode=read_bd_addr)
+
+
+def test_limit_and_conflicting_opcode(capture):
+    index = HciIndex(capture).build()
+    assert index.query(start=base + 1.0, limit=3) == brute_force(capture, base + 1.0)[:3]
+    assert index.query(handle=0x0041, limit=2) == brute_force(capture, handle=0x0041)[:2]
+    assert index.query(opcode=reset, ogf=0x04, ocf=0x0009) == []
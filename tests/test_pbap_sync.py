@@ -0,0 +1,83 @@
+import pytest
+
+from pbap_sync import PhonebookSync
+from pbap_sync import counter_delta
+from pbap_sync import sync_mode
+from vcard_parser import parse_vcards
+
+
+def test_counter_delta():
+    assert counter_delta("0000000000000000000000000000000A", "0000000000000000000000000000000C") == 2
+    assert counter_delta(None, "01") is None
+    assert counter_delta("01", "not hex") is None
+
+
+@pytest.mark.parametrize("handles, removed, to_pull, delta, expected", [
+    ({}, [], ["1.vcf"], 1, "full"),
+    ({"1.vcf": {}}, [], ["2.vcf"], 1, "targeted"),
+    ({"1.vcf": {}}, ["1.vcf"], ["2.vcf"], 2, "targeted"),
+    # An edit List() cannot show besides the added contact.
+    ({"1.vcf": {}}, [], ["2.vcf"], 2, "full-compare"),
+    # The counters moved but List() shows no difference.
+    ({"1.vcf": {}}, [], [], 1, "full-compare"),
+    ({"1.vcf": {}}, [], ["2.vcf"], None, "full-compare"),
+])
+def test_sync_mode(handles, removed, to_pull, delta, expected):
+    assert sync_mode(handles, removed, to_pull, delta) == expected
+
+
+def vcard(name, number):
+    return next(parse_vcards(f"BEGIN:VCARD\r\nVERSION:3.0\r\nFN:{name}\r\nTEL:{number}\r\nEND:VCARD\r\n".encode()))
+
+
+class FakePbap:
+    device_address = "AA"
+
+    def __init__(self):
+        self.book = {"0.vcf": ("Owner", "1"), "1.vcf": ("Anna", "2")}
+        self.primary = 1
+        self.pulled = []
+
+    def select_phonebook(self, location, folder):
+        pass
+
+    def get_size(self):
+        return len(self.book)
+
+    def read_counters(self):
+        return {"DatabaseIdentifier": "db", "PrimaryCounter": f"{self.primary:032X}", "SecondaryCounter": "0" * 32}
+
+    def list_indexed(self, page_size):
+        yield [(handle, self.book[handle][0]) for handle in sorted(self.book)]
+
+    def pull_contact(self, handle, timeout=60):
+        self.pulled.append(handle)
+        return vcard(*self.book[handle])
+
+    def pull_listed_pages(self, handles, page_size=100, timeout=60):
+        self.pulled.append("all")
+        yield [(handle, vcard(*self.book[handle])) for handle in handles]
+
+
+def test_sync_modes(tmp_path):
+    pbap = FakePbap()
+    sync = PhonebookSync(pbap, str(tmp_path / "sync.json"))
+    first = sync.sync()
+    assert (first["mode"], sorted(first["added"])) == ("full", ["0.vcf", "1.vcf"])
+    assert sync.sync()["mode"] == "unchanged"
+
+    pbap.book["2.vcf"] = ("Bob", "3")
+    pbap.primary += 1
+    pbap.pulled.clear()
+    added = sync.sync()
+    assert (added["mode"], list(added["added"]), pbap.pulled) == ("targeted", ["2.vcf"], ["2.vcf"])
+
+    # A number edit does not show in List(); together with a new contact the counter
+    # moves by two, so every digest is compared.
+    pbap.book["1.vcf"] = ("Anna", "4")
+    pbap.book["3.vcf"] = ("Carl", "5")
+    pbap.primary += 2
+    pbap.pulled.clear()
+    mixed = sync.sync()
+    assert (mixed["mode"], list(mixed["added"]), list(mixed["changed"]), pbap.pulled) == \
+        ("full-compare", ["3.vcf"], ["1.vcf"], ["all"])
@@ -0,0 +1,63 @@
+from vcard_parser import VCardIndex
+from vcard_parser import parse_vcards
+
+vcards = (
+    b"BEGIN:VCARD\r\n"
+    b"VERSION:2.1\r\n"
+    b"N;CHARSET=UTF-8;ENCODING=QUOTED-PRINTABLE:M=C3=BCller;J=C3=BCrgen;;;\r\n"
+    b"FN;CHARSET=UTF-8;ENCODING=QUOTED-PRINTABLE:J=C3=BCrgen M=\r\n"
+    b"=C3=BCller\r\n"
+    b"TEL;CELL:+49 170 1234567\r\n"
+    b"END:VCARD\r\n"
+    b"BEGIN:VCARD\r\n"
+    b"VERSION:3.0\r\n"
+    b"FN:Doe\\, Jane\r\n"
+    b"N:Doe;Jane;;;\r\n"
+    b"NOTE:first line\\nsecond line that is folded\r\n"
+    b"  over two lines\r\n"
+    b"TEL;TYPE=HOME,VOICE:030 1234\r\n"
+    b"TEL;TYPE=WORK:030 5678\r\n"
+    b"EMAIL:jane@example.com\r\n"
+    b"PHOTO;ENCODING=b;TYPE=JPEG:/9j/4AAQSkZJ\r\n"
+    b" RgABAQ==\r\n"
+    b"END:VCARD\r\n"
+    b"BEGIN:VCARD\r\n"
+    b"VERSION:2.1\r\n"
+    b"N:;;;;\r\n"
+    b"END:VCARD\r\n"
+)
+
+
+def test_index_matches_streaming_parser(tmp_path):
+    path = tmp_path / "pb.vcf"
+    path.write_bytes(vcards)
+    streamed = list(parse_vcards(str(path)))
+    with VCardIndex(str(path)) as index:
+        assert len(index) == len(streamed) == 3
+        assert [index.contact(position) for position in range(len(index))] == streamed
+        assert [index.contact(position, include_binary=False) for position in range(len(index))] == \
+            list(parse_vcards(str(path), include_binary=False))
+
+
+def test_streaming_parser_small_chunks(tmp_path):
+    path = tmp_path / "pb.vcf"
+    path.write_bytes(vcards)
+    assert list(parse_vcards(str(path), chunk_size=7)) == list(parse_vcards(vcards))
+
+
+def test_parsed_values():
+    first, second, empty = parse_vcards(vcards)
+    assert first["fn"] == "Jürgen Müller"
+    assert first["tel"] == [{"number": "+49 170 1234567", "types": ["CELL"]}]
+    assert second["fn"] == "Doe, Jane"
+    assert [tel["number"] for tel in second["tel"]] == ["030 1234", "030 5678"]
+    assert second["email"] == ["jane@example.com"]
+    assert empty["tel"] == []
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.vcf"
+    path.write_bytes(b"")
+    with VCardIndex(str(path)) as index:
+        assert len(index) == 0
+    assert list(parse_vcards(str(path))) == []
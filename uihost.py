@@ -4,10 +4,11 @@ import subprocess
 import dbus
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 
 import psutil
-from PyQt6.QtCore import QTimer, QFileSystemWatcher
+from PyQt6.QtCore import QTimer, pyqtSignal
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QScrollArea, QListWidgetItem, QGroupBox, QDialog, QHeaderView
@@ -22,7 +23,6 @@ from PyQt6.QtWidgets import QTableWidgetItem
 from PyQt6.QtWidgets import QTextBrowser
 from PyQt6.QtWidgets import QVBoxLayout
 from PyQt6.QtWidgets import QWidget
-from PyQt6.QtWidgets import QTextEdit
 from PyQt6.QtWidgets import QTabWidget
 from PyQt6.QtWidgets import QMessageBox
 from PyQt6.QtWidgets import QFileDialog
@@ -30,6 +30,12 @@ from PyQt6.QtWidgets import QComboBox
 
 
 from logger import Logger
+from log_viewer import LogViewer
+from log_viewer import default_max_lines
+from hci_capture import HciCapture
+from hci_decoder import format_record
+from hci_index import HciIndex
+from hci_index import parse_query
 from Backend_lib.Linux.bluez import BluetoothDeviceManager
 
 
@@ -61,7 +67,10 @@ class TestApplication(QWidget):
     and media control operations using BlueZ and PulseAudio.
     """
 
-    def __init__(self, interface=None, log_path=None, back_callback=None):
+    device_operation_finished = pyqtSignal(str, str, bool)
+
+    def __init__(self, interface=None, log_path=None, back_callback=None, log_max_lines=default_max_lines,
+                 hci_capture_format="hcidump"):
         """
         Initialize the TestApplication widget.
 
@@ -69,6 +78,9 @@ class TestApplication(QWidget):
             interface (str): Bluetooth adapter interface (e.g., hci0).
             log_path (str): Path to the log file for capturing events.
             back_callback (callable): Optional callback to trigger on back action.
+            log_max_lines (int): Lines kept in each log pane; older lines are read back from the file on demand.
+            hci_capture_format (str): "hcidump" for the hcidump -Xt text log, or "btsnoop" to record a binary
+                btmon capture that is decoded into the HCI pane.
 
         returns:
             None
@@ -76,6 +88,11 @@ class TestApplication(QWidget):
         super().__init__()
         self.log = Logger("UI")
         self.log_path = log_path
+        self.log_max_lines = log_max_lines
+        self.hci_capture_format = hci_capture_format
+        self.hci_capture = None
+        self.hci_index = None
+        self.hci_filter_input = None
         self.bluez_logger = BluetoothDeviceManager(log_path=self.log_path)
         self.interface = interface
         self.bluetoothd_proc = None
@@ -83,10 +100,12 @@ class TestApplication(QWidget):
 
         self.discovery_active = False
         self.back_callback = back_callback
+        self.operation_executor = ThreadPoolExecutor(max_workers=4)
+        self.pending_operations = set()
+        self.device_operation_finished.connect(self.on_device_operation_finished)
         self.controller = Controller()
         #self.daemon_manager = DaemonManager()
         self.test_application_clicked()
-        self.bluetooth_device_manager = BluetoothDeviceManager(interface=self.interface)
 
         self.device_address_source = None
         self.device_address_sink = None
@@ -238,7 +257,8 @@ class TestApplication(QWidget):
         bus = dbus.SystemBus()
         om = dbus.Interface(bus.get_object("org.bluez", "/"), "org.freedesktop.DBus.ObjectManager")
         objects = om.GetManagedObjects()
-        devices = [path for path, interfaces in objects.items() if "org.bluez.Device1" in interfaces]
+        devices = [interfaces["org.bluez.Device1"] for path, interfaces in objects.items()
+                   if "org.bluez.Device1" in interfaces]
         self.table_widget = QTableWidget(len(devices), 3)
         self.table_widget.setHorizontalHeaderLabels(["DEVICE NAME", "BD_ADDR", "PROCEDURES"])
         self.table_widget.setFont(bold_font)
@@ -251,12 +271,10 @@ class TestApplication(QWidget):
         self.table_widget.setColumnWidth(1, 140)
         self.table_widget.setColumnWidth(2, 200)
 
-        for i, device_path in enumerate(devices):
-            device = dbus.Interface(bus.get_object("org.bluez", device_path), dbus_interface="org.bluez.Device1")
-            device_props = dbus.Interface(bus.get_object("org.bluez", device_path),
-                                          dbus_interface="org.freedesktop.DBus.Properties")
-            device_address = device_props.Get("org.bluez.Device1", "Address")
-            device_name = device_props.Get("org.bluez.Device1", "Alias")
+        for i, device_props in enumerate(devices):
+            # GetManagedObjects already carries every Device1 property; no per-device Get calls.
+            device_address = str(device_props.get("Address", ""))
+            device_name = str(device_props.get("Alias", device_address))
             self.table_widget.setItem(i, 0, QTableWidgetItem(device_name))
             self.table_widget.setItem(i, 1, QTableWidgetItem(device_address))
             # self.table_widget.horizontalHeader().setStretchLastSection(True)
@@ -358,9 +376,60 @@ class TestApplication(QWidget):
         self.discoverable_timeout_input.setText("0")
 
 
+    def run_device_operation(self, action, device_address, operation):
+        """
+        Run a blocking BluetoothDeviceManager call on a worker thread.
+
+        The result is delivered back on the GUI thread through device_operation_finished,
+        so the window keeps repainting while BlueZ pages the device.
+
+        Args:
+            action (str): 'pair' or 'br_edr_connect'.
+            device_address (str): Bluetooth MAC address.
+            operation (callable): Blocking call returning True/False.
+        returns:
+            None
+        """
+        if (action, device_address) in self.pending_operations:
+            print(f"{action} already in progress for {device_address}")
+            return
+        self.pending_operations.add((action, device_address))
+        future = self.operation_executor.submit(operation)
+
+        def done(finished):
+            success = not finished.cancelled() and finished.exception() is None and bool(finished.result())
+            self.device_operation_finished.emit(action, device_address, success)
+
+        future.add_done_callback(done)
+
+    def on_device_operation_finished(self, action, device_address, success):
+        """
+        Show the result of a background pair/connect operation.
+
+        Args:
+            action (str): 'pair' or 'br_edr_connect'.
+            device_address (str): Bluetooth MAC address.
+            success (bool): Result of the operation.
+        returns:
+            None
+        """
+        self.pending_operations.discard((action, device_address))
+        if action == 'pair':
+            if success:
+                QMessageBox.information(self, "Pairing Result", f"Pairing with {device_address} was successful.")
+                self.add_device(device_address)
+            else:
+                QMessageBox.critical(self, "Pairing Failed", f"Pairing with {device_address} failed.")
+        elif action == 'br_edr_connect':
+            if success:
+                QMessageBox.information(self, "Connection Result", f"Connection with {device_address} was successful.")
+                self.add_device(device_address)
+            else:
+                QMessageBox.critical(self, "Connection Failed", f"Connection with {device_address} failed.")
+
     def pair(self, device_address):
         """
-        Attempt to pair with the given Bluetooth device.
+        Attempt to pair with the given Bluetooth device without blocking the GUI thread.
 
         Args:
             device_address (str): Bluetooth MAC address.
@@ -373,18 +442,13 @@ class TestApplication(QWidget):
             self.add_device(device_address)
             return
 
-        # This will block until confirmation is handled
-        success = self.bluetooth_device_manager.pair(device_address,self.interface)
-
-        if success:
-            QMessageBox.information(self, "Pairing Result", f"Pairing with {device_address} was successful.")
-            self.add_device(device_address)
-        else:
-            QMessageBox.critical(self, "Pairing Failed", f"Pairing with {device_address} failed.")
+        # Pairing blocks until confirmation is handled, so it runs on a worker thread
+        self.run_device_operation('pair', device_address,
+                                  lambda: self.bluetooth_device_manager.pair(device_address, self.interface))
 
     def br_edr_connect(self, device_address):
         """
-        Connect to a device using BR/EDR.
+        Connect to a device using BR/EDR without blocking the GUI thread.
 
         Args:
             device_address (str): Bluetooth MAC address.
@@ -393,12 +457,8 @@ class TestApplication(QWidget):
         """
 
         print(f"Attempting BR/EDR connect with {device_address}")
-        success = self.bluetooth_device_manager.br_edr_connect(device_address,self.interface)
-        if success:
-            QMessageBox.information(self, "Connection Result", f"Connection with {device_address} was successful.")
-            self.add_device(device_address)
-        else:
-            QMessageBox.critical(self, "Connection Failed", f"Connection with {device_address} failed.")
+        self.run_device_operation('br_edr_connect', device_address,
+                                  lambda: self.bluetooth_device_manager.br_edr_connect(device_address, self.interface))
 
     def le_connect(self, device_address):
         """
@@ -418,9 +478,83 @@ class TestApplication(QWidget):
         Handles the close event for TestApplication, ensuring Bluetooth resources are released.
         """
         print("[TestApplication] closeEvent triggered. Shutting down BluetoothDeviceManager.")
-        if hasattr(self, 'bluetooth_device_manager') and self.bluetooth_device_manager:
-            self.bluetooth_device_manager.shutdown()
+        self.operation_executor.shutdown(wait=False, cancel_futures=True)
+        self.shutdown_device_managers()
+        self.close_log_viewers()
+        if self.hci_capture:
+            self.hci_capture.stop()
+            self.hci_capture = None
         super().closeEvent(event)
+
+    def start_hci_capture(self):
+        """
+        Start a binary btsnoop capture of the controller and its decoder.
+
+        The capture is written next to the other logs (or to /tmp) as hci_<interface>.btsnoop.
+
+        args: None
+        returns:
+            str: Path of the decoded text log shown in the HCI pane.
+        """
+        if self.hci_capture:
+            self.hci_capture.stop()
+        log_dir = self.log_path if self.log_path and os.path.isdir(self.log_path) else "/tmp"
+        capture_path = os.path.join(log_dir, f"hci_{self.interface}.btsnoop")
+        self.hci_capture = HciCapture(self.interface, capture_path, log=self.log)
+        # The index is fed from the capture thread as packets are decoded.
+        self.hci_index = HciIndex(capture_path)
+        self.hci_capture.add_listener(self.hci_index.add_records)
+        return self.hci_capture.start()
+
+    def apply_hci_filter(self):
+        """
+        Show the captured HCI records matching the filter typed above the HCI pane.
+
+        Only the matching records are read from the capture; an empty filter returns to the live log.
+
+        args: None
+        returns: None
+        """
+        text = self.hci_filter_input.text().strip()
+        viewer = self.hci_dump_log_text_browser
+        if not text or self.hci_index is None:
+            viewer.clear_results()
+            return
+        try:
+            criteria = parse_query(text, self.hci_index.first_timestamp())
+        except ValueError as e:
+            viewer.show_results([f"Invalid filter: {e}"])
+            return
+        limit = viewer.max_lines - 1
+        numbers = self.hci_index.query(limit=limit + 1, **criteria)
+        lines = [format_record(record) for record in self.hci_index.read(numbers[:limit])]
+        more = f", first {limit} shown" if len(numbers) > limit else ""
+        viewer.show_results([f"{len(lines)} records match '{text}'{more}"] + lines)
+
+    def shutdown_device_managers(self):
+        """
+        Release the signal subscriptions and worker threads of the current device managers.
+
+        args: None
+        returns: None
+        """
+        for name in ("bluetooth_device_manager", "bluez_logger"):
+            manager = getattr(self, name, None)
+            if manager is not None:
+                manager.shutdown()
+                setattr(self, name, None)
+
+    def close_log_viewers(self):
+        """
+        Unsubscribe the log panes from the shared log tailers.
+
+        args: None
+        returns: None
+        """
+        for name in ("bluetoothd_log_text_browser", "pulseaudio_log_text_browser", "hci_dump_log_text_browser"):
+            viewer = getattr(self, name, None)
+            if viewer is not None:
+                viewer.close_file()
 #---------------A2DP METHODS-------------------------------
 
     def build_a2dp_ui(self, device_address):
@@ -1097,8 +1231,9 @@ class TestApplication(QWidget):
            returns: None
            """
 
-        self.bluetooth_device_manager=BluetoothDeviceManager(self.interface)
-        self.bluez_logger=BluetoothDeviceManager(log_path=self.log_path)
+        self.shutdown_device_managers()
+        self.bluetooth_device_manager = BluetoothDeviceManager(interface=self.interface)
+        self.bluez_logger = BluetoothDeviceManager(log_path=self.log_path)
         self.restart_daemons()
 
         # Create the main grid
@@ -1312,27 +1447,39 @@ class TestApplication(QWidget):
         tab_bar.setExpanding(True)
         self.dump_logs_text_browser.setFixedWidth(400)
 
-        self.bluetoothd_log_text_browser = QTextEdit()
+        # Panes from a previous visit of this screen stop receiving lines.
+        self.close_log_viewers()
+        self.bluetoothd_log_text_browser = LogViewer(self.log_max_lines)
         self.bluetoothd_log_text_browser.setFont(bold_font)
         self.bluetoothd_log_text_browser.setMinimumWidth(50)
         self.bluetoothd_log_text_browser.setReadOnly(True)
 
-        self.pulseaudio_log_text_browser = QTextEdit()
+        self.pulseaudio_log_text_browser = LogViewer(self.log_max_lines)
         self.pulseaudio_log_text_browser.setFont(bold_font)
         self.pulseaudio_log_text_browser.setMinimumWidth(50)
         self.pulseaudio_log_text_browser.setReadOnly(True)
 
-        self.hci_dump_log_text_browser = QTextEdit()
+        self.hci_dump_log_text_browser = LogViewer(self.log_max_lines)
         self.hci_dump_log_text_browser.setFont(bold_font)
         self.hci_dump_log_text_browser.setMinimumWidth(50)
         self.hci_dump_log_text_browser.setReadOnly(True)
 
         self.dump_logs_text_browser.addTab(self.bluetoothd_log_text_browser, "Bluetoothd_Logs")
         self.dump_logs_text_browser.addTab(self.pulseaudio_log_text_browser, "Pulseaudio_Logs")
-        self.dump_logs_text_browser.addTab(self.hci_dump_log_text_browser, "HCI_Dump_Logs")
+        # HCI tab: filter box (btsnoop capture mode only) above the dump log
+        hci_tab = QWidget()
+        hci_tab_layout = QVBoxLayout(hci_tab)
+        hci_tab_layout.setContentsMargins(0, 0, 0, 0)
+        self.hci_filter_input = QLineEdit()
+        self.hci_filter_input.setPlaceholderText("Filter: events for handle 0x0040 between 12:00:01 and 12:00:05")
+        self.hci_filter_input.returnPressed.connect(self.apply_hci_filter)
+        self.hci_filter_input.setVisible(self.hci_capture_format == "btsnoop")
+        hci_tab_layout.addWidget(self.hci_filter_input)
+        hci_tab_layout.addWidget(self.hci_dump_log_text_browser)
+        self.dump_logs_text_browser.addTab(hci_tab, "HCI_Dump_Logs")
 
         transparent_textedit_style = """
-            QTextEdit {
+            QPlainTextEdit {
                 background: transparent;
                 color: black;
                 border: none;
@@ -1345,49 +1492,24 @@ class TestApplication(QWidget):
 
         # Start bluetoothd logs
         self.bluetoothd_log_file_path=self.bluez_logger.start_bluetoothd_logs()
-        self.bluetoothd_log_file_fd=open(self.bluetoothd_log_file_path, "r")
-        if self.bluetoothd_log_file_fd:
-            content=self.bluetoothd_log_file_fd.read()
-            self.bluetoothd_log_text_browser.append(content)
-            self.bluetoothd_file_position=self.bluetoothd_log_file_fd.tell()
-
-        # Bluetoothd watcher
-        self.bluetoothd_file_watcher = QFileSystemWatcher()
-        self.bluetoothd_file_watcher.addPath(self.bluetoothd_log_file_path)
-        self.bluetoothd_file_watcher.fileChanged.connect(self.update_bluetoothd_log)
+        self.bluetoothd_log_text_browser.open(self.bluetoothd_log_file_path)
 
 
         # Start pulseaudio logs
 
         self.pulseaudio_log_file_path=self.bluez_logger.start_pulseaudio_logs()
-        self.pulseaudio_log_file_fd=open(self.pulseaudio_log_file_path, "r")
-        if self.pulseaudio_log_file_fd:
-            content=self.pulseaudio_log_file_fd.read()
-            self.pulseaudio_log_text_browser.append(content)
-            self.pulseaudio_file_position=self.pulseaudio_log_file_fd.tell()
-
-        # Pulseaudio watcher
-        self.pulseaudio_file_watcher = QFileSystemWatcher()
-        self.pulseaudio_file_watcher.addPath(self.pulseaudio_log_file_path)
-        self.pulseaudio_file_watcher.fileChanged.connect(self.update_pulseaudio_log)
+        self.pulseaudio_log_text_browser.open(self.pulseaudio_log_file_path)
 
 
 
 
 
         # Start HCI dump logs
-        self.hci_log_file_path=self.bluez_logger.start_dump_logs(interface=self.interface)
-        self.hci_log_file_fd=open(self.hci_log_file_path, "r")
-
-        if self.hci_log_file_fd:
-            content=self.hci_log_file_fd.read()
-            self.hci_dump_log_text_browser.append(content)
-            self.hci_file_position=self.hci_log_file_fd.tell()
-
-        # HCI dump watcher
-        self.hci_file_watcher = QFileSystemWatcher()
-        self.hci_file_watcher.addPath(self.hci_log_file_path)
-        self.hci_file_watcher.fileChanged.connect(self.update_hci_log)
+        if self.hci_capture_format == "btsnoop":
+            self.hci_log_file_path = self.start_hci_capture()
+        else:
+            self.hci_log_file_path=self.bluez_logger.start_dump_logs(interface=self.interface)
+        self.hci_dump_log_text_browser.open(self.hci_log_file_path)
 
 
         # Set the main layout for the test application window
@@ -1420,25 +1542,4 @@ class TestApplication(QWidget):
         self.setLayout(self.main_grid_layout)
         QTimer.singleShot(1000, self.load_connected_devices)
 
-    def update_bluetoothd_log(self):
-        if self.bluetoothd_log_file_fd:
-            self.bluetoothd_log_file_fd.seek(self.bluetoothd_file_position)
-            content = self.bluetoothd_log_file_fd.read()
-            self.bluetoothd_file_position = self.bluetoothd_log_file_fd.tell()
-            self.bluetoothd_log_text_browser.append(content)
-
-    def update_pulseaudio_log(self):
-        if self.pulseaudio_log_file_fd:
-            self.pulseaudio_log_file_fd.seek(self.pulseaudio_file_position)
-            content = self.pulseaudio_log_file_fd.read()
-            self.pulseaudio_file_position = self.pulseaudio_log_file_fd.tell()
-            self.pulseaudio_log_text_browser.append(content)
-
-    def update_hci_log(self):
-        if self.hci_log_file_fd:
-            self.hci_log_file_fd.seek(self.hci_file_position)
-            content = self.hci_log_file_fd.read()
-            self.hci_file_position = self.hci_log_file_fd.tell()
-            self.hci_dump_log_text_browser.append(content)
-
 
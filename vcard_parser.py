@@ -0,0 +1,366 @@
+import base64
+import binascii
+import io
+import mmap
+import quopri
+from array import array
+
+
+# Properties whose value is a list of ';'-separated components.
+structured_properties = ("N", "ADR", "ORG")
+# Bare vCard 2.1 parameters that name an encoding rather than a type.
+encoding_parameters = ("QUOTED-PRINTABLE", "BASE64", "8BIT", "7BIT", "B")
+
+
+def iter_physical_lines(stream, chunk_size=65536):
+    """Yield the lines of a binary stream without their line terminators, reading it in chunks.
+
+    Args:
+        stream: File object opened in binary mode (text streams are encoded as UTF-8).
+        chunk_size: Number of bytes read per call.
+    Yields:
+        One bytes object per line.
+    """
+    remainder = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        lines = (remainder + chunk).split(b"\n")
+        remainder = lines.pop()
+        for line in lines:
+            yield line[:-1] if line.endswith(b"\r") else line
+    if remainder:
+        yield remainder[:-1] if remainder.endswith(b"\r") else remainder
+
+
+def iter_logical_lines(stream, chunk_size=65536):
+    """Yield content lines with RFC 2425 folding undone (continuation lines start with a space or tab).
+
+    Args:
+        stream: File object opened in binary mode.
+        chunk_size: Number of bytes read per call.
+    Yields:
+        One bytes object per unfolded line; empty lines are skipped.
+    """
+    pending = None
+    for line in iter_physical_lines(stream, chunk_size):
+        if line[:1] in (b" ", b"\t") and pending is not None:
+            pending += line[1:]
+            continue
+        if pending:
+            yield pending
+        pending = line
+    if pending:
+        yield pending
+
+
+def split_content_line(line):
+    """Split 'group.NAME;param;param:value' at the first colon outside a quoted parameter."""
+    quoted = False
+    for index, byte in enumerate(line):
+        if byte == 0x22:
+            quoted = not quoted
+        elif byte == 0x3A and not quoted:
+            return line[:index], line[index + 1:]
+    return line, b""
+
+
+def parse_parameters(parts):
+    """Turn the ';'-separated parameters of a content line into a dict of upper-case name -> list of values."""
+    params = {}
+    for part in parts:
+        if not part:
+            continue
+        if "=" in part:
+            name, value = part.split("=", 1)
+            name = name.strip().upper()
+            values = [item.strip().strip('"') for item in value.split(",")]
+        else:
+            name = "ENCODING" if part.strip().upper() in encoding_parameters else "TYPE"
+            values = [part.strip()]
+        params.setdefault(name, []).extend(values)
+    return params
+
+
+def unescape_text(value):
+    """Undo vCard 3.0 text escaping (\\n, \\, \\; \\\\)."""
+    if "\\" not in value:
+        return value
+    result = []
+    index = 0
+    while index < len(value):
+        char = value[index]
+        if char == "\\" and index + 1 < len(value):
+            following = value[index + 1]
+            result.append("\n" if following in "nN" else following)
+            index += 2
+            continue
+        result.append(char)
+        index += 1
+    return "".join(result)
+
+
+def split_components(value):
+    """Split a structured value on ';' that is not escaped, unescaping each component."""
+    components = []
+    current = []
+    index = 0
+    while index < len(value):
+        char = value[index]
+        if char == "\\" and index + 1 < len(value):
+            current.append(value[index:index + 2])
+            index += 2
+            continue
+        if char == ";":
+            components.append(unescape_text("".join(current)))
+            current = []
+        else:
+            current.append(char)
+        index += 1
+    components.append(unescape_text("".join(current)))
+    return components
+
+
+def decode_value(raw, params):
+    """Decode a raw property value according to its ENCODING and CHARSET parameters.
+
+    Returns:
+        bytes for BASE64 values, str for everything else.
+    """
+    encoding = [value.upper() for value in params.get("ENCODING", [])]
+    if "BASE64" in encoding or "B" in encoding:
+        try:
+            return base64.b64decode(b"".join(raw.split()), validate=False)
+        except (binascii.Error, ValueError):
+            return raw
+    if "QUOTED-PRINTABLE" in encoding:
+        raw = quopri.decodestring(raw)
+    charset = params.get("CHARSET", ["utf-8"])[0]
+    try:
+        return raw.decode(charset, errors="replace")
+    except LookupError:
+        return raw.decode("utf-8", errors="replace")
+
+
+def parse_property(line, lines):
+    """Parse one content line into a property dict.
+
+    Args:
+        line: Unfolded content line.
+        lines: Iterator of the following logical lines, consumed for vCard 2.1
+            quoted-printable soft line breaks (a value ending in '=').
+    Returns:
+        Dict with name, group, params and value (plus components for N/ADR/ORG).
+    """
+    head, raw = split_content_line(line)
+    parts = head.decode("utf-8", errors="replace").split(";")
+    name = parts[0].strip()
+    group = None
+    if "." in name:
+        group, name = name.split(".", 1)
+    name = name.upper()
+    params = parse_parameters(parts[1:])
+    if "QUOTED-PRINTABLE" in [value.upper() for value in params.get("ENCODING", [])]:
+        while raw.endswith(b"="):
+            following = next(lines, None)
+            if following is None:
+                break
+            raw = raw[:-1] + following
+    value = decode_value(raw, params)
+    prop = {"name": name, "group": group, "params": params, "value": value}
+    if isinstance(value, str):
+        if name in structured_properties:
+            prop["components"] = split_components(value)
+        prop["value"] = unescape_text(value)
+    return prop
+
+
+def make_contact(properties):
+    """Build a contact record from its properties, with the common fields lifted to the top level."""
+    contact = {"version": None, "fn": None, "n": None, "tel": [], "email": [], "properties": properties}
+    for prop in properties:
+        name = prop["name"]
+        if name == "VERSION":
+            contact["version"] = prop["value"]
+        elif name == "FN" and contact["fn"] is None:
+            contact["fn"] = prop["value"]
+        elif name == "N" and contact["n"] is None:
+            contact["n"] = prop.get("components", [prop["value"]])
+        elif name == "TEL":
+            contact["tel"].append({"number": prop["value"], "types": [value.upper() for value in prop["params"].get("TYPE", [])]})
+        elif name == "EMAIL":
+            contact["email"].append(prop["value"])
+    return contact
+
+
+def parse_vcards(source, chunk_size=65536, include_binary=True):
+    """Parse vCard 2.1/3.0 data incrementally, yielding one contact at a time.
+
+    Only the contact currently being parsed is held in memory, so arbitrarily
+    large PullAll results are processed in constant memory.
+
+    Args:
+        source: Path of a .vcf file, a binary file object, or bytes.
+        chunk_size: Number of bytes read from the source per call.
+        include_binary: Keep BASE64 values such as PHOTO; when False they are dropped.
+    Yields:
+        Contact dicts with version, fn, n, tel, email and the full property list.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        stream = io.BytesIO(source)
+    elif isinstance(source, str):
+        stream = open(source, "rb")
+    else:
+        stream = source
+    try:
+        lines = iter_logical_lines(stream, chunk_size)
+        properties = None
+        for line in lines:
+            upper = line.strip().upper()
+            if upper == b"BEGIN:VCARD":
+                properties = []
+                continue
+            if upper == b"END:VCARD":
+                if properties is not None:
+                    yield make_contact(properties)
+                properties = None
+                continue
+            if properties is None:
+                continue
+            prop = parse_property(line, lines)
+            if not include_binary and isinstance(prop["value"], bytes):
+                continue
+            properties.append(prop)
+    finally:
+        if stream is not source:
+            stream.close()
+
+
+class VCardIndex:
+    """Offsets of every vCard in a .vcf file, served from a read-only memory map.
+
+    Building the index only scans the mapping for BEGIN:VCARD/END:VCARD markers
+    and keeps two integer arrays, so the file is never copied into the heap.
+    Slicing out, parsing or extracting TEL lines from one contact touches only
+    that contact's bytes.
+    """
+
+    begin_marker = b"BEGIN:VCARD"
+    end_marker = b"END:VCARD"
+
+    def __init__(self, path):
+        """Map the file and index it.
+
+        Args:
+            path: Path of the .vcf file.
+        """
+        self.path = path
+        self.file = open(path, "rb")
+        self.starts = array("Q")
+        self.ends = array("Q")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped.
+            self.map = None
+        if self.map is not None:
+            self.build()
+
+    def build(self):
+        """Record (start, end) byte offsets for each BEGIN:VCARD ... END:VCARD block."""
+        data = self.map
+        size = len(data)
+        position = data.find(self.begin_marker)
+        while position != -1:
+            end = data.find(self.end_marker, position)
+            if end == -1:
+                break
+            line_end = data.find(b"\n", end)
+            line_end = size if line_end == -1 else line_end + 1
+            self.starts.append(position)
+            self.ends.append(line_end)
+            position = data.find(self.begin_marker, line_end)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+    def span(self, index):
+        """Return the (start, end) offsets of the index-th contact."""
+        return self.starts[index], self.ends[index]
+
+    def view(self, index):
+        """Return a zero-copy memoryview of the index-th contact (release it before close())."""
+        start, end = self.span(index)
+        return memoryview(self.map)[start:end]
+
+    def raw(self, index):
+        """Return the bytes of the index-th contact (copies only that contact)."""
+        start, end = self.span(index)
+        return self.map[start:end]
+
+    def contact(self, index, include_binary=True):
+        """Parse and return the index-th contact."""
+        return next(parse_vcards(self.raw(index), include_binary=include_binary), None)
+
+    def iter_property_lines(self, index, names):
+        """Yield the unfolded content lines of one contact whose property name is in names.
+
+        Only the matching lines (and their continuation lines) are copied out of the map.
+        """
+        start, end = self.span(index)
+        data = self.map
+        position = start
+        pending = None
+        quoted_printable = False
+        while position < end:
+            line_end = data.find(b"\n", position, end)
+            line_end = end if line_end == -1 else line_end
+            first = data[position:position + 1]
+            if pending is not None and quoted_printable and pending.endswith(b"="):
+                # vCard 2.1 quoted-printable soft line break.
+                pending = pending[:-1] + data[position:line_end].rstrip(b"\r")
+            elif first in (b" ", b"\t"):
+                if pending is not None:
+                    pending += data[position + 1:line_end].rstrip(b"\r")
+            else:
+                if pending is not None:
+                    yield pending
+                    pending = None
+                colon = data.find(b":", position, line_end)
+                if colon != -1:
+                    head = data[position:colon].split(b";", 1)[0]
+                    name = head.rsplit(b".", 1)[-1].upper()
+                    if name in names:
+                        pending = data[position:line_end].rstrip(b"\r")
+                        quoted_printable = b"QUOTED-PRINTABLE" in data[position:colon].upper()
+            position = line_end + 1
+        if pending is not None:
+            yield pending
+
+    def tel(self, index):
+        """Return the phone numbers of the index-th contact as dicts with number and types."""
+        numbers = []
+        for line in self.iter_property_lines(index, (b"TEL",)):
+            prop = parse_property(line, iter(()))
+            numbers.append({"number": prop["value"], "types": [value.upper() for value in prop["params"].get("TYPE", [])]})
+        return numbers
+
+    def iter_tel(self):
+        """Yield (index, numbers) for every contact, reading only the TEL lines."""
+        for index in range(len(self)):
+            yield index, self.tel(index)